@@ -4,9 +4,8 @@ Flask веб-приложение для адаптивной системы о
 """
 
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for
-from flask_session import Session
+import atexit
 import os
-import json
 from datetime import datetime
 
 # Импортируем нашу систему обучения
@@ -14,25 +13,26 @@ import sys
 
 sys.path.insert(0, os.path.abspath('.'))
 
-from src.core.learning_engine import AdaptiveLearningEngine
-from src.data.knowledge_base import THEORY_DATABASE, SPECIALIZATIONS
+from src.api.bootstrap import SEARCH_INDEX_PATH, configure_catalog, create_engine
+from src.api.http_cache import specializations_response, topic_response, topics_response
+from src.api.sessions import configure_sessions
+from src.api.views import check_admin, parse_answer_batch, search_payload
+from src.data.knowledge_base import SPECIALIZATIONS
 
 app = Flask(__name__)
-app.secret_key = 'adaptive-learning-secret-key-2024'
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SESSION_PERMANENT'] = False
-app.config['SESSION_USE_SIGNER'] = True
-app.config['SESSION_FILE_DIR'] = './flask_session'
-app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 час
+app.secret_key = os.environ.get('SECRET_KEY', 'adaptive-learning-secret-key-2024')
 
-Session(app)
+# Сессия - подписанная cookie или данные в памяти/Redis (см. src/api/sessions.py)
+configure_sessions(app)
 
-# Инициализируем движок обучения
-engine = AdaptiveLearningEngine()
+# Каталог, поисковый индекс и движок настраиваются переменными
+# окружения (см. src/api/bootstrap.py)
+configure_catalog()
+engine = create_engine()
+atexit.register(engine.close)
 
 # Создаем папки если их нет
 os.makedirs('static/uploads', exist_ok=True)
-os.makedirs('flask_session', exist_ok=True)
 
 
 # ============ ВАЖНО: УБЕРИТЕ ДУБЛИРОВАНИЕ МАРШРУТОВ ============
@@ -123,6 +123,39 @@ def submit_test():
     return jsonify(result)
 
 
+@app.route('/adaptive_test/start', methods=['POST'])
+def adaptive_test_start():
+    """Начинает адаптивный тест: возвращает первый вопрос"""
+    if 'student_id' not in session:
+        return jsonify({'error': 'Студент не найден'}), 401
+
+    result = engine.start_adaptive_assessment(session['student_id'],
+                                              session.get('specialization', 'data_science'))
+    return jsonify(result)
+
+
+@app.route('/adaptive_test/answer', methods=['POST'])
+def adaptive_test_answer():
+    """Принимает ответ на вопрос адаптивного теста"""
+    if 'student_id' not in session:
+        return jsonify({'error': 'Студент не найден'}), 401
+
+    data = request.json or {}
+    if 'question_id' not in data or 'answer' not in data:
+        return jsonify({'error': 'Нет ответа'}), 400
+
+    result = engine.submit_adaptive_answer(session['student_id'], data['question_id'],
+                                           data['answer'])
+
+    if 'error' in result:
+        return jsonify(result), 400
+
+    if result.get('finished'):
+        session['current_level'] = result['assessment']['overall_level']
+
+    return jsonify(result)
+
+
 @app.route('/learning')
 def learning():
     """Страница обучения"""
@@ -182,6 +215,17 @@ def submit_quiz():
     return jsonify(result)
 
 
+@app.route('/api/answers/batch', methods=['POST'])
+def api_answers_batch():
+    """Пачка ответов на quiz от LMS или офлайн-клиента (студенты - в событиях)"""
+    events, error, status = parse_answer_batch(request.get_json(silent=True),
+                                               request.headers.get('Authorization'))
+    if error is not None:
+        return jsonify(error), status
+
+    return jsonify(engine.submit_answer_batch(events))
+
+
 @app.route('/profile')
 def profile():
     """Страница профиля студента"""
@@ -251,83 +295,67 @@ def logout():
 @app.route('/admin')
 def admin():
     """Административная панель (только для демо)"""
-    # Получаем статистику всех студентов
-    try:
-        with open('data/student_progress.json', 'r', encoding='utf-8') as f:
-            all_progress = json.load(f)
-
-        stats = {
-            'total_students': len(all_progress),
-            'by_specialization': {},
-            'by_level': {'beginner': 0, 'intermediate': 0, 'advanced': 0},
-            'total_topics_studied': 0
-        }
-
-        for student_id, data in all_progress.items():
-            spec = data.get('specialization', 'unknown')
-            stats['by_specialization'][spec] = stats['by_specialization'].get(spec, 0) + 1
-
-            level = data.get('current_level', 'unknown')
-            if level in stats['by_level']:
-                stats['by_level'][level] += 1
-
-            studied = data.get('studied_topics', [])
-            stats['total_topics_studied'] += len(studied)
+    # Счетчики ведет движок при каждом изменении прогресса
+    population = engine.get_population_stats()
+    stats = {
+        'total_students': population['total_students'],
+        'by_specialization': population['by_specialization'],
+        'by_level': population['by_level'],
+        'total_topics_studied': population['total_topics_studied']
+    }
+    return render_template('admin.html', stats=stats if stats['total_students'] else None,
+                           specializations=SPECIALIZATIONS)
 
-        return render_template('admin.html', stats=stats, specializations=SPECIALIZATIONS)
 
-    except FileNotFoundError:
-        return render_template('admin.html', stats=None, specializations=SPECIALIZATIONS)
+# API endpoints для фронтенда
+def catalog_response(response):
+    """Готовый ответ каталога (тело сериализовано заранее, с ETag)"""
+    status, body, headers = response
+    return app.response_class(body, status=status, headers=headers)
 
 
-# API endpoints для фронтенда
 @app.route('/api/topics')
 def api_topics():
     """Возвращает список всех тем"""
-    topics_list = []
-
-    for topic_id, topic_data in THEORY_DATABASE.items():
-        for subtopic_id, subtopic_data in topic_data['subtopics'].items():
-            topics_list.append({
-                'id': f"{topic_id}/{subtopic_id}",
-                'topic': topic_data['topic'],
-                'subtopic': subtopic_data.get('name', subtopic_id),
-                'level': subtopic_data['level'],
-                'question_count': len(subtopic_data['questions'])
-            })
-
-    return jsonify({'topics': topics_list})
+    return catalog_response(topics_response(request.headers))
 
 
 @app.route('/api/topic/<path:topic_path>')
 def api_topic(topic_path):
     """Возвращает контент конкретной темы"""
-    try:
-        topic_id, subtopic_id = topic_path.split('/')
+    return catalog_response(topic_response(topic_path, request.headers))
 
-        if topic_id in THEORY_DATABASE and subtopic_id in THEORY_DATABASE[topic_id]['subtopics']:
-            content_data = THEORY_DATABASE[topic_id]['subtopics'][subtopic_id]
 
-            return jsonify({
-                'success': True,
-                'topic': THEORY_DATABASE[topic_id]['topic'],
-                'subtopic': content_data.get('name', subtopic_id),
-                'content': content_data['content'],
-                'questions': content_data['questions'],
-                'level': content_data['level'],
-                'specializations': content_data.get('specializations', {})
-            })
+@app.route('/api/search')
+def api_search():
+    """Полнотекстовый поиск по урокам и вопросам"""
+    payload, status = search_payload(request.args.get('q', ''),
+                                     request.args.get('limit', 10, type=int), SEARCH_INDEX_PATH)
+    return jsonify(payload), status
 
-        return jsonify({'error': 'Тема не найдена'}), 404
 
-    except ValueError:
-        return jsonify({'error': 'Неверный формат темы'}), 400
+@app.route('/api/reviews/due')
+def api_reviews_due():
+    """Темы, которые пора повторить (scope=all - очередь всех студентов)"""
+    if request.args.get('scope') == 'all':
+        # Очередь всех студентов с их идентификаторами - только для администратора
+        error, status = check_admin(request.headers.get('Authorization'))
+        if error is not None:
+            return jsonify(error), status
+
+        limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+        return jsonify({'reviews': engine.get_population_due_reviews(limit=limit)})
+
+    if 'student_id' not in session:
+        return jsonify({'error': 'Студент не найден'}), 401
+
+    return jsonify({'reviews': engine.get_due_reviews(session['student_id'])})
 
 
 @app.route('/api/specializations')
 def api_specializations():
     """Возвращает список специализаций"""
-    return jsonify({'specializations': SPECIALIZATIONS})
+    return catalog_response(specializations_response(request.headers))
 
 
 # Статические файлы
@@ -335,6 +363,20 @@ def api_specializations():
 def favicon():
     return app.send_static_file('favicon.ico')
 
+
+@app.route('/api/population_stats')
+def api_population_stats():
+    """Сводка по всем студентам: специализации, уровни, активность за сегодня.
+    Только агрегаты без идентификаторов - открыта так же, как /admin"""
+    return jsonify(engine.get_population_stats())
+
+
+@app.route('/api/storage_metrics')
+def api_storage_metrics():
+    """Метрики сохранения прогресса: очередь и задержка записи"""
+    return jsonify(engine.get_storage_metrics())
+
+
 @app.route('/api/check_health')
 def api_check_health():
     """Проверка работоспособности API"""
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пачки ответов на quiz против отдельных вызовов
+
+Запуск:
+    python benchmarks/bench_answer_batch.py --students 50 --events 2000 --backend json
+
+Одни и те же события (студент, тема, ответы) применяются к двум
+движкам с хранилищем в файле: по одному через submit_topic_quiz (как
+при повторе /submit_quiz) и одной пачкой через submit_answer_batch.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.learning_engine import AdaptiveLearningEngine  # noqa: E402
+from src.data.knowledge_base import THEORY_DATABASE  # noqa: E402
+from src.storage import create_progress_store  # noqa: E402
+
+
+def make_engine(backend: str, path: str, students: int) -> AdaptiveLearningEngine:
+    engine = AdaptiveLearningEngine(create_progress_store(backend, path))
+    for i in range(students):
+        engine.start_assessment(f"student{i}", "data_science")
+        engine.submit_assessment(f"student{i}", {"oop_classes_q0": -1})
+    return engine
+
+
+def make_events(students: int, count: int):
+    topics = [(topic_id, subtopic_id) for topic_id, topic_data in THEORY_DATABASE.items()
+              for subtopic_id in topic_data["subtopics"]]
+    events = []
+    for i in range(count):
+        topic_id, subtopic_id = topics[i % len(topics)]
+        events.append({"student_id": f"student{i % students}", "topic_id": topic_id,
+                       "subtopic_id": subtopic_id, "answers": [i % 4, (i + 1) % 4, 0]})
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пачки ответов на quiz")
+    parser.add_argument('--students', type=int, default=50, help="Студентов в пачке")
+    parser.add_argument('--events', type=int, default=2000, help="Событий в пачке")
+    parser.add_argument('--backend', default='sqlite', help="Хранилище прогресса: json, journal, sqlite")
+    args = parser.parse_args()
+
+    events = make_events(args.students, args.events)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        single = make_engine(args.backend, os.path.join(tmp_dir, "single.json"), args.students)
+        start = time.perf_counter()
+        for event in events:
+            single.submit_topic_quiz(event["student_id"], event["topic_id"],
+                                     event["subtopic_id"], event["answers"])
+        single_time = time.perf_counter() - start
+        single.close()
+
+        batch = make_engine(args.backend, os.path.join(tmp_dir, "batch.json"), args.students)
+        start = time.perf_counter()
+        response = batch.submit_answer_batch(events)
+        batch_time = time.perf_counter() - start
+        batch.close()
+
+    print(f"Событий: {args.events}, студентов: {args.students}, хранилище: {args.backend}, "
+          f"применено пачкой: {response['applied']}")
+    print(f"По одному: {args.events / single_time:10.0f} событий/с  ({single_time:.2f} с)")
+    print(f"Пачкой:    {args.events / batch_time:10.0f} событий/с  ({batch_time:.2f} с)")
+    print(f"Ускорение: {single_time / batch_time:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
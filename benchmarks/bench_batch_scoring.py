@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пакетной оценки знаний
+
+Запуск:
+    python benchmarks/bench_batch_scoring.py --students 100000
+
+Сравнивает create_initial_assessment (по одному студенту) с
+assess_batch (все студенты сразу) на случайных ответах по всем
+вопросам базы знаний и проверяет, что результаты совпадают.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.question_registry import get_question_registry  # noqa: E402
+from src.models.knowledge_assessment import SimpleKnowledgeAssessor  # noqa: E402
+
+
+def scalar_answers(row, question_topics):
+    """
+    Ответы студента в формате create_initial_assessment
+    """
+    answers = {}
+    for answer, topic in zip(row, question_topics):
+        if answer >= 0:
+            answers.setdefault(topic, []).append(int(answer))
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пакетной оценки знаний")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    registry = get_question_registry()
+    question_topics = [record.topic_key for level in registry.levels()
+                       for record in registry.by_level(level)]
+
+    rng = np.random.default_rng(args.seed)
+    # -1: вопрос не задавался (примерно каждый пятый)
+    answers = rng.integers(0, 2, size=(args.students, len(question_topics)), dtype=np.int8)
+    answers[rng.random(answers.shape) < 0.2] = -1
+
+    assessor = SimpleKnowledgeAssessor()
+
+    started = time.perf_counter()
+    scalar = [assessor.create_initial_assessment(scalar_answers(row, question_topics))
+              for row in answers]
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = assessor.assess_batch(answers, question_topics)
+    batch_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for i, expected in enumerate(scalar) if batch.to_assessment(i) != expected)
+
+    print(f"Студентов: {args.students}, вопросов: {len(question_topics)}, "
+          f"тем: {len(batch.topics)}")
+    print(f"По одному: {scalar_seconds:8.3f} с  ({args.students / scalar_seconds:12.0f} студентов/с)")
+    print(f"Пакетно:   {batch_seconds:8.3f} с  ({args.students / batch_seconds:12.0f} студентов/с)")
+    print(f"Ускорение: {scalar_seconds / batch_seconds:.1f}x, расхождений: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк проверки ответов начального теста
+
+Запуск:
+    python benchmarks/bench_grading.py --rounds 20000
+
+Сравнивает прежний способ (разбор ID вопроса по "_" и вложенные
+обращения к THEORY_DATABASE) с поиском в реестре вопросов.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.knowledge_base import THEORY_DATABASE  # noqa: E402
+from src.data.question_registry import get_question_registry  # noqa: E402
+
+
+def grade_by_parsing(answers):
+    """
+    Прежняя проверка из submit_assessment: разбор ID по "_"
+    """
+    topic_answers = {}
+    for q_id, answer in answers.items():
+        parts = q_id.split("_")
+        q_index = -1
+        for i, part in enumerate(parts):
+            if part.startswith('q'):
+                q_index = i
+                break
+        try:
+            topic_id = "_".join(parts[:q_index - 1])
+            subtopic_id = parts[q_index - 1]
+            question_num = int(parts[q_index][1:])
+        except (ValueError, IndexError):
+            # stacks_queues: "queues" начинается с "q"
+            topic_answers.setdefault(f"unknown_{q_id}", []).append(0)
+            continue
+
+        correct_answer = None
+        if (topic_id in THEORY_DATABASE and
+                subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]):
+            questions = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]["questions"]
+            if question_num < len(questions):
+                correct_answer = questions[question_num]["correct"]
+
+        is_correct = (answer == correct_answer) if correct_answer is not None else False
+        topic_answers.setdefault(f"{topic_id}_{subtopic_id}", []).append(1 if is_correct else 0)
+    return topic_answers
+
+
+def grade_by_registry(answers):
+    """
+    Новая проверка: поиск записи вопроса в реестре
+    """
+    registry = get_question_registry()
+    topic_answers = {}
+    for q_id, answer in answers.items():
+        question = registry.get(q_id)
+        if question is None:
+            topic_answers.setdefault(f"unknown_{q_id}", []).append(0)
+            continue
+        topic_answers.setdefault(question.topic_key, []).append(
+            1 if answer == question.correct else 0)
+    return topic_answers
+
+
+def measure(grader, answers, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        grader(answers)
+    elapsed = time.perf_counter() - started
+    return rounds * len(answers) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк проверки ответов")
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Правильные ответы на все вопросы базы знаний
+    answers = {}
+    for topic_id, topic_data in THEORY_DATABASE.items():
+        for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+            for i, question in enumerate(subtopic_data["questions"]):
+                answers[f"{topic_id}_{subtopic_id}_q{i}"] = question["correct"]
+
+    get_question_registry()  # строим реестр вне замера
+
+    before = measure(grade_by_parsing, answers, args.rounds)
+    after = measure(grade_by_registry, answers, args.rounds)
+
+    misgraded = sum(len(v) - sum(v) for v in grade_by_parsing(answers).values())
+    print(f"Вопросов в тесте: {len(answers)}, повторов: {args.rounds}")
+    print(f"Разбор ID:   {before:12.0f} ответов/с  (неверно проверено: {misgraded})")
+    print(f"Реестр:      {after:12.0f} ответов/с")
+    print(f"Ускорение:   {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
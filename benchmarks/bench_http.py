@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест HTTP: Flask-приложение против асинхронного сервиса
+
+Запуск:
+    python benchmarks/bench_http.py --learners 50 --rounds 10
+
+Каждое приложение запускается отдельным процессом во временном
+каталоге (свои data/ и сессии). Клиенты - одновременные студенты:
+регистрация, ответы на тест, затем rounds раз /get_next_topic и
+/submit_quiz. Для каждого приложения печатаются запросы в секунду и
+задержки p50/p99.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+FLASK_COMMAND = ("from app import app; "
+                 "app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)")
+ASYNC_COMMAND = ("import uvicorn; "
+                 "uvicorn.run('src.api.service:create_app', factory=True, "
+                 "host='127.0.0.1', port={port}, log_level='warning')")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command: str, port: int, workdir: str, backend: str) -> subprocess.Popen:
+    """
+    Запускает приложение и ждет, пока оно ответит на /api/check_health
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT, PROGRESS_BACKEND=backend)
+    process = subprocess.Popen([sys.executable, '-c', command.format(port=port)], cwd=workdir,
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/api/check_health').status_code == 200:
+                return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'Приложение не запустилось: {command}')
+
+
+async def learner(base_url: str, index: int, rounds: int, latencies: List[float],
+                  errors: List[str]):
+    """
+    Один студент: регистрация, тест и rounds тем с quiz
+    """
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def call(method: str, url: str, **kwargs) -> httpx.Response:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors.append(f'{url}: {response.status_code}')
+            return response
+
+        await call('POST', '/register', data={'student_id': f'learner{index}',
+                                              'specialization': 'data_science'})
+        await call('POST', '/submit_test', json={'answers': {'oop_classes_q0': -1}})
+        for _ in range(rounds):
+            topic = (await call('GET', '/get_next_topic')).json().get('topic_info')
+            if not topic:
+                break
+            topic_id, subtopic_id = topic['content_link'].split('/')
+            await call('POST', '/submit_quiz', json={'topic_id': topic_id,
+                                                     'subtopic_id': subtopic_id,
+                                                     'answers': [0, 0, 0]})
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+def run_load(name: str, command: str, learners: int, rounds: int, backend: str) -> Dict:
+    """
+    Запускает приложение и гоняет по нему студентов
+    """
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        process = start_server(command, port, workdir, backend)
+        try:
+            latencies: List[float] = []
+            errors: List[str] = []
+
+            async def main():
+                await asyncio.gather(*(learner(f'http://127.0.0.1:{port}', i, rounds,
+                                               latencies, errors) for i in range(learners)))
+
+            start = time.perf_counter()
+            asyncio.run(main())
+            elapsed = time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    return {
+        'name': name,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'errors': len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест Flask и асинхронного сервиса")
+    parser.add_argument('--learners', type=int, default=50, help="Одновременных студентов")
+    parser.add_argument('--rounds', type=int, default=10, help="Тем с quiz на студента")
+    parser.add_argument('--backend', default='sqlite', help="Хранилище прогресса")
+    args = parser.parse_args()
+
+    print(f"Студентов: {args.learners}, тем на студента: {args.rounds}, "
+          f"хранилище: {args.backend}")
+    for name, command in (('Flask', FLASK_COMMAND), ('Async', ASYNC_COMMAND)):
+        result = run_load(name, command, args.learners, args.rounds, args.backend)
+        print(f"{result['name']:6} {result['requests']:6d} запросов  {result['rps']:8.1f} запр/с  "
+              f"p50 {result['p50']:7.1f} мс  p99 {result['p99']:7.1f} мс  "
+              f"ошибок: {result['errors']}")
+
+
+if __name__ == '__main__':
+    main()
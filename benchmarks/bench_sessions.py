@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк накладных расходов сессии на запрос
+
+Запуск:
+    python benchmarks/bench_sessions.py --clients 200 --requests 20000
+
+Одно и то же минимальное Flask-приложение запускается с разными
+сессиями: filesystem (flask-session, как было в app.py), подписанная
+cookie и хранилище в памяти. clients студентов по очереди делают
+запросы; каждый десятый меняет сессию (как /submit_test), остальные
+только читают student_id. Печатается время запроса за вычетом
+приложения без сессии.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from flask import Flask, session
+from flask.sessions import SecureCookieSession, SessionInterface
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.sessions import create_session_interface  # noqa: E402
+
+
+class NoSessionInterface(SessionInterface):
+    """Сессия только в памяти запроса - точка отсчета"""
+
+    def open_session(self, app, request):
+        return SecureCookieSession()
+
+    def save_session(self, app, session, response):
+        pass
+
+
+def make_app(backend: str, session_dir: str) -> Flask:
+    app = Flask(__name__)
+    app.secret_key = 'bench-secret'
+
+    if backend == 'filesystem':
+        from flask_session import Session
+
+        app.config['SESSION_TYPE'] = 'filesystem'
+        app.config['SESSION_PERMANENT'] = False
+        app.config['SESSION_USE_SIGNER'] = True
+        app.config['SESSION_FILE_DIR'] = session_dir
+        Session(app)
+    elif backend == 'none':
+        app.session_interface = NoSessionInterface()
+    else:
+        app.session_interface = create_session_interface(backend)
+
+    @app.route('/login/<student_id>')
+    def login(student_id):
+        session['student_id'] = student_id
+        session['specialization'] = 'data_science'
+        return 'ok'
+
+    @app.route('/read')
+    def read():
+        return session.get('student_id', '')
+
+    @app.route('/update')
+    def update():
+        session['current_level'] = 'intermediate'
+        return 'ok'
+
+    return app
+
+
+def run(backend: str, clients: int, requests: int) -> float:
+    """
+    Возвращает среднее время запроса в микросекундах
+    """
+    with tempfile.TemporaryDirectory() as session_dir:
+        app = make_app(backend, session_dir)
+        test_clients = [app.test_client() for _ in range(clients)]
+        for i, client in enumerate(test_clients):
+            client.get(f'/login/student{i}')
+
+        start = time.perf_counter()
+        for i in range(requests):
+            client = test_clients[i % clients]
+            client.get('/update' if i % 10 == 0 else '/read')
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк хранилищ сессий Flask")
+    parser.add_argument('--clients', type=int, default=200, help="Одновременных сессий")
+    parser.add_argument('--requests', type=int, default=20000, help="Всего запросов")
+    args = parser.parse_args()
+
+    baseline = run('none', args.clients, args.requests)
+    print(f"Сессий: {args.clients}, запросов: {args.requests}, "
+          f"запрос без сессии: {baseline:.0f} мкс")
+    for backend in ('filesystem', 'cookie', 'memory'):
+        elapsed = run(backend, args.clients, args.requests)
+        print(f"{backend:10} {elapsed:8.0f} мкс/запрос  сессия: {elapsed - baseline:6.0f} мкс")
+
+
+if __name__ == '__main__':
+    main()
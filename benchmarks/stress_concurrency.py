@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест параллельных отправок quiz в один движок
+
+Запуск:
+    python benchmarks/stress_concurrency.py --threads 16 --submissions 200
+
+Прогоняет два сценария: все потоки работают с несколькими общими
+студентами (пересекающиеся) и у каждого потока свой студент
+(непересекающиеся). После прогона проверяет, что ни одно обновление
+не потерялось ни в памяти, ни в хранилище.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.learning_engine import AdaptiveLearningEngine  # noqa: E402
+from src.data.knowledge_base import THEORY_DATABASE  # noqa: E402
+from src.storage import SQLiteProgressStore  # noqa: E402
+
+TOPIC_ID = "python_basics"
+SUBTOPIC_ID = "variables"
+QUESTIONS = THEORY_DATABASE[TOPIC_ID]["subtopics"][SUBTOPIC_ID]["questions"]
+ANSWERS = [q["correct"] for q in QUESTIONS]
+
+
+def run_scenario(name: str, students_for_thread, threads: int, submissions: int,
+                 write_behind: bool):
+    """
+    Запускает один сценарий и проверяет итоговые счетчики
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "progress.db")
+        engine = AdaptiveLearningEngine(SQLiteProgressStore(db_path), write_behind=write_behind,
+                                        flush_interval=0.05)
+
+        all_students = sorted({s for t in range(threads) for s in students_for_thread(t)})
+        for student_id in all_students:
+            engine.start_assessment(student_id, "data_science")
+        engine.save_progress()
+
+        expected = {student_id: 0 for student_id in all_students}
+        for thread_index in range(threads):
+            students = students_for_thread(thread_index)
+            for i in range(submissions):
+                expected[students[i % len(students)]] += 1
+
+        errors = []
+        barrier = threading.Barrier(threads)
+
+        def worker(thread_index: int):
+            students = students_for_thread(thread_index)
+            barrier.wait()
+            try:
+                for i in range(submissions):
+                    engine.submit_topic_quiz(students[i % len(students)], TOPIC_ID,
+                                             SUBTOPIC_ID, ANSWERS)
+            except Exception as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+        started = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - started
+        engine.close()
+
+        store = SQLiteProgressStore(db_path)
+        lost = 0
+        for student_id, count in expected.items():
+            record = store.load_student(student_id)
+            if record["total_questions_answered"] != count * len(QUESTIONS):
+                lost += 1
+        store.close()
+
+        total = threads * submissions
+        mode = "write-behind" if write_behind else "sync"
+        print(f"{name:<18} {mode:<13} {total / elapsed:10.0f} отправок/с   "
+              f"ошибок: {len(errors)}   студентов с потерянными обновлениями: {lost}")
+        return not errors and not lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стресс-тест параллельных отправок quiz")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--submissions", type=int, default=200,
+                        help="число отправок на поток")
+    args = parser.parse_args()
+
+    def overlapping(thread_index):
+        return ["shared_0", "shared_1", "shared_2"]
+
+    def disjoint(thread_index):
+        return [f"student_{thread_index}"]
+
+    ok = True
+    for write_behind in (False, True):
+        ok &= run_scenario("пересекающиеся", overlapping, args.threads, args.submissions,
+                           write_behind)
+        ok &= run_scenario("непересекающиеся", disjoint, args.threads, args.submissions,
+                           write_behind)
+
+    print("✅ Потерянных обновлений нет" if ok else "❌ Обнаружены потерянные обновления")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
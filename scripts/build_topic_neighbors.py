@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Строит таблицу похожих тем (коллаборативная фильтрация) по прогрессу
+всех студентов
+
+Запуск (например, раз в сутки):
+    python scripts/build_topic_neighbors.py --backend sqlite
+    TOPIC_NEIGHBORS_PATH=data/topic_neighbors.npz python app.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.catalog import load_content_pack  # noqa: E402
+from src.models.collaborative_filtering import (  # noqa: E402
+    DEFAULT_NEIGHBORS_PATH, build_neighbor_table
+)
+from src.storage import DEFAULT_PROGRESS_PATH, create_progress_store  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Построение таблицы похожих тем')
+    parser.add_argument('--backend', default=os.environ.get('PROGRESS_BACKEND', 'json'),
+                        choices=['json', 'journal', 'sqlite'], help='Бэкенд хранилища')
+    parser.add_argument('--path', default=DEFAULT_PROGRESS_PATH, help='Путь к хранилищу')
+    parser.add_argument('--output', default=os.environ.get('TOPIC_NEIGHBORS_PATH', DEFAULT_NEIGHBORS_PATH),
+                        help='Куда сохранить таблицу')
+    parser.add_argument('--neighbors', type=int, default=10, help='Соседей на тему')
+    parser.add_argument('--content-pack', default=os.environ.get('CONTENT_PACK'),
+                        help='Пакет контента вместо встроенной базы знаний')
+    args = parser.parse_args()
+
+    if args.content_pack:
+        load_content_pack(args.content_pack)
+
+    started = time.perf_counter()
+    store = create_progress_store(args.backend, args.path)
+    table = build_neighbor_table(store, neighbors=args.neighbors)
+    store.close()
+    table.save(args.output)
+    print(f"Таблица соседей сохранена: {args.output} "
+          f"(студентов: {table.meta['students']}, тем: {len(table.keys)}, "
+          f"{time.perf_counter() - started:.1f} с)")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Выгружает встроенную базу знаний в пакет контента
+
+Запуск:
+    python scripts/export_content_pack.py data/content_pack
+    CONTENT_PACK=data/content_pack python app.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.content_pack import export_content_pack  # noqa: E402
+from src.data.knowledge_base import (  # noqa: E402
+    INITIAL_TEST_QUESTIONS, SPECIALIZATIONS, THEORY_DATABASE
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Выгрузка базы знаний в пакет контента')
+    parser.add_argument('path', help='Каталог пакета')
+    parser.add_argument('--zip', action='store_true', help='Дополнительно упаковать в .zip')
+    args = parser.parse_args()
+
+    export_content_pack(THEORY_DATABASE, args.path,
+                        specializations=SPECIALIZATIONS,
+                        initial_test_questions=INITIAL_TEST_QUESTIONS)
+    print(f"Пакет контента сохранен: {args.path}")
+
+    if args.zip:
+        archive = shutil.make_archive(args.path.rstrip('/\\'), 'zip', args.path)
+        print(f"Архив: {archive}")
@@ -4,6 +4,7 @@
 """
 
 import json
+import os
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -12,9 +13,14 @@ import matplotlib.pyplot as plt
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.core.population_stats import stats_from_store  # noqa: E402
+from src.storage import DEFAULT_PROGRESS_PATH, create_progress_store  # noqa: E402
 
-def generate_report(date_str: str, format: str = 'markdown'):
+
+def generate_report(date_str: str, format: str = 'markdown', backend: str = 'json',
+                    path: str = DEFAULT_PROGRESS_PATH):
     """Генерирует отчет по обучению"""
     
     report_date = datetime.strptime(date_str, '%Y-%m-%d') if date_str != 'today' else datetime.now()
@@ -23,17 +29,20 @@ def generate_report(date_str: str, format: str = 'markdown'):
     reports_dir = Path('reports')
     reports_dir.mkdir(exist_ok=True)
     
-    # Загружаем данные о прогрессе
-    progress_file = Path('data/student_progress.json')
+    # Сводка берется из хранилища: SQLite ведет счетчики сама,
+    # файловые хранилища перебираются (сохраненный движком файл сводки
+    # может отставать от прогресса)
+    store = create_progress_store(backend, path)
+    try:
+        stats = stats_from_store(store)
+    finally:
+        store.close()
     
-    if not progress_file.exists():
-        print("Файл с прогрессом не найден. Создаем тестовый отчет...")
+    if stats['total_students'] == 0:
+        print("Прогресс студентов не найден. Создаем тестовый отчет...")
         report_data = create_sample_report()
     else:
-        with open(progress_file, 'r', encoding='utf-8') as f:
-            progress_data = json.load(f)
-        
-        report_data = analyze_progress(progress_data, report_date)
+        report_data = report_from_stats(stats, report_date)
     
     # Генерируем отчет в нужном формате
     if format == 'markdown':
@@ -46,37 +55,14 @@ def generate_report(date_str: str, format: str = 'markdown'):
     print(f"Отчет сгенерирован: {reports_dir}/report_{report_date.strftime('%Y-%m-%d')}.{format}")
 
 
-def analyze_progress(progress_data: dict, report_date: datetime) -> dict:
-    """Анализирует данные о прогрессе"""
-    
-    total_students = len(progress_data)
-    active_today = 0
-    total_topics_studied = 0
-    specialization_stats = {}
-    level_stats = {'beginner': 0, 'intermediate': 0, 'advanced': 0}
+def report_from_stats(stats: dict, report_date: datetime) -> dict:
+    """Собирает данные отчета из сводки по студентам"""
     
-    for student_id, data in progress_data.items():
-        # Проверяем активность
-        last_activity = data.get('last_activity', '')
-        if last_activity:
-            try:
-                last_date = datetime.fromisoformat(last_activity.replace('Z', '+00:00'))
-                if last_date.date() == report_date.date():
-                    active_today += 1
-            except (ValueError, TypeError):
-                pass
-        
-        # Собираем статистику
-        spec = data.get('specialization', 'unknown')
-        specialization_stats[spec] = specialization_stats.get(spec, 0) + 1
-        
-        level = data.get('current_level', 'unknown')
-        if level in level_stats:
-            level_stats[level] += 1
-        
-        # Считаем изученные темы
-        studied = data.get('studied_topics', [])
-        total_topics_studied += len(studied)
+    total_students = stats['total_students']
+    active_today = stats['active_by_date'].get(report_date.date().isoformat(), 0)
+    total_topics_studied = stats['total_topics_studied']
+    specialization_stats = stats['by_specialization']
+    level_stats = stats['by_level']
     
     return {
         'report_date': report_date.isoformat(),
@@ -145,6 +131,8 @@ def generate_markdown_report(data: dict, date: datetime, output_dir: Path):
     plt.close()
     
     # Создаем markdown файл
+    specialization_rows = "".join(f"| {spec} | {count} |\n"
+                                  for spec, count in data['specialization_stats'].items())
     md_content = f"""# 📊 Ежедневный отчет по системе обучения
 **Дата:** {date.strftime('%Y-%m-%d')}
 
@@ -162,7 +150,7 @@ def generate_markdown_report(data: dict, date: datetime, output_dir: Path):
 
 | Специализация | Количество студентов |
 |---------------|----------------------|
-{"".join(f"| {spec} | {count} |\n" for spec, count in data['specialization_stats'].items())}
+{specialization_rows}
 
 **Самая популярная:** {data['most_popular_specialization']}
 
@@ -266,6 +254,9 @@ if __name__ == "__main__":
     parser.add_argument('--date', default='today', help='Дата отчета (YYYY-MM-DD)')
     parser.add_argument('--format', choices=['markdown', 'json', 'html'], 
                        default='markdown', help='Формат отчета')
+    parser.add_argument('--backend', default=os.environ.get('PROGRESS_BACKEND', 'json'),
+                        choices=['json', 'journal', 'sqlite'], help='Бэкенд хранилища')
+    parser.add_argument('--path', default=DEFAULT_PROGRESS_PATH, help='Путь к хранилищу')
     
     args = parser.parse_args()
-    generate_report(args.date, args.format)
+    generate_report(args.date, args.format, args.backend, args.path)
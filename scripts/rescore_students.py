@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Пересчитывает оценки, рекомендации и пути обучения всех студентов
+после изменения базы знаний или порогов оценки
+
+Запуск (сервис лучше остановить):
+    python scripts/rescore_students.py --backend sqlite --workers 8
+    python scripts/rescore_students.py --content-pack data/content_pack
+    python scripts/rescore_students.py --threshold STRONG_THRESHOLD=85
+
+Прерванный пересчет продолжается с последней сохраненной части.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.rescoring import PopulationRescorer  # noqa: E402
+from src.storage import DEFAULT_PROGRESS_PATH  # noqa: E402
+
+
+def parse_threshold(value: str):
+    """Разбирает порог оценки вида ИМЯ=ЧИСЛО"""
+    name, _, number = value.partition('=')
+    try:
+        return name.strip(), float(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ожидается ИМЯ=ЧИСЛО: {value}")
+
+
+def print_progress(done: int, total: int, elapsed: float):
+    """Печатает прогресс, скорость и оставшееся время"""
+    rate = done / elapsed if elapsed > 0 else 0
+    eta = (total - done) / rate if rate > 0 else 0
+    print(f"\r{done}/{total} студентов, {rate:.0f}/с, осталось ~{eta:.0f} с",
+          end='', file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Пересчет оценок и путей обучения студентов')
+    parser.add_argument('--backend', default=os.environ.get('PROGRESS_BACKEND', 'json'),
+                        choices=['json', 'journal', 'sqlite'], help='Бэкенд хранилища')
+    parser.add_argument('--path', default=DEFAULT_PROGRESS_PATH, help='Путь к хранилищу')
+    parser.add_argument('--workers', type=int, default=None, help='Число процессов (по умолчанию - ядра)')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Студентов в одной части')
+    parser.add_argument('--staging', default=None, help='Каталог контрольных точек')
+    parser.add_argument('--content-pack', default=os.environ.get('CONTENT_PACK'),
+                        help='Пакет контента вместо встроенной базы знаний')
+    parser.add_argument('--threshold', type=parse_threshold, action='append', default=[],
+                        help='Новый порог оценки, например STRONG_THRESHOLD=85')
+    args = parser.parse_args()
+
+    rescorer = PopulationRescorer(args.backend, args.path, staging_dir=args.staging,
+                                  workers=args.workers, chunk_size=args.chunk_size,
+                                  content_pack=args.content_pack,
+                                  thresholds=dict(args.threshold) or None,
+                                  progress=print_progress)
+    stats = rescorer.run()
+    print(file=sys.stderr)
+    print(f"Пересчитано студентов: {stats['students']} за {stats['seconds']} с "
+          f"(частей: {stats['chunks']}, продолжено: {stats['resumed_chunks']}, "
+          f"конфликтов: {stats['conflicts']}, не решено: {stats['unresolved_conflicts']})")
@@ -0,0 +1,3 @@
+"""
+HTTP-интерфейсы системы обучения: общая настройка и асинхронный сервис
+"""
@@ -0,0 +1,95 @@
+"""
+Асинхронный адаптер движка обучения
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.api.executor import BoundedExecutor
+from src.core.learning_engine import AdaptiveLearningEngine
+
+
+class AsyncLearningEngine:
+    """
+    Те же операции, что у AdaptiveLearningEngine, но в виде корутин.
+
+    Движок синхронный: он ждет блокировки студентов и читает записи из
+    хранилища, поэтому каждый вызов уходит в BoundedExecutor, а цикл
+    событий продолжает обслуживать другие соединения. Запись в
+    хранилище движок с write_behind отдает фоновому потоку, так что
+    потоки пула не ждут диска.
+    """
+
+    def __init__(self, engine: AdaptiveLearningEngine, executor: BoundedExecutor):
+        self.engine = engine
+        self.executor = executor
+
+    async def start_assessment(self, student_id: str, specialization: str) -> Dict:
+        return await self.executor.run(
+            self.engine.start_assessment, student_id, specialization
+        )
+
+    async def submit_assessment(self, student_id: str, answers: Dict[str, int]) -> Dict:
+        return await self.executor.run(
+            self.engine.submit_assessment, student_id, answers
+        )
+
+    async def start_adaptive_assessment(
+        self, student_id: str, specialization: str
+    ) -> Dict:
+        return await self.executor.run(
+            self.engine.start_adaptive_assessment, student_id, specialization
+        )
+
+    async def submit_adaptive_answer(
+        self, student_id: str, question_id: str, answer: int
+    ) -> Dict:
+        return await self.executor.run(
+            self.engine.submit_adaptive_answer, student_id, question_id, answer
+        )
+
+    async def get_next_content(self, student_id: str) -> Dict:
+        return await self.executor.run(self.engine.get_next_content, student_id)
+
+    async def submit_topic_quiz(
+        self, student_id: str, topic_id: str, subtopic_id: str, answers: List[int]
+    ) -> Dict:
+        return await self.executor.run(
+            self.engine.submit_topic_quiz, student_id, topic_id, subtopic_id, answers
+        )
+
+    async def submit_answer_batch(self, events: List[Dict]) -> Dict:
+        return await self.executor.run(self.engine.submit_answer_batch, events)
+
+    async def get_student_progress(self, student_id: str) -> Dict:
+        return await self.executor.run(self.engine.get_student_progress, student_id)
+
+    async def get_recommendations(self, student_id: str) -> List[Dict]:
+        return await self.executor.run(self.engine.get_recommendations, student_id)
+
+    async def get_due_reviews(
+        self, student_id: str, now: Optional[datetime] = None
+    ) -> List[Dict]:
+        return await self.executor.run(self.engine.get_due_reviews, student_id, now)
+
+    async def get_population_due_reviews(self, limit: int = 100) -> List[Dict]:
+        return await self.executor.run(
+            self.engine.get_population_due_reviews, None, limit
+        )
+
+    async def get_population_stats(self) -> Dict:
+        # С SQLite счетчики читаются запросом к хранилищу, который может
+        # ждать чужую транзакцию записи, - не в цикле событий
+        return await self.executor.run(self.engine.get_population_stats)
+
+    async def get_storage_metrics(self) -> Dict:
+        metrics = await self.executor.run(self.engine.get_storage_metrics)
+        metrics["executor"] = self.executor.metrics()
+        return metrics
+
+    async def close(self):
+        """
+        Сохраняет прогресс, закрывает хранилище и останавливает пул
+        """
+        await self.executor.run(self.engine.close)
+        self.executor.shutdown()
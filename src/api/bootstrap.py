@@ -0,0 +1,114 @@
+"""
+Настройка каталога и движка по переменным окружения - общая для
+Flask-приложения и асинхронного сервиса
+"""
+
+import os
+import shlex
+import sys
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.core.population_stats import DEFAULT_STATS_PATH
+from src.data.catalog import load_content_pack
+from src.data.search_index import DEFAULT_INDEX_PATH, get_search_index
+from src.data.topic_similarity import DEFAULT_SIMILARITY_PATH, get_topic_similarity
+from src.models.collaborative_filtering import (
+    DEFAULT_NEIGHBORS_PATH,
+    load_neighbor_table,
+)
+from src.storage import create_progress_store
+
+# Поисковый индекс строится при загрузке базы знаний и хранится в
+# SEARCH_INDEX_PATH; при неизменной базе он просто читается с диска
+SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", DEFAULT_INDEX_PATH)
+
+
+def configure_catalog():
+    """
+    Подключает пакет контента и прогревает поисковый индекс
+    """
+    # CONTENT_PACK: путь к пакету контента (каталог или .zip) вместо
+    # встроенной базы знаний; тексты уроков читаются по запросу
+    if os.environ.get("CONTENT_PACK"):
+        load_content_pack(
+            os.environ["CONTENT_PACK"],
+            body_cache_size=int(os.environ.get("CONTENT_BODY_CACHE_SIZE", 256)),
+        )
+    get_search_index(SEARCH_INDEX_PATH)
+
+
+def _configured_workers() -> int:
+    """
+    Сколько процессов-воркеров запускает сервер: WEB_CONCURRENCY,
+    --workers из GUNICORN_CMD_ARGS или из командной строки gunicorn
+    """
+    workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    args = shlex.split(os.environ.get("GUNICORN_CMD_ARGS", ""))
+    if "gunicorn" in os.path.basename(sys.argv[0]):
+        args += sys.argv[1:]
+    for index, arg in enumerate(args):
+        value = None
+        if arg in ("-w", "--workers") and index + 1 < len(args):
+            value = args[index + 1]
+        elif arg.startswith("--workers="):
+            value = arg.split("=", 1)[1]
+        elif arg.startswith("-w") and arg[2:].isdigit():
+            value = arg[2:]
+        if value is not None and value.isdigit():
+            workers = max(workers, int(value))
+    return workers
+
+
+def create_engine(write_behind: bool = False) -> AdaptiveLearningEngine:
+    """
+    Создает движок обучения.
+
+    PROGRESS_BACKEND: json (один файл), journal (снимок + журнал изменений,
+    только для одного процесса) или sqlite
+    PROGRESS_CACHE_SIZE: сколько записей студентов держать в памяти (LRU)
+    PROGRESS_WRITE_BEHIND=1: сохранять прогресс фоновым потоком раз в
+    PROGRESS_FLUSH_INTERVAL секунд или при PROGRESS_FLUSH_THRESHOLD изменениях
+    (write_behind - значение по умолчанию)
+    POPULATION_STATS_PATH: куда сохранять сводку по студентам для отчетов,
+    POPULATION_STATS_INTERVAL: не чаще скольких секунд ее перезаписывать
+    """
+    backend = os.environ.get("PROGRESS_BACKEND", "json")
+    # Журнал ведет один процесс: несколько воркеров дописывали бы его
+    # параллельно и теряли изменения друг друга
+    if backend == "journal" and _configured_workers() > 1:
+        raise ValueError(
+            "Журнальное хранилище рассчитано на один процесс; "
+            "для нескольких воркеров используйте PROGRESS_BACKEND=json или sqlite"
+        )
+
+    write_behind_env = os.environ.get("PROGRESS_WRITE_BEHIND")
+    engine = AdaptiveLearningEngine(
+        create_progress_store(backend),
+        cache_size=int(os.environ.get("PROGRESS_CACHE_SIZE", 10000)),
+        write_behind=(
+            write_behind if write_behind_env is None else write_behind_env == "1"
+        ),
+        flush_interval=float(os.environ.get("PROGRESS_FLUSH_INTERVAL", 1.0)),
+        flush_threshold=int(os.environ.get("PROGRESS_FLUSH_THRESHOLD", 500)),
+        stats_path=os.environ.get("POPULATION_STATS_PATH", DEFAULT_STATS_PATH),
+        stats_interval=float(os.environ.get("POPULATION_STATS_INTERVAL", 10)),
+    )
+
+    # Таблица похожих тем строится офлайн (scripts/build_topic_neighbors.py);
+    # если ее нет или она построена для другого набора тем, рекомендации
+    # строятся только по собственным баллам студента
+    engine.neighbor_table = load_neighbor_table(
+        os.environ.get("TOPIC_NEIGHBORS_PATH", DEFAULT_NEIGHBORS_PATH)
+    )
+
+    # Похожие по содержанию темы считаются при загрузке базы знаний и
+    # хранятся в TOPIC_SIMILARITY_PATH. TOPIC_SIMILARITY_METHOD: tfidf или
+    # embeddings (тогда TOPIC_SIMILARITY_MODEL - локальная модель
+    # sentence-transformers; в сеть приложение не ходит)
+    engine.similarity_options = {
+        "path": os.environ.get("TOPIC_SIMILARITY_PATH", DEFAULT_SIMILARITY_PATH),
+        "method": os.environ.get("TOPIC_SIMILARITY_METHOD", "tfidf"),
+        "model": os.environ.get("TOPIC_SIMILARITY_MODEL"),
+    }
+    get_topic_similarity(**engine.similarity_options)
+    return engine
@@ -0,0 +1,69 @@
+"""
+Ограниченный пул потоков для блокирующих вызовов из asyncio
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class BoundedExecutor:
+    """
+    Выполняет блокирующие функции (движок, хранилище) в пуле потоков,
+    не занимая цикл событий.
+
+    Одновременно выполняется не больше max_workers вызовов и еще не
+    больше max_pending стоит в очереди пула. Остальные корутины ждут
+    на семафоре - это обратное давление: при перегрузке растет время
+    ожидания, а не очередь задач в памяти.
+    """
+
+    def __init__(self, max_workers: int = 32, max_pending: int = 1024):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="engine")
+        # Семафор создается в работающем цикле событий при первом вызове:
+        # до Python 3.10 он привязывается к циклу, текущему при создании
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.admitted = 0
+        self.waiting = 0
+        self.completed = 0
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Выполняет function(*args, **kwargs) в пуле и возвращает результат
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_pending)
+
+        self.waiting += 1
+        async with self._slots:
+            self.waiting -= 1
+            self.admitted += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor, functools.partial(function, *args, **kwargs)
+                )
+            finally:
+                self.admitted -= 1
+                self.completed += 1
+
+    def metrics(self) -> Dict:
+        """
+        Возвращает загрузку пула
+        """
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_pool": self.admitted,
+            "waiting": self.waiting,
+            "completed": self.completed,
+        }
+
+    def shutdown(self):
+        """
+        Дожидается выполняющихся вызовов и останавливает пул
+        """
+        self._executor.shutdown(wait=True)
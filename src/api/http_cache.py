@@ -0,0 +1,175 @@
+"""
+HTTP-кэширование каталожных эндпоинтов: готовые тела ответов, ETag и
+условные запросы
+"""
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from src.api.views import specializations_payload, topic_payload, topics_payload
+from src.data.catalog import catalog_cached, knowledge_base_version
+from src.data.knowledge_base import THEORY_DATABASE
+
+# Сколько секунд браузер и CDN могут отдавать ответ без проверки;
+# после этого ответ перепроверяется по ETag и обычно приходит 304
+CATALOG_MAX_AGE = int(os.environ.get("CATALOG_MAX_AGE", 300))
+# Сколько готовых ответов по подтемам держать в памяти
+TOPIC_RESPONSE_CACHE_SIZE = int(os.environ.get("TOPIC_RESPONSE_CACHE_SIZE", 512))
+
+# (статус, тело, заголовки ответа)
+HttpResponse = Tuple[int, bytes, Dict[str, str]]
+
+
+class CatalogResponse:
+    """
+    Ответ каталожного эндпоинта, сериализованный один раз для версии
+    каталога: JSON и он же, сжатый gzip
+    """
+
+    __slots__ = ("body", "gzip_body")
+
+    def __init__(self, payload: Dict):
+        self.body = json.dumps(
+            payload, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+
+
+class TopicResponses:
+    """
+    LRU готовых ответов по подтемам: в памяти остаются только недавно
+    запрошенные уроки, а не весь каталог
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._responses: "OrderedDict[str, CatalogResponse]" = OrderedDict()
+
+    def get(self, topic_path: str) -> CatalogResponse:
+        """
+        Возвращает ответ для подтемы, собирая его при промахе
+        """
+        with self._lock:
+            response = self._responses.get(topic_path)
+            if response is not None:
+                self._responses.move_to_end(topic_path)
+                return response
+
+        payload, _ = topic_payload(topic_path)
+        response = CatalogResponse(payload)
+
+        with self._lock:
+            self._responses[topic_path] = response
+            self._responses.move_to_end(topic_path)
+            while len(self._responses) > self.capacity:
+                self._responses.popitem(last=False)
+        return response
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Принимает ли клиент gzip (Accept-Encoding без q=0)
+    """
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in (
+                "q=0",
+                "q=0.0",
+                "q=0.00",
+                "q=0.000",
+            )
+    return False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Совпадает ли один из тегов If-None-Match с etag (сравнение слабое,
+    как требует RFC 9110 для If-None-Match)
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _conditional(
+    headers: Mapping, build: Callable[[], CatalogResponse]
+) -> HttpResponse:
+    """
+    Отвечает на запрос к неизменяемому ресурсу каталога.
+
+    ETag - версия каталога (хеш базы знаний) и кодировка тела, поэтому
+    условный запрос сверяется без обращения к каталогу; build()
+    вызывается только для ответа 200 и берет готовое тело из кэша
+    """
+    use_gzip = accepts_gzip(headers.get("Accept-Encoding"))
+    version = knowledge_base_version()
+    etag = f'"{version}-gzip"' if use_gzip else f'"{version}"'
+    response_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(headers.get("If-None-Match"), etag):
+        return 304, b"", response_headers
+
+    response = build()
+    response_headers["Content-Type"] = "application/json"
+    if use_gzip:
+        response_headers["Content-Encoding"] = "gzip"
+        return 200, response.gzip_body, response_headers
+    return 200, response.body, response_headers
+
+
+def topics_response(headers: Mapping) -> HttpResponse:
+    """
+    GET /api/topics
+    """
+    return _conditional(
+        headers,
+        lambda: catalog_cached(
+            "http_topics", lambda: CatalogResponse(topics_payload())
+        ),
+    )
+
+
+def specializations_response(headers: Mapping) -> HttpResponse:
+    """
+    GET /api/specializations
+    """
+    return _conditional(
+        headers,
+        lambda: catalog_cached(
+            "http_specializations", lambda: CatalogResponse(specializations_payload())
+        ),
+    )
+
+
+def topic_response(topic_path: str, headers: Mapping) -> HttpResponse:
+    """
+    GET /api/topic/<topic_id>/<subtopic_id>.
+
+    Путь проверяется по каталогу без чтения урока, поэтому условный
+    запрос получает 304 до сборки ответа. Ответы для подтем собираются
+    по первому запросу к каждой и держатся в LRU; ошибки (неверный путь,
+    нет темы) не кэшируются и идут без ETag
+    """
+    topic_id, _, subtopic_id = topic_path.partition("/")
+    if subtopic_id not in THEORY_DATABASE.get(topic_id, {}).get("subtopics", {}):
+        payload, status = topic_payload(topic_path)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return status, body, {"Content-Type": "application/json"}
+
+    responses: TopicResponses = catalog_cached(
+        "http_topic_responses", lambda: TopicResponses(TOPIC_RESPONSE_CACHE_SIZE)
+    )
+    return _conditional(headers, lambda: responses.get(topic_path))
@@ -0,0 +1,312 @@
+"""
+Асинхронный HTTP-сервис (FastAPI) с теми же JSON-эндпоинтами, что у
+Flask-приложения.
+
+Запуск:
+    uvicorn --factory src.api.service:create_app --port 5002
+    python -m src.api.service
+"""
+
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.middleware.sessions import SessionMiddleware
+
+from src.api.async_engine import AsyncLearningEngine
+from src.api.bootstrap import SEARCH_INDEX_PATH, configure_catalog, create_engine
+from src.api.executor import BoundedExecutor
+from src.api.http_cache import (
+    HttpResponse,
+    specializations_response,
+    topic_response,
+    topics_response,
+)
+from src.api.views import check_admin, parse_answer_batch, search_payload
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.knowledge_base import SPECIALIZATIONS
+
+SECRET_KEY = os.environ.get("SECRET_KEY", "adaptive-learning-secret-key-2024")
+SESSION_LIFETIME = int(os.environ.get("SESSION_LIFETIME", 3600))  # 1 час
+
+
+def _error(message: str, status: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def _catalog(response: HttpResponse) -> Response:
+    status, body, headers = response
+    return Response(body, status_code=status, headers=headers)
+
+
+async def _json_body(request: Request) -> Dict:
+    """
+    Тело запроса как словарь; пустое или некорректное тело - {}
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def create_app(
+    engine: Optional[AdaptiveLearningEngine] = None,
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> FastAPI:
+    """
+    Создает приложение.
+
+    Без engine каталог и движок настраиваются теми же переменными
+    окружения, что и во Flask-приложении, но прогресс по умолчанию
+    сохраняется фоновым потоком (write-behind), чтобы запись на диск не
+    занимала потоки пула. API_WORKERS и API_MAX_PENDING - размер пула
+    для вызовов движка и длина его очереди
+    """
+    if engine is None:
+        configure_catalog()
+        engine = create_engine(write_behind=True)
+
+    executor = BoundedExecutor(
+        max_workers or int(os.environ.get("API_WORKERS", 32)),
+        max_pending or int(os.environ.get("API_MAX_PENDING", 1024)),
+    )
+    learner = AsyncLearningEngine(engine, executor)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await learner.close()
+
+    app = FastAPI(title="Adaptive Learning System", lifespan=lifespan)
+    app.add_middleware(
+        SessionMiddleware, secret_key=SECRET_KEY, max_age=SESSION_LIFETIME
+    )
+    app.state.learner = learner
+
+    @app.post("/register")
+    async def register(request: Request):
+        """Регистрирует студента и начинает тест (JSON или форма)"""
+        if request.headers.get("content-type", "").startswith("application/json"):
+            data = await _json_body(request)
+        else:
+            # Форма из одних полей: разбираем сами, без python-multipart
+            data = dict(parse_qsl((await request.body()).decode("utf-8")))
+
+        student_id = str(data.get("student_id", "")).strip()
+        specialization = data.get("specialization", "data_science")
+        if not student_id:
+            return _error("Не указан студент", 400)
+        if specialization not in SPECIALIZATIONS:
+            specialization = "data_science"
+
+        request.session["student_id"] = student_id
+        request.session["specialization"] = specialization
+        return await learner.start_assessment(student_id, specialization)
+
+    @app.get("/assessment")
+    async def assessment(request: Request):
+        """Тест текущего студента"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        result = await learner.start_assessment(
+            request.session["student_id"],
+            request.session.get("specialization", "data_science"),
+        )
+        if "error" in result:
+            return JSONResponse(result, status_code=400)
+        return result
+
+    @app.post("/submit_test")
+    async def submit_test(request: Request):
+        """Принимает ответы на тест"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        answers = (await _json_body(request)).get("answers", {})
+        if not answers:
+            return _error("Нет ответов", 400)
+
+        result = await learner.submit_assessment(request.session["student_id"], answers)
+        if "error" in result:
+            return JSONResponse(result, status_code=400)
+
+        request.session["current_level"] = result["assessment"]["overall_level"]
+        return result
+
+    @app.post("/adaptive_test/start")
+    async def adaptive_test_start(request: Request):
+        """Начинает адаптивный тест: возвращает первый вопрос"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        return await learner.start_adaptive_assessment(
+            request.session["student_id"],
+            request.session.get("specialization", "data_science"),
+        )
+
+    @app.post("/adaptive_test/answer")
+    async def adaptive_test_answer(request: Request):
+        """Принимает ответ на вопрос адаптивного теста"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        data = await _json_body(request)
+        if "question_id" not in data or "answer" not in data:
+            return _error("Нет ответа", 400)
+
+        result = await learner.submit_adaptive_answer(
+            request.session["student_id"], data["question_id"], data["answer"]
+        )
+        if "error" in result:
+            return JSONResponse(result, status_code=400)
+
+        if result.get("finished"):
+            request.session["current_level"] = result["assessment"]["overall_level"]
+        return result
+
+    @app.get("/get_next_topic")
+    async def get_next_topic(request: Request):
+        """Возвращает следующую тему"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        return await learner.get_next_content(request.session["student_id"])
+
+    @app.post("/submit_quiz")
+    async def submit_quiz(request: Request):
+        """Принимает ответы на quiz по теме"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        data = await _json_body(request)
+        topic_id = data.get("topic_id")
+        subtopic_id = data.get("subtopic_id")
+        if not topic_id or not subtopic_id:
+            return _error("Не указана тема", 400)
+
+        return await learner.submit_topic_quiz(
+            request.session["student_id"],
+            topic_id,
+            subtopic_id,
+            data.get("answers", []),
+        )
+
+    @app.post("/api/answers/batch")
+    async def api_answers_batch(request: Request):
+        """Пачка ответов на quiz от LMS или офлайн-клиента"""
+        events, error, status = parse_answer_batch(
+            await _json_body(request), request.headers.get("Authorization")
+        )
+        if error is not None:
+            return JSONResponse(error, status_code=status)
+
+        return await learner.submit_answer_batch(events)
+
+    @app.get("/progress_data")
+    async def progress_data(request: Request):
+        """Прогресс текущего студента"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        return await learner.get_student_progress(request.session["student_id"])
+
+    @app.get("/achievements")
+    async def achievements(request: Request):
+        """Достижения студента"""
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        progress = await learner.get_student_progress(request.session["student_id"])
+        if "error" in progress:
+            return _error("Прогресс не найден", 404)
+
+        earned = progress.get("achievements", [])
+        return {"achievements": earned, "count": len(earned)}
+
+    @app.post("/logout")
+    async def logout(request: Request):
+        """Выход из системы"""
+        request.session.clear()
+        return {"success": True}
+
+    @app.get("/api/topics")
+    async def api_topics(request: Request):
+        """Список всех тем"""
+        return _catalog(topics_response(request.headers))
+
+    @app.get("/api/topic/{topic_path:path}")
+    async def api_topic(request: Request, topic_path: str):
+        """Контент темы; текст урока может читаться из пакета контента"""
+        return _catalog(await executor.run(topic_response, topic_path, request.headers))
+
+    @app.get("/api/search")
+    async def api_search(q: str = "", limit: int = 10):
+        """Полнотекстовый поиск по урокам и вопросам"""
+        payload, status = await executor.run(
+            search_payload, q, limit, SEARCH_INDEX_PATH
+        )
+        return JSONResponse(payload, status_code=status)
+
+    @app.get("/api/reviews/due")
+    async def api_reviews_due(request: Request, scope: str = "", limit: int = 100):
+        """Темы, которые пора повторить (scope=all - очередь всех студентов)"""
+        if scope == "all":
+            # Очередь всех студентов с их идентификаторами - только для администратора
+            error, status = check_admin(request.headers.get("Authorization"))
+            if error is not None:
+                return JSONResponse(error, status_code=status)
+            return {
+                "reviews": await learner.get_population_due_reviews(
+                    limit=max(1, min(limit, 1000))
+                )
+            }
+
+        if "student_id" not in request.session:
+            return _error("Студент не найден", 401)
+
+        return {"reviews": await learner.get_due_reviews(request.session["student_id"])}
+
+    @app.get("/api/specializations")
+    async def api_specializations(request: Request):
+        """Список специализаций"""
+        return _catalog(specializations_response(request.headers))
+
+    @app.get("/api/population_stats")
+    async def api_population_stats():
+        """Сводка по всем студентам"""
+        return await learner.get_population_stats()
+
+    @app.get("/api/storage_metrics")
+    async def api_storage_metrics():
+        """Метрики сохранения прогресса и пула вызовов движка"""
+        return await learner.get_storage_metrics()
+
+    @app.get("/api/check_health")
+    async def api_check_health():
+        """Проверка работоспособности API"""
+        return {
+            "status": "ok",
+            "service": "adaptive-learning-system",
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    os.makedirs("data", exist_ok=True)
+    uvicorn.run(
+        "src.api.service:create_app",
+        factory=True,
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 5002)),
+    )
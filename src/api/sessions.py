@@ -0,0 +1,301 @@
+"""
+Сессии Flask-приложения без файлов на диске.
+
+В сессии лежат только student_id, specialization и current_level,
+поэтому есть два режима:
+
+- cookie: сессия целиком в подписанной cookie, на сервере ничего не
+  хранится;
+- server: в cookie только случайный идентификатор, данные - в
+  хранилище сессий с истечением по TTL (в памяти процесса или Redis).
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class _CompactJSON(TaggedJSONSerializer):
+    """
+    Сериализатор для подписанной cookie: значения в сессии - строки,
+    поэтому хватает обычного JSON без тегов типов
+    """
+
+    @staticmethod
+    def dumps(value: Dict) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def loads(value: str) -> Dict:
+        return json.loads(value)
+
+
+class SignedCookieSessionInterface(SecureCookieSessionInterface):
+    """
+    Сессия в подписанной cookie (itsdangerous, как у Flask по
+    умолчанию), но в компактном JSON
+    """
+
+    serializer = _CompactJSON()
+
+
+class SessionStore:
+    """
+    Хранилище данных сессий по идентификатору.
+
+    Реализация должна быть потокобезопасной; истекшие сессии get не
+    возвращает
+    """
+
+    def get(self, sid: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def set(self, sid: str, data: Dict, ttl: float):
+        raise NotImplementedError
+
+    def touch(self, sid: str, ttl: float):
+        """
+        Продлевает сессию без перезаписи данных
+        """
+        data = self.get(sid)
+        if data is not None:
+            self.set(sid, data, ttl)
+
+    def delete(self, sid: str):
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Останавливает фоновую работу хранилища
+        """
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Сессии в памяти процесса, разбитые на шарды со своими блокировками.
+
+    Истекшая сессия не возвращается сразу, а из памяти ее убирает
+    фоновый поток раз в sweep_interval секунд - по одному шарду за раз,
+    чтобы не держать все блокировки надолго
+    """
+
+    def __init__(self, shards: int = 16, sweep_interval: float = 60.0):
+        self._shards: List[Tuple[threading.Lock, Dict[str, Tuple[float, Dict]]]] = [
+            (threading.Lock(), {}) for _ in range(shards)
+        ]
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop,
+                args=(sweep_interval,),
+                name="session-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
+    def _shard(self, sid: str) -> Tuple[threading.Lock, Dict[str, Tuple[float, Dict]]]:
+        return self._shards[hash(sid) % len(self._shards)]
+
+    def get(self, sid: str) -> Optional[Dict]:
+        lock, entries = self._shard(sid)
+        with lock:
+            entry = entries.get(sid)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return dict(entry[1])
+
+    def set(self, sid: str, data: Dict, ttl: float):
+        lock, entries = self._shard(sid)
+        with lock:
+            entries[sid] = (time.monotonic() + ttl, dict(data))
+
+    def touch(self, sid: str, ttl: float):
+        lock, entries = self._shard(sid)
+        with lock:
+            entry = entries.get(sid)
+            if entry is not None:
+                entries[sid] = (time.monotonic() + ttl, entry[1])
+
+    def delete(self, sid: str):
+        lock, entries = self._shard(sid)
+        with lock:
+            entries.pop(sid, None)
+
+    def sweep(self) -> int:
+        """
+        Удаляет истекшие сессии и возвращает их число
+        """
+        removed = 0
+        for lock, entries in self._shards:
+            now = time.monotonic()
+            with lock:
+                expired = [
+                    sid for sid, (expires, _) in entries.items() if expires <= now
+                ]
+                for sid in expired:
+                    del entries[sid]
+            removed += len(expired)
+        return removed
+
+    def _sweep_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.sweep()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for _, entries in self._shards)
+
+    def close(self):
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Сессии в Redis (или совместимом сервере): TTL и удаление истекших
+    ключей - на стороне сервера. client - объект с API redis-py
+    (get/setex/expire/delete)
+    """
+
+    def __init__(self, client, prefix: str = "session:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, sid: str) -> Optional[Dict]:
+        raw = self.client.get(self.prefix + sid)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, sid: str, data: Dict, ttl: float):
+        self.client.setex(
+            self.prefix + sid,
+            max(int(ttl), 1),
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+        )
+
+    def touch(self, sid: str, ttl: float):
+        self.client.expire(self.prefix + sid, max(int(ttl), 1))
+
+    def delete(self, sid: str):
+        self.client.delete(self.prefix + sid)
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """
+    Данные сессии из SessionStore; modified выставляется при изменении
+    """
+
+    def __init__(self, initial: Optional[Dict] = None, sid: Optional[str] = None):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = sid is None
+        self.modified = False
+
+
+class ServerSessionInterface(SessionInterface):
+    """
+    В cookie - случайный идентификатор сессии (192 бита), данные - в
+    SessionStore. Хранилище пишется только при изменении сессии, в
+    остальных запросах сессия лишь продлевается
+    """
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+
+    def _ttl(self, app) -> float:
+        return app.permanent_session_lifetime.total_seconds()
+
+    def open_session(self, app, request) -> ServerSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.get(sid)
+            if data is not None:
+                return ServerSession(data, sid)
+        return ServerSession()
+
+    def save_session(self, app, session: ServerSession, response):  # type: ignore[override]
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.sid is not None:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not session.modified:
+            if session.sid is not None:
+                self.store.touch(session.sid, self._ttl(app))
+            return
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(24)
+        self.store.set(session.sid, dict(session), self._ttl(app))
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def create_session_interface(backend: str = "cookie", **options) -> SessionInterface:
+    """
+    Создает интерфейс сессий по имени: cookie, memory или redis.
+
+    Для memory - shards и sweep_interval, для redis - url (нужен
+    пакет redis) или готовый client
+    """
+    if backend == "cookie":
+        return SignedCookieSessionInterface()
+    if backend == "memory":
+        return ServerSessionInterface(
+            MemorySessionStore(
+                shards=options.get("shards", 16),
+                sweep_interval=options.get("sweep_interval", 60.0),
+            )
+        )
+    if backend == "redis":
+        client = options.get("client")
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(
+                options.get("url") or "redis://localhost:6379/0"
+            )
+        return ServerSessionInterface(RedisSessionStore(client))
+    raise ValueError(f"Неизвестный тип хранилища сессий: {backend}")
+
+
+def configure_sessions(app):
+    """
+    Подключает сессии к Flask-приложению по переменным окружения.
+
+    SESSION_BACKEND: cookie (по умолчанию), memory или redis (REDIS_URL);
+    SESSION_SWEEP_INTERVAL: как часто удалять истекшие сессии из памяти
+    """
+    app.permanent_session_lifetime = timedelta(
+        seconds=int(os.environ.get("SESSION_LIFETIME", 3600))
+    )
+    app.session_interface = create_session_interface(
+        os.environ.get("SESSION_BACKEND", "cookie"),
+        sweep_interval=float(os.environ.get("SESSION_SWEEP_INTERVAL", 60)),
+        url=os.environ.get("REDIS_URL"),
+    )
+    return app.session_interface
@@ -0,0 +1,134 @@
+"""
+Ответы каталожных эндпоинтов /api/*, общие для обоих приложений
+"""
+
+import hmac
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.data.catalog import get_lesson_body
+from src.data.knowledge_base import SPECIALIZATIONS, THEORY_DATABASE
+from src.data.search_index import get_search_index
+
+# Сколько событий принимать в одной пачке ответов
+MAX_BATCH_EVENTS = int(os.environ.get("MAX_BATCH_EVENTS", 5000))
+# Пачки ответов принимаются только с заголовком
+# "Authorization: Bearer <BATCH_API_TOKEN>"; без токена эндпоинт выключен
+BATCH_API_TOKEN = os.environ.get("BATCH_API_TOKEN")
+# Очередь повторений всех студентов (с их идентификаторами) отдается
+# только с "Authorization: Bearer <ADMIN_TOKEN>"; без токена она выключена
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+
+def topics_payload() -> Dict:
+    """
+    Список всех подтем
+    """
+    topics_list = []
+
+    for topic_id, topic_data in THEORY_DATABASE.items():
+        for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+            topics_list.append(
+                {
+                    "id": f"{topic_id}/{subtopic_id}",
+                    "topic": topic_data["topic"],
+                    "subtopic": subtopic_data.get("name", subtopic_id),
+                    "level": subtopic_data["level"],
+                    "question_count": len(subtopic_data["questions"]),
+                }
+            )
+
+    return {"topics": topics_list}
+
+
+def topic_payload(topic_path: str) -> Tuple[Dict, int]:
+    """
+    Контент подтемы "topic_id/subtopic_id" и HTTP-статус
+    """
+    try:
+        topic_id, subtopic_id = topic_path.split("/")
+    except ValueError:
+        return {"error": "Неверный формат темы"}, 400
+
+    if (
+        topic_id in THEORY_DATABASE
+        and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]
+    ):
+        content_data = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]
+
+        return {
+            "success": True,
+            "topic": THEORY_DATABASE[topic_id]["topic"],
+            "subtopic": content_data.get("name", subtopic_id),
+            "content": get_lesson_body(topic_id, subtopic_id),
+            "questions": content_data["questions"],
+            "level": content_data["level"],
+            "specializations": content_data.get("specializations", {}),
+        }, 200
+
+    return {"error": "Тема не найдена"}, 404
+
+
+def search_payload(query: str, limit: int, index_path: str) -> Tuple[Dict, int]:
+    """
+    Результаты полнотекстового поиска и HTTP-статус
+    """
+    query = query.strip()
+    if not query:
+        return {"error": "Пустой запрос"}, 400
+
+    results = []
+    for hit in get_search_index(index_path).search(query, limit=min(limit, 50)):
+        topic_data = THEORY_DATABASE[hit["topic_id"]]
+        subtopic_data = topic_data["subtopics"][hit["subtopic_id"]]
+        results.append(
+            {
+                "id": f"{hit['topic_id']}/{hit['subtopic_id']}",
+                "topic": topic_data["topic"],
+                "subtopic": subtopic_data.get("name", hit["subtopic_id"]),
+                "level": subtopic_data["level"],
+                "score": hit["score"],
+            }
+        )
+
+    return {"query": query, "results": results}, 200
+
+
+def specializations_payload() -> Dict:
+    """
+    Список специализаций
+    """
+    return {"specializations": SPECIALIZATIONS}
+
+
+def parse_answer_batch(
+    data: Any, authorization: Optional[str]
+) -> Tuple[List[Dict], Optional[Dict], int]:
+    """
+    События пачки ответов {"events": [...]}; при ошибке - пустой список,
+    ответ с ошибкой и HTTP-статус
+    """
+    if not BATCH_API_TOKEN:
+        return [], {"error": "Прием пачек ответов не настроен"}, 404
+    if not hmac.compare_digest(authorization or "", f"Bearer {BATCH_API_TOKEN}"):
+        return [], {"error": "Нет доступа"}, 401
+
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list) or not events:
+        return [], {"error": "Нет событий"}, 400
+    if len(events) > MAX_BATCH_EVENTS:
+        return [], {"error": f"Не больше {MAX_BATCH_EVENTS} событий в пачке"}, 413
+
+    return events, None, 200
+
+
+def check_admin(authorization: Optional[str]) -> Tuple[Optional[Dict], int]:
+    """
+    Проверяет доступ к административному API: None и 200, если
+    доступ есть, иначе ответ с ошибкой и HTTP-статус
+    """
+    if not ADMIN_TOKEN:
+        return {"error": "Не найдено"}, 404
+    if not hmac.compare_digest(authorization or "", f"Bearer {ADMIN_TOKEN}"):
+        return {"error": "Нет доступа"}, 401
+    return None, 200
@@ -2,26 +2,168 @@
 Основной движок системы обучения
 """
 
-import json
-import os
+import copy
+import functools
 import random
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.locking import StripedLock
+from src.core.population_stats import (
+    PopulationStats,
+    save_stats_file,
+    stats_from_counters,
+    stats_snapshot,
+)
+from src.core.recommendation_cache import RecommendationCache
+from src.core.review_scheduler import (
+    ReviewScheduler,
+    quality_from_score,
+    review_due,
+    sm2_update,
+)
+from src.models.adaptive_testing import AdaptiveTest
+from src.models.collaborative_filtering import NeighborTable, blend_recommendations
 from src.models.knowledge_assessment import SimpleKnowledgeAssessor
-from src.data.knowledge_base import THEORY_DATABASE, SPECIALIZATIONS, INITIAL_TEST_QUESTIONS
+from src.models.knowledge_tracing import (
+    LAYOUT_KEY,
+    MASTERY_KEY,
+    KnowledgeTracer,
+    get_topic_layout,
+)
+from src.data.catalog import get_lesson_body, get_lesson_word_count
+from src.data.knowledge_base import (
+    THEORY_DATABASE,
+    SPECIALIZATIONS,
+    INITIAL_TEST_QUESTIONS,
+)
+from src.data.question_registry import get_question_pools, get_question_registry
+from src.data.topic_graph import get_topic_graph
+from src.data.topic_similarity import get_topic_similarity
+from src.storage import (
+    DEFAULT_PROGRESS_PATH,
+    JsonProgressStore,
+    ProgressStore,
+    StudentCache,
+)
+from src.storage.base import VersionConflictError
+from src.storage.write_behind import WriteBehindFlusher
+
+# Сколько раз повторять операцию, если запись студента изменил другой процесс
+MAX_CONFLICT_RETRIES = 3
+
+
+def with_student_lock(method):
+    """
+    Выполняет метод движка под блокировкой студента (первый аргумент).
+
+    Внешний вызов записывается в журнал изменений студента, пока его
+    результат не сохранен. Если сохранение проиграло конфликт версий
+    (запись изменил другой процесс), запись перечитывается, и все
+    несохраненные вызовы из журнала применяются к ней заново - изменения,
+    о которых уже ответили клиенту, не теряются.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, student_id, *args, **kwargs):
+        with self._student_locks.for_key(student_id):
+            if getattr(self._call_depth, "value", 0):
+                # Вложенный вызов из другого метода движка
+                return method(self, student_id, *args, **kwargs)
+
+            self._call_depth.value = 1
+            change = (method, args, kwargs)
+            self.student_progress.record_change(student_id, change)
+            try:
+                for attempt in range(MAX_CONFLICT_RETRIES):
+                    self.student_progress.revalidate(student_id)
+                    try:
+                        result = self._apply_changes(student_id)
+                    except VersionConflictError:
+                        self.student_progress.invalidate(student_id)
+                        if attempt == MAX_CONFLICT_RETRIES - 1:
+                            self.student_progress.forget_change(student_id, change)
+                            raise
+                        continue
+                    except BaseException:
+                        self.student_progress.forget_change(student_id, change)
+                        raise
+                    if not self._call_depth.changed:
+                        # Вызов только читал запись, повторять его незачем
+                        self.student_progress.forget_change(student_id, change)
+                    return result
+            finally:
+                self._call_depth.value = 0
+
+    return wrapper
 
 
 class AdaptiveLearningEngine:
     """
-    Основной класс системы адаптивного обучения
+    Основной класс системы адаптивного обучения.
+
+    Один экземпляр можно использовать из многих потоков: изменения
+    записи студента выполняются под блокировкой его полосы, а в
+    хранилище уходят согласованные копии записей.
     """
 
-    def __init__(self):
+    # Сколько связанных тем показывать вместе с уроком
+    RELATED_TOPICS = 3
+
+    def __init__(
+        self,
+        store: Optional[ProgressStore] = None,
+        cache_size: int = 10000,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        flush_threshold: int = 500,
+        lock_stripes: int = 64,
+        recommendation_cache_size: int = 10000,
+        stats_path: Optional[str] = None,
+        stats_interval: float = 10.0,
+    ):
         self.assessor = SimpleKnowledgeAssessor()
-        self.student_progress = {}
+        self.adaptive_test = AdaptiveTest()
+        self.tracer = KnowledgeTracer()
+        self.reviews = ReviewScheduler()
+        self.recommendation_cache = RecommendationCache(recommendation_cache_size)
+        # Сводка по всем студентам. SQLite ведет счетчики сама, и все
+        # процессы с общей базой видят одни и те же числа; для файловых
+        # хранилищ счетчики считает этот процесс, поэтому с ними сводка
+        # верна только при одном рабочем процессе. Если задан stats_path,
+        # сводка сохраняется туда не чаще раза в stats_interval секунд
+        # (для ежедневного отчета)
+        self.population = PopulationStats()
+        self.stats_path = stats_path
+        self.stats_interval = stats_interval
+        self._saved_stats_version = None
+        self._stats_saved_at = float("-inf")
+        self._stats_lock = threading.Lock()
+        # Таблица похожих тем (build_neighbor_table); без нее рекомендации
+        # строятся только по собственным баллам
+        self.neighbor_table: Optional[NeighborTable] = None
+        # Параметры get_topic_similarity: path, method, model
+        self.similarity_options: Dict = {}
+        self._student_locks = StripedLock(lock_stripes)
+        self._call_depth = threading.local()
+        self.store = (
+            store if store is not None else JsonProgressStore(DEFAULT_PROGRESS_PATH)
+        )
+        self.cache_size = cache_size
+        # Кэш записей создается в load_progress
+        self.student_progress: StudentCache
+
+        # Отложенная запись: save_progress только будит фоновый поток
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.flusher: Optional[WriteBehindFlusher] = None
+
         self.load_progress()
 
+    @with_student_lock
     def start_assessment(self, student_id: str, specialization: str) -> Dict:
         """
         Начинает процесс оценки для нового студента
@@ -33,7 +175,26 @@ class AdaptiveLearningEngine:
 
         test = self._generate_initial_test()
 
-        self.student_progress[student_id] = {
+        self.student_progress[student_id] = self._new_student_record(
+            student_id, specialization
+        )
+        self._mark_dirty(student_id)
+        # Запись нового студента сразу попадает в хранилище: его видят
+        # другие процессы и счетчики, которые ведет хранилище
+        self.save_progress(student_id=student_id)
+
+        return {
+            "student_id": student_id,
+            "test": test,
+            "specialization": specialization,
+            "message": f"Пройдите начальный тест из {len(test)} вопросов для определения вашего уровня",
+        }
+
+    def _new_student_record(self, student_id: str, specialization: str) -> Dict:
+        """
+        Создает запись нового студента до прохождения теста
+        """
+        return {
             "student_id": student_id,
             "specialization": specialization,
             "current_level": "unknown",
@@ -48,52 +209,33 @@ class AdaptiveLearningEngine:
             "total_correct_answers": 0,
             "streak_days": 1,
             "last_study_date": datetime.now().isoformat(),
-            "achievements": []
-        }
-
-        return {
-            "student_id": student_id,
-            "test": test,
-            "specialization": specialization,
-            "message": f"Пройдите начальный тест из {len(test)} вопросов для определения вашего уровня"
+            "achievements": [],
         }
 
     def _generate_initial_test(self) -> List[Dict]:
         """
         Генерирует начальный тест для определения уровня
         """
-        test = []
-
-        # Собираем вопросы по уровням
-        questions_by_level = {"beginner": [], "intermediate": [], "advanced": []}
-
-        for topic_id, topic_data in THEORY_DATABASE.items():
-            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
-                level = subtopic_data["level"]
-                if level in questions_by_level and subtopic_data["questions"]:
-                    for i, question in enumerate(subtopic_data["questions"]):
-                        questions_by_level[level].append({
-                            "id": f"{topic_id}_{subtopic_id}_q{i}",
-                            "topic": topic_data["topic"],
-                            "subtopic": subtopic_id,
-                            "subtopic_name": subtopic_data.get("name", subtopic_id),
-                            "question": question["text"],
-                            "options": question["options"],
-                            "correct_answer": question["correct"],
-                            "level": level
-                        })
-
-        # Выбираем вопросы по квотам
+        test: List[Dict] = []
+
+        # Пулы вопросов по уровням строятся один раз на версию базы знаний
+        pools = get_question_pools()
+
+        # Выбираем вопросы по квотам; копируем только выбранные
         for level, count in INITIAL_TEST_QUESTIONS.items():
-            if questions_by_level[level]:
-                selected = random.sample(questions_by_level[level],
-                                         min(count, len(questions_by_level[level])))
-                test.extend(selected)
+            pool = pools.get(level)
+            if pool:
+                selected = random.sample(pool, min(count, len(pool)))
+                test.extend(
+                    dict(question, options=list(question["options"]))
+                    for question in selected
+                )
 
         # Перемешиваем вопросы
         random.shuffle(test)
         return test[:10]  # Ограничиваем 10 вопросами
 
+    @with_student_lock
     def submit_assessment(self, student_id: str, answers: Dict[str, int]) -> Dict:
         """
         Принимает ответы на тест и возвращает рекомендации
@@ -102,115 +244,157 @@ class AdaptiveLearningEngine:
             return {"error": "Студент не найден"}
 
         # Группируем ответы по темам и проверяем правильность
-        topic_answers = {}
+        topic_answers: Dict[str, List[int]] = {}
         correct_answers = 0
         total_questions = len(answers)
 
+        registry = get_question_registry()
         for q_id, answer in answers.items():
-            try:
-                # Разбираем ID вопроса вида: python_basics_variables_q0
-                # Где:
-                #   python_basics - topic_id
-                #   variables - subtopic_id
-                #   q0 - номер вопроса (q + number)
-
-                parts = q_id.split("_")
-
-                # Определяем topic_id и subtopic_id
-                if len(parts) >= 3:
-                    # Находим где начинается q (номер вопроса)
-                    q_index = -1
-                    for i, part in enumerate(parts):
-                        if part.startswith('q'):
-                            q_index = i
-                            break
+            # ID вопроса вида python_basics_variables_q0 ищем в реестре,
+            # а не разбираем по "_": подтемы тоже содержат "_"
+            question = registry.get(q_id)
+            if question is None:
+                print(f"Неизвестный вопрос {q_id}")
+                # Добавляем как неправильный ответ
+                topic_answers.setdefault(f"unknown_{q_id}", []).append(0)
+                continue
+
+            is_correct = answer == question.correct
+            topic_answers.setdefault(question.topic_key, []).append(
+                1 if is_correct else 0
+            )
 
-                    if q_index > 0:
-                        # topic_id может состоять из нескольких частей (python_basics)
-                        topic_id = "_".join(parts[:q_index - 1])
-                        subtopic_id = parts[q_index - 1]
-
-                        # Извлекаем номер вопроса
-                        question_part = parts[q_index]  # например 'q0'
-                        question_num = int(question_part[1:])  # убираем 'q', оставляем число
-                    else:
-                        # Простая структура: topic_subtopic_qN
-                        topic_id = parts[0]
-                        subtopic_id = parts[1]
-                        question_part = parts[2]
-                        question_num = int(question_part[1:])
-                else:
-                    # Резервный вариант
-                    topic_id = parts[0] if len(parts) > 0 else ""
-                    subtopic_id = parts[1] if len(parts) > 1 else ""
-                    question_num = 0
-
-                # Получаем правильный ответ из базы знаний
-                correct_answer = None
-                if (topic_id in THEORY_DATABASE and
-                        subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]):
-                    questions = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]["questions"]
-                    if question_num < len(questions):
-                        correct_answer = questions[question_num]["correct"]
-
-                # Проверяем ответ
-                topic_key = f"{topic_id}_{subtopic_id}"
-                if topic_key not in topic_answers:
-                    topic_answers[topic_key] = []
-
-                is_correct = (answer == correct_answer) if correct_answer is not None else False
-                topic_answers[topic_key].append(1 if is_correct else 0)
-
-                if is_correct:
-                    correct_answers += 1
-
-            except (ValueError, IndexError) as e:
-                print(f"Ошибка обработки вопроса {q_id}: {e}")
-                # Добавляем как неправильный ответ для обработки ошибки
-                topic_key = f"unknown_{q_id}"
-                if topic_key not in topic_answers:
-                    topic_answers[topic_key] = []
-                topic_answers[topic_key].append(0)
+            if is_correct:
+                correct_answers += 1
+
+        return self._complete_assessment(
+            student_id, topic_answers, correct_answers, total_questions
+        )
 
+    def _complete_assessment(
+        self,
+        student_id: str,
+        topic_answers: Dict[str, List[int]],
+        correct_answers: int,
+        total_questions: int,
+        ability: Optional[Dict] = None,
+    ) -> Dict:
+        """
+        Оценивает проверенные ответы начального теста, строит путь обучения
+        и сохраняет студента. ability - результат адаптивного теста: уровень
+        тогда определяется по оценке способности, а не по доле верных ответов
+        """
         # Обновляем статистику
         self.student_progress[student_id]["total_questions_answered"] += total_questions
         self.student_progress[student_id]["total_correct_answers"] += correct_answers
 
         # Создаем оценку
         assessment = self.assessor.create_initial_assessment(topic_answers)
+        if ability is not None:
+            assessment["ability"] = ability["ability"]
+            assessment["ability_se"] = ability["ability_se"]
+            assessment["overall_score"] = ability["expected_score"]
+            assessment["overall_level"] = self.assessor.level_for_score(
+                ability["expected_score"]
+            )
 
-        # Получаем рекомендации
-        specialization = self.student_progress[student_id]["specialization"]
-        recommendations = self.assessor.recommend_topics(assessment, specialization)
+        # Вероятности освоения тем начинаются с баллов теста: прогон ответов
+        # через BKT от p_init занизил бы даже темы, решенные без ошибок
+        student = self.student_progress[student_id]
+        self.tracer.seed(student, assessment.get("topic_scores", {}))
 
-        # Создаем путь обучения
-        learning_path = self._create_learning_path(recommendations, assessment["overall_level"])
+        # Получаем рекомендации и путь обучения
+        recommendations, learning_path = self._build_plan(
+            student, assessment, assessment["overall_level"]
+        )
 
         # Обновляем прогресс студента
-        self.student_progress[student_id].update({
-            "current_level": assessment["overall_level"],
-            "assessment": assessment,
-            "recommendations": recommendations,
-            "learning_path": learning_path,
-            "current_topic_index": 0,
-            "last_activity": datetime.now().isoformat(),
-            "test_score": (correct_answers / total_questions * 100) if total_questions > 0 else 0
-        })
+        self.student_progress[student_id].update(
+            {
+                "current_level": assessment["overall_level"],
+                "assessment": assessment,
+                "recommendations": recommendations,
+                "learning_path": learning_path,
+                "current_topic_index": 0,
+                "last_activity": datetime.now().isoformat(),
+                "test_score": (
+                    (correct_answers / total_questions * 100)
+                    if total_questions > 0
+                    else 0
+                ),
+            }
+        )
+        self._mark_dirty(student_id)
 
-        self.save_progress()
+        self.save_progress(student_id=student_id)
 
         return {
             "student_id": student_id,
             "assessment": assessment,
             "recommendations": recommendations,
             "learning_path": learning_path[:3],  # первые 3 темы пути
-            "test_score": (correct_answers / total_questions * 100) if total_questions > 0 else 0,
-            "message": f"Ваш уровень: {assessment['overall_level'].upper()}. Найдено {len(recommendations)} тем для изучения."
+            "test_score": (
+                (correct_answers / total_questions * 100) if total_questions > 0 else 0
+            ),
+            "message": f"Ваш уровень: {assessment['overall_level'].upper()}. Найдено {len(recommendations)} тем для изучения.",
         }
 
-    def _create_learning_path(self, recommendations: List[Dict], level: str) -> List[Dict]:
+    def rebuild_plan(self, student: Dict) -> Dict:
+        """
+        Пересчитывает по сохраненным данным оценку, рекомендации и путь
+        обучения студента (после изменения базы знаний или порогов).
+        Меняет и возвращает переданную запись; запись без оценки не меняется
+        """
+        if not student.get("assessment"):
+            return student
+
+        assessment = self.assessor.reclassify(student["assessment"])
+        recommendations, learning_path = self._build_plan(
+            student, assessment, assessment["overall_level"]
+        )
+        student.update(
+            {
+                "current_level": assessment["overall_level"],
+                "assessment": assessment,
+                "recommendations": recommendations,
+                "learning_path": learning_path,
+                "current_topic_index": 0,
+            }
+        )
+        return student
+
+    def _build_plan(
+        self, student: Dict, assessment: Dict, level: str
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Возвращает рекомендации и путь обучения для текущего состояния
+        студента; одинаковые состояния считаются один раз
+        """
+        mastery = self.tracer.state(student)
+        key = self.recommendation_cache.fingerprint(
+            assessment.get("topic_scores", {}),
+            student["specialization"],
+            level,
+            mastery,
+        )
+
+        def build():
+            recommendations = self.assessor.recommend_topics(
+                assessment, student["specialization"], mastery=mastery
+            )
+            return recommendations, self._create_learning_path(
+                recommendations, level, mastery
+            )
+
+        return self.recommendation_cache.get_or_build(key, build)
+
+    def _create_learning_path(
+        self, recommendations: List[Dict], level: str, mastery=None
+    ) -> List[Dict]:
         """
-        Создает путь обучения на основе рекомендаций
+        Создает путь обучения на основе рекомендаций; с массивом
+        вероятностей освоения (KnowledgeTracer) уже освоенные темы
+        пропускаются
         """
         learning_path = []
 
@@ -222,8 +406,19 @@ class AdaptiveLearningEngine:
         for rec in recommendations:
             # Определяем уровень темы по ее названию или другим признакам
             topic_id, subtopic_id = rec["content_link"].split("/")
-            if topic_id in THEORY_DATABASE and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]:
-                topic_level = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]["level"]
+            if (
+                topic_id in THEORY_DATABASE
+                and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]
+            ):
+                if mastery is not None:
+                    position = get_topic_layout().index[f"{topic_id}_{subtopic_id}"]
+                    rec["mastery"] = round(mastery[position], 4)
+                    if mastery[position] >= self.tracer.MASTERED:
+                        continue
+
+                topic_level = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id][
+                    "level"
+                ]
                 rec["level"] = topic_level
 
                 if topic_level == "beginner":
@@ -237,20 +432,130 @@ class AdaptiveLearningEngine:
         if level == "beginner":
             # 70% beginner, 30% intermediate
             learning_path.extend(beginner_topics)
-            learning_path.extend(intermediate_topics[:max(1, len(intermediate_topics) // 3)])
+            learning_path.extend(
+                intermediate_topics[: max(1, len(intermediate_topics) // 3)]
+            )
         elif level == "intermediate":
             # 50% intermediate, 30% beginner (для повторения), 20% advanced
             learning_path.extend(intermediate_topics)
-            learning_path.extend(beginner_topics[:max(1, len(beginner_topics) // 3)])
-            learning_path.extend(advanced_topics[:max(1, len(advanced_topics) // 5)])
+            learning_path.extend(beginner_topics[: max(1, len(beginner_topics) // 3)])
+            learning_path.extend(advanced_topics[: max(1, len(advanced_topics) // 5)])
         else:  # advanced
             # 60% advanced, 40% intermediate (для закрепления)
             learning_path.extend(advanced_topics)
-            learning_path.extend(intermediate_topics[:max(2, len(intermediate_topics) // 2)])
+            learning_path.extend(
+                intermediate_topics[: max(2, len(intermediate_topics) // 2)]
+            )
+
+        # Требования ставим раньше зависящих от них тем
+        by_link = {rec["content_link"]: rec for rec in learning_path}
+        ordered = get_topic_graph().order_keys(list(by_link))
 
         # Ограничиваем путь 15 темами
-        return learning_path[:15]
+        return [by_link[link] for link in ordered][:15]
+
+    @with_student_lock
+    def start_adaptive_assessment(self, student_id: str, specialization: str) -> Dict:
+        """
+        Начинает адаптивный начальный тест: вопросы выдаются по одному,
+        каждый следующий подбирается под текущую оценку способности
+        """
+        if student_id in self.student_progress:
+            student = self.student_progress[student_id]
+            if student.get("adaptive_test") is not None:
+                # Продолжаем незаконченный тест
+                return self._adaptive_step(student_id)
+            if student.get("assessment") is not None:
+                print(f"Добро пожаловать, {student_id}! Продолжаем обучение.")
+                return self.get_next_content(student_id)
+            # Студент зарегистрирован (/register), но начальный тест еще
+            # не прошел: адаптивный тест заменяет обычный
+        else:
+            student = self._new_student_record(student_id, specialization)
+            self.student_progress[student_id] = student
 
+        student["adaptive_test"] = {"responses": [], "pending": None}
+        self._mark_dirty(student_id)
+
+        return self._adaptive_step(student_id)
+
+    @with_student_lock
+    def submit_adaptive_answer(
+        self, student_id: str, question_id: str, answer: int
+    ) -> Dict:
+        """
+        Принимает ответ на текущий вопрос адаптивного теста и возвращает
+        следующий вопрос или, если тест закончен, итоговую оценку
+        """
+        if student_id not in self.student_progress:
+            return {"error": "Студент не найден"}
+
+        state = self.student_progress[student_id].get("adaptive_test")
+        if state is None:
+            return {"error": "Адаптивный тест не начат"}
+        if question_id != state["pending"]:
+            return {
+                "error": "Ожидается ответ на другой вопрос",
+                "pending": state["pending"],
+            }
+
+        question = get_question_registry()[question_id]
+        state["responses"].append([question_id, 1 if answer == question.correct else 0])
+        state["pending"] = None
+        self.student_progress[student_id]["last_activity"] = datetime.now().isoformat()
+        self._mark_dirty(student_id)
+
+        return self._adaptive_step(student_id)
+
+    def _adaptive_step(self, student_id: str) -> Dict:
+        """
+        Выдает следующий вопрос адаптивного теста или завершает тест
+        """
+        student = self.student_progress[student_id]
+        state = student["adaptive_test"]
+        step = self.adaptive_test.step(state["responses"])
+        question = step["question"]
+
+        if question is None:
+            registry = get_question_registry()
+            topic_answers: Dict[str, List[int]] = {}
+            for question_id, correct in state["responses"]:
+                topic_answers.setdefault(registry[question_id].topic_key, []).append(
+                    correct
+                )
+            correct_answers = sum(correct for _, correct in state["responses"])
+            total_questions = len(state["responses"])
+
+            del student["adaptive_test"]
+            result = self._complete_assessment(
+                student_id,
+                topic_answers,
+                correct_answers,
+                total_questions,
+                ability=step,
+            )
+            result["finished"] = True
+            return result
+
+        state["pending"] = question["id"]
+        self._mark_dirty(student_id)
+        self.save_progress(student_id=student_id)
+
+        # Правильный ответ клиенту не отдаем: ответ проверяет сервер
+        payload = {
+            key: value for key, value in question.items() if key != "correct_answer"
+        }
+        payload["options"] = list(question["options"])
+        return {
+            "student_id": student_id,
+            "finished": False,
+            "question": payload,
+            "question_number": len(state["responses"]) + 1,
+            "ability": step["ability"],
+            "ability_se": step["ability_se"],
+        }
+
+    @with_student_lock
     def get_next_content(self, student_id: str) -> Dict:
         """
         Возвращает следующий контент для изучения
@@ -267,16 +572,12 @@ class AdaptiveLearningEngine:
         if not student.get("learning_path"):
             # Если пути нет, создаем новый
             if student.get("assessment"):
-                recommendations = self.assessor.recommend_topics(
-                    student["assessment"],
-                    student["specialization"]
-                )
-                learning_path = self._create_learning_path(
-                    recommendations,
-                    student["current_level"]
+                _, learning_path = self._build_plan(
+                    student, student["assessment"], student["current_level"]
                 )
                 student["learning_path"] = learning_path
                 student["current_topic_index"] = 0
+                self._mark_dirty(student_id)
             else:
                 return {"error": "Нет данных для обучения"}
 
@@ -284,20 +585,17 @@ class AdaptiveLearningEngine:
 
         if current_index >= len(student["learning_path"]):
             # Пройден весь путь, создаем новый
-            recommendations = self.assessor.recommend_topics(
-                student["assessment"],
-                student["specialization"]
-            )
-            student["learning_path"] = self._create_learning_path(
-                recommendations,
-                student["current_level"]
+            _, student["learning_path"] = self._build_plan(
+                student, student["assessment"], student["current_level"]
             )
             student["current_topic_index"] = 0
             current_index = 0
+            self._mark_dirty(student_id)
 
             # Добавляем достижение
-            self._add_achievement(student_id, "path_completed",
-                                  "🎓 Завершён первый учебный путь!")
+            self._add_achievement(
+                student_id, "path_completed", "🎓 Завершён первый учебный путь!"
+            )
 
         # Получаем текущую тему
         current_topic = student["learning_path"][current_index]
@@ -313,10 +611,13 @@ class AdaptiveLearningEngine:
         content["progress"] = {
             "current_topic": current_index + 1,
             "total_topics": len(student["learning_path"]),
-            "percentage": ((current_index) / len(student["learning_path"]) * 100)
-            if student["learning_path"] else 0,
+            "percentage": (
+                ((current_index) / len(student["learning_path"]) * 100)
+                if student["learning_path"]
+                else 0
+            ),
             "studied_topics": len(student.get("studied_topics", [])),
-            "streak_days": student.get("streak_days", 1)
+            "streak_days": student.get("streak_days", 1),
         }
 
         return {
@@ -324,14 +625,18 @@ class AdaptiveLearningEngine:
             "content": content,
             "topic_info": current_topic,
             "progress": content["progress"],
-            "message": f"Тема {current_index + 1} из {len(student['learning_path'])}"
+            "reviews_due": self.get_due_reviews(student_id),
+            "message": f"Тема {current_index + 1} из {len(student['learning_path'])}",
         }
 
     def get_topic_content(self, topic_id: str, subtopic_id: str) -> Optional[Dict]:
         """
         Возвращает контент для изучения темы
         """
-        if topic_id in THEORY_DATABASE and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]:
+        if (
+            topic_id in THEORY_DATABASE
+            and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]
+        ):
             content_data = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]
 
             # Добавляем дополнительные материалы в зависимости от специализации
@@ -345,25 +650,28 @@ class AdaptiveLearningEngine:
                 "subtopic_id": subtopic_id,
                 "subtopic_name": content_data.get("name", subtopic_id),
                 "level": content_data["level"],
-                "content": content_data["content"],
+                "content": get_lesson_body(topic_id, subtopic_id),
                 "practice_questions": content_data["questions"],
                 "specializations": content_data.get("specializations", {}),
                 "specialization_content": specialization_content,
-                "estimated_time": self._estimate_study_time(content_data["content"]),
-                "related_topics": self._get_related_topics(topic_id, subtopic_id)
+                "estimated_time": self._study_time_for_words(
+                    get_lesson_word_count(topic_id, subtopic_id)
+                ),
+                "related_topics": self._get_related_topics(topic_id, subtopic_id),
             }
 
         return None
 
-    def _get_specialization_content(self, topic_id: str, subtopic_id: str,
-                                    content_data: Dict) -> Dict:
+    def _get_specialization_content(
+        self, topic_id: str, subtopic_id: str, content_data: Dict
+    ) -> Dict:
         """
         Возвращает дополнительный контент для специализации
         """
-        specialization_content = {
+        specialization_content: Dict[str, List] = {
             "examples": [],
             "projects": [],
-            "resources": []
+            "resources": [],
         }
 
         # Примеры кода для разных специализаций
@@ -372,7 +680,7 @@ class AdaptiveLearningEngine:
                 {
                     "data_science": "df = pd.read_csv('data.csv')  # DataFrame для анализа",
                     "web_dev": "user_session = {}  # Словарь для данных сессии",
-                    "bioinformatics": "dna_sequence = 'ATCG'  # Последовательность ДНК"
+                    "bioinformatics": "dna_sequence = 'ATCG'  # Последовательность ДНК",
                 }
             ]
 
@@ -383,7 +691,7 @@ class AdaptiveLearningEngine:
                     "title": "Мини-проект",
                     "data_science": "Создайте список из 100 случайных чисел и посчитайте статистику",
                     "web_dev": "Создайте список пользователей и реализуйте поиск по имени",
-                    "bioinformatics": "Создайте список генетических последовательностей и найдите паттерны"
+                    "bioinformatics": "Создайте список генетических последовательностей и найдите паттерны",
                 }
             ]
 
@@ -391,7 +699,7 @@ class AdaptiveLearningEngine:
         specialization_content["resources"] = [
             {
                 "type": "Документация",
-                "link": "https://docs.python.org/3/tutorial/introduction.html"
+                "link": "https://docs.python.org/3/tutorial/introduction.html",
             }
         ]
 
@@ -401,83 +709,263 @@ class AdaptiveLearningEngine:
         """
         Оценивает время изучения в минутах
         """
-        words = len(content.split())
+        return self._study_time_for_words(len(content.split()))
+
+    def _study_time_for_words(self, words: int) -> int:
+        """
+        Оценивает время изучения в минутах по числу слов
+        """
         return max(5, min(30, words // 50))  # 5-30 минут
 
     def _get_related_topics(self, topic_id: str, subtopic_id: str) -> List[Dict]:
         """
         Возвращает связанные темы
         """
+        key = f"{topic_id}/{subtopic_id}"
         related = []
+        links = set()
+        for link, reason in get_topic_graph().related_topics(key):
+            related_topic, related_subtopic = link.split("/")
+            related.append(
+                {"topic": related_topic, "subtopic": related_subtopic, "reason": reason}
+            )
+            links.add(link)
 
-        if topic_id == "python_basics":
-            if subtopic_id == "variables":
-                related.append({"topic": "functions", "subtopic": "basic_functions",
-                                "reason": "Переменные используются в функциях"})
-            elif subtopic_id == "lists":
-                related.append({"topic": "python_basics", "subtopic": "variables",
-                                "reason": "Списки - это тип данных переменных"})
+        # Дополняем похожими по содержанию подтемами из готовой таблицы
+        similarity = get_topic_similarity(**self.similarity_options)
+        for link, score in similarity.related(key, self.RELATED_TOPICS):
+            if len(related) >= self.RELATED_TOPICS:
+                break
+            if link not in links:
+                related_topic, related_subtopic = link.split("/")
+                related.append(
+                    {
+                        "topic": related_topic,
+                        "subtopic": related_subtopic,
+                        "reason": f"Похожее содержание ({score:.0%})",
+                    }
+                )
 
         return related
 
-    def submit_topic_quiz(self, student_id: str, topic_id: str, subtopic_id: str,
-                          answers: List[int]) -> Dict:
+    @with_student_lock
+    def submit_topic_quiz(
+        self, student_id: str, topic_id: str, subtopic_id: str, answers: List[int]
+    ) -> Dict:
         """
         Принимает ответы на quiz по теме и обновляет прогресс
         """
         if student_id not in self.student_progress:
             return {"error": "Студент не найден"}
 
-        # Получаем правильные ответы
-        if (topic_id in THEORY_DATABASE and
-                subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]):
-            questions = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]["questions"]
+        result = self._apply_quiz(student_id, topic_id, subtopic_id, answers)
+        if result is None:
+            return {"error": "Тема не найдена"}
+
+        # Проверяем достижения
+        self._check_achievements(student_id)
 
-            # Проверяем ответы
-            correct = 0
-            for i, (question, answer) in enumerate(zip(questions, answers)):
-                if i < len(answers) and answer == question["correct"]:
-                    correct += 1
+        self.save_progress(student_id=student_id)
 
-            score = correct / len(questions) if questions else 0
+        result["message"] = (
+            f"Результат: {result['correct']}/{result['total']} ({result['score']:.1f}%)"
+        )
+        result["next_topic"] = (
+            self.get_next_content(student_id) if result["score"] >= 60 else None
+        )
+        return result
+
+    def _apply_quiz(
+        self,
+        student_id: str,
+        topic_id: str,
+        subtopic_id: str,
+        answers: List[int],
+        now: Optional[datetime] = None,
+    ) -> Optional[Dict]:
+        """
+        Проверяет ответы quiz и обновляет запись студента (без проверки
+        достижений и сохранения). now - время ответа; None - тема не найдена
+        """
+        # Получаем правильные ответы
+        questions = get_question_registry().questions_for(topic_id, subtopic_id)
+        if questions is None:
+            return None
+
+        # Проверяем ответы; вопросы без ответа считаются неверными
+        outcomes = [
+            1 if i < len(answers) and answers[i] == question.correct else 0
+            for i, question in enumerate(questions)
+        ]
+        correct = sum(outcomes)
 
-            # Отмечаем тему как изученную
-            result = self.mark_topic_completed(student_id, topic_id, subtopic_id, score)
+        score = correct / len(questions) if questions else 0
 
-            # Переходим к следующей теме
-            student = self.student_progress[student_id]
-            student["current_topic_index"] += 1
+        # Отмечаем тему как изученную
+        self.mark_topic_completed(
+            student_id, topic_id, subtopic_id, score, outcomes=outcomes, now=now
+        )
 
-            # Обновляем статистику
-            student["total_questions_answered"] += len(questions)
-            student["total_correct_answers"] += correct
+        # Переходим к следующей теме
+        student = self.student_progress[student_id]
+        student["current_topic_index"] += 1
 
-            # Проверяем достижения
-            self._check_achievements(student_id)
+        # Обновляем статистику
+        student["total_questions_answered"] += len(questions)
+        student["total_correct_answers"] += correct
+        self._mark_dirty(student_id)
 
-            self.save_progress()
+        return {
+            "success": True,
+            "score": score * 100,
+            "correct": correct,
+            "total": len(questions),
+        }
 
-            return {
-                "success": True,
-                "score": score * 100,
-                "correct": correct,
-                "total": len(questions),
-                "message": f"Результат: {correct}/{len(questions)} ({score * 100:.1f}%)",
-                "next_topic": self.get_next_content(student_id) if score >= 0.6 else None
-            }
+    def submit_answer_batch(self, events: List[Dict]) -> Dict:
+        """
+        Применяет пачку ответов на quiz (для LMS и офлайн-клиентов).
+
+        Событие - словарь с student_id, topic_id, subtopic_id, answers и
+        необязательным timestamp (ISO) - временем ответа. События каждого
+        студента применяются в порядке пачки под его блокировкой; серия
+        дней и достижения пересчитываются один раз на студента, а все
+        измененные записи сохраняются одной записью в хранилище. Возвращает
+        результат для каждого события в порядке пачки.
+        """
+        results: List[Optional[Dict]] = [None] * len(events)
+        by_student: Dict[str, List[Tuple[int, Dict]]] = {}
+        now = datetime.now()
+        for index, event in enumerate(events):
+            if (
+                not isinstance(event, dict)
+                or not isinstance(event.get("student_id"), str)
+                or not event.get("topic_id")
+                or not event.get("subtopic_id")
+                or not isinstance(event.get("answers", []), list)
+            ):
+                results[index] = {"index": index, "error": "Неверный формат события"}
+                continue
+            try:
+                at = (
+                    datetime.fromisoformat(event["timestamp"])
+                    if event.get("timestamp")
+                    else now
+                )
+            except (TypeError, ValueError):
+                results[index] = {"index": index, "error": "Неверное время ответа"}
+                continue
+            if at.tzinfo is not None:
+                at = at.astimezone().replace(tzinfo=None)
+            # Время из будущего (часы клиента убежали вперед) считаем текущим
+            at = min(at, now)
+            by_student.setdefault(event["student_id"], []).append(
+                (index, dict(event, timestamp=at))
+            )
 
-        return {"error": "Тема не найдена"}
+        for student_id, student_events in by_student.items():
+            self._apply_student_events(student_id, student_events, results)
 
-    def mark_topic_completed(self, student_id: str, topic_id: str, subtopic_id: str,
-                             quiz_score: float) -> Dict:
+        if self.flusher is not None:
+            self.flusher.notify()
+        else:
+            pending = list(by_student)
+            for attempt in range(MAX_CONFLICT_RETRIES):
+                try:
+                    self.student_progress.flush(
+                        pending, lock_for=self._student_locks.for_key
+                    )
+                    break
+                except VersionConflictError as e:
+                    if attempt == MAX_CONFLICT_RETRIES - 1:
+                        raise
+                    # Эти записи успел изменить другой процесс: применяем
+                    # их события заново к свежим записям
+                    pending = sorted(e.student_ids)
+                    self._resolve_conflicts(pending)
+
+        applied = sum(
+            1 for result in results if result is not None and result.get("success")
+        )
+        return {
+            "results": results,
+            "applied": applied,
+            "failed": len(results) - applied,
+            "students": len(by_student),
+        }
+
+    @with_student_lock
+    def _apply_student_events(
+        self,
+        student_id: str,
+        events: List[Tuple[int, Dict]],
+        results: List[Optional[Dict]],
+    ):
+        """
+        Применяет события одного студента из submit_answer_batch
+        """
+        if student_id not in self.student_progress:
+            for index, _ in events:
+                results[index] = {"index": index, "error": "Студент не найден"}
+            return
+
+        # Серия дней - как если бы студент открывал урок в каждый из дней
+        self._update_streak(student_id, [event["timestamp"] for _, event in events])
+        for index, event in events:
+            result = self._apply_quiz(
+                student_id,
+                event["topic_id"],
+                event["subtopic_id"],
+                event.get("answers", []),
+                now=event["timestamp"],
+            )
+            results[index] = (
+                dict(result, index=index)
+                if result is not None
+                else {"index": index, "error": "Тема не найдена"}
+            )
+        self._check_achievements(student_id)
+
+    @with_student_lock
+    def mark_topic_completed(
+        self,
+        student_id: str,
+        topic_id: str,
+        subtopic_id: str,
+        quiz_score: float,
+        outcomes: Optional[List[int]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict:
         """
-        Отмечает тему как изученную
+        Отмечает тему как изученную.
+
+        outcomes - результаты отдельных вопросов quiz (1/0); без них
+        вероятность освоения обновляется по доле верных ответов quiz_score.
+        now - время прохождения (по умолчанию текущее)
         """
         if student_id not in self.student_progress:
             return {"error": "Студент не найден"}
 
         student = self.student_progress[student_id]
         topic_key = f"{topic_id}_{subtopic_id}"
+        now = now or datetime.now()
+
+        # Обновляем вероятность освоения темы
+        for outcome in (outcomes if outcomes is not None else [quiz_score]):
+            self.tracer.observe(student, topic_key, outcome)
+        mastery = self.tracer.mastery(student, topic_key)
+        if (
+            mastery is not None
+            and student.get("assessment")
+            and "topic_scores" in student["assessment"]
+        ):
+            student["assessment"]["topic_scores"][topic_key] = round(mastery * 100, 1)
+        # Ответ на quiz (в том числе повторение) - активность студента;
+        # ответы из пачки могут прийти не по порядку времени
+        student["last_activity"] = max(
+            now.isoformat(), student.get("last_activity", "")
+        )
+        self._mark_dirty(student_id)
 
         # Проверяем, не изучали ли уже эту тему
         if not any(t["topic"] == topic_key for t in student.get("studied_topics", [])):
@@ -485,68 +973,147 @@ class AdaptiveLearningEngine:
                 "topic": topic_key,
                 "topic_id": topic_id,
                 "subtopic_id": subtopic_id,
-                "completed_date": datetime.now().isoformat(),
+                "completed_date": now.isoformat(),
                 "score": quiz_score,
-                "retake_count": 0
+                "retake_count": 0,
             }
+            self._schedule_review(student_id, studied_topic, quiz_score, now)
 
             student.setdefault("studied_topics", []).append(studied_topic)
 
-            # Обновляем оценку знаний
-            if student.get("assessment") and "topic_scores" in student["assessment"]:
-                student["assessment"]["topic_scores"][topic_key] = quiz_score * 100
-
             # Обновляем последнюю дату изучения
-            student["last_study_date"] = datetime.now().isoformat()
+            student["last_study_date"] = max(
+                now.isoformat(), student.get("last_study_date", "")
+            )
+            self._mark_dirty(student_id)
 
             return {
                 "success": True,
                 "message": f"Тема '{subtopic_id}' отмечена как изученная!",
-                "total_studied": len(student["studied_topics"])
+                "total_studied": len(student["studied_topics"]),
             }
 
         # Если тема уже изучена, увеличиваем счетчик повторений
         for topic in student.get("studied_topics", []):
             if topic["topic"] == topic_key:
                 topic["retake_count"] = topic.get("retake_count", 0) + 1
-                topic["last_retake_date"] = datetime.now().isoformat()
+                topic["last_retake_date"] = now.isoformat()
+                self._schedule_review(student_id, topic, quiz_score, now)
+                self._mark_dirty(student_id)
                 break
 
         return {
             "success": True,
             "message": f"Тема '{subtopic_id}' повторена!",
-            "total_studied": len(student["studied_topics"])
+            "total_studied": len(student["studied_topics"]),
         }
 
-    def _update_streak(self, student_id: str):
+    def _schedule_review(
+        self,
+        student_id: str,
+        studied_topic: Dict,
+        quiz_score: float,
+        now: Optional[datetime] = None,
+    ):
         """
-        Обновляет счетчик дней подряд обучения
+        Пересчитывает интервал повторения темы по результату quiz и
+        ставит повторение в общую очередь
         """
+        due = sm2_update(
+            studied_topic, quality_from_score(quiz_score), now or datetime.now()
+        )
+        if not self.store.supports_review_queue:
+            self.reviews.schedule(student_id, studied_topic["topic"], due)
+
+    @with_student_lock
+    def get_due_reviews(
+        self, student_id: str, now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Возвращает темы студента, которые пора повторить, - сначала
+        самые просроченные
+        """
+        if student_id not in self.student_progress:
+            return []
+
+        now = now or datetime.now()
         student = self.student_progress[student_id]
-        last_date = datetime.fromisoformat(student.get("last_study_date",
-                                                       student["start_date"]))
-        current_date = datetime.now()
+        reviews = []
+        for topic in student.get("studied_topics", []):
+            due = review_due(topic)
+            if due is not None and due <= now:
+                reviews.append((due, topic))
+        reviews.sort(key=lambda item: item[0])
 
-        # Если разница в днях = 1, увеличиваем streak
-        if (current_date.date() - last_date.date()).days == 1:
-            student["streak_days"] = student.get("streak_days", 1) + 1
-        elif (current_date.date() - last_date.date()).days > 1:
-            # Слишком большой перерыв, сбрасываем streak
-            student["streak_days"] = 1
+        return [
+            {
+                "topic": topic["topic"],
+                "content_link": f"{topic['topic_id']}/{topic['subtopic_id']}",
+                "due": due.isoformat(),
+                "overdue_days": (now - due).days,
+                "repetitions": topic.get("repetitions", 0),
+            }
+            for due, topic in reviews
+        ]
 
-        # Обновляем дату
-        student["last_study_date"] = current_date.isoformat()
+    def get_population_due_reviews(
+        self, now: Optional[datetime] = None, limit: int = 100
+    ) -> List[Dict]:
+        """
+        Возвращает повторения всех студентов, время которых наступило,
+        из общей очереди - без обхода записей студентов. SQLite выбирает
+        их сама по индексу (видны сохраненные изменения), для файловых
+        хранилищ очередь держится в памяти
+        """
+        due = self.store.due_reviews(now or datetime.now(), limit)
+        if due is None:
+            due = self.reviews.due(now, limit)
+        return [
+            {"student_id": student_id, "topic": topic_key, "due": due_at.isoformat()}
+            for student_id, topic_key, due_at in due
+        ]
+
+    def _update_streak(
+        self, student_id: str, study_times: Optional[List[datetime]] = None
+    ):
+        """
+        Обновляет счетчик дней подряд обучения по времени занятий (по
+        умолчанию - одно занятие сейчас)
+        """
+        student = self.student_progress[student_id]
+        streak = student.get("streak_days")
+        last_date = datetime.fromisoformat(
+            student.get("last_study_date", student["start_date"])
+        )
+        previous_day = last_date.date() if "last_study_date" in student else None
+
+        for current_date in sorted(study_times or [datetime.now()]):
+            # Если разница в днях = 1, увеличиваем streak
+            if (current_date.date() - last_date.date()).days == 1:
+                student["streak_days"] = student.get("streak_days", 1) + 1
+            elif (current_date.date() - last_date.date()).days > 1:
+                # Слишком большой перерыв, сбрасываем streak
+                student["streak_days"] = 1
+            last_date = max(last_date, current_date)
+
+        # Обновляем дату; для серии важен только день, поэтому повторные
+        # занятия в тот же день запись не меняют и не ставят ее в очередь
+        # на сохранение
+        if last_date.date() != previous_day or student.get("streak_days") != streak:
+            student["last_study_date"] = last_date.isoformat()
+            self._mark_dirty(student_id)
 
         # Проверяем достижения по streak
         if student["streak_days"] >= 7:
-            self._add_achievement(student_id, "week_streak",
-                                  "🔥 Неделя обучения без перерыва!")
+            self._add_achievement(
+                student_id, "week_streak", "🔥 Неделя обучения без перерыва!"
+            )
         if student["streak_days"] >= 30:
-            self._add_achievement(student_id, "month_streak",
-                                  "🏆 Месяц регулярного обучения!")
+            self._add_achievement(
+                student_id, "month_streak", "🏆 Месяц регулярного обучения!"
+            )
 
-    def _add_achievement(self, student_id: str, achievement_id: str,
-                         description: str):
+    def _add_achievement(self, student_id: str, achievement_id: str, description: str):
         """
         Добавляет достижение студенту
         """
@@ -556,9 +1123,10 @@ class AdaptiveLearningEngine:
             achievement = {
                 "id": achievement_id,
                 "description": description,
-                "date_earned": datetime.now().isoformat()
+                "date_earned": datetime.now().isoformat(),
             }
             student.setdefault("achievements", []).append(achievement)
+            self._mark_dirty(student_id)
 
     def _check_achievements(self, student_id: str):
         """
@@ -568,43 +1136,56 @@ class AdaptiveLearningEngine:
 
         # Достижение за количество изученных тем
         studied_count = len(student.get("studied_topics", []))
-        if studied_count >= 5 and not any(a["id"] == "5_topics"
-                                          for a in student.get("achievements", [])):
-            self._add_achievement(student_id, "5_topics",
-                                  "📚 Изучено 5 тем!")
-        if studied_count >= 10 and not any(a["id"] == "10_topics"
-                                           for a in student.get("achievements", [])):
-            self._add_achievement(student_id, "10_topics",
-                                  "🎓 Изучено 10 тем!")
+        if studied_count >= 5 and not any(
+            a["id"] == "5_topics" for a in student.get("achievements", [])
+        ):
+            self._add_achievement(student_id, "5_topics", "📚 Изучено 5 тем!")
+        if studied_count >= 10 and not any(
+            a["id"] == "10_topics" for a in student.get("achievements", [])
+        ):
+            self._add_achievement(student_id, "10_topics", "🎓 Изучено 10 тем!")
 
         # Достижение за точность
         total_questions = student.get("total_questions_answered", 0)
         correct_answers = student.get("total_correct_answers", 0)
         if total_questions >= 20:
             accuracy = correct_answers / total_questions if total_questions > 0 else 0
-            if accuracy >= 0.8 and not any(a["id"] == "high_accuracy"
-                                           for a in student.get("achievements", [])):
-                self._add_achievement(student_id, "high_accuracy",
-                                      "🎯 Высокая точность ответов (80%+)")
+            if accuracy >= 0.8 and not any(
+                a["id"] == "high_accuracy" for a in student.get("achievements", [])
+            ):
+                self._add_achievement(
+                    student_id, "high_accuracy", "🎯 Высокая точность ответов (80%+)"
+                )
 
+    @with_student_lock
     def get_student_progress(self, student_id: str) -> Dict:
         """
         Возвращает прогресс студента
         """
         if student_id in self.student_progress:
-            student = self.student_progress[student_id].copy()
+            # Глубокая копия: ответ сериализуется уже без блокировки,
+            # пока другие потоки могут менять запись
+            student = copy.deepcopy(self.student_progress[student_id])
+
+            # Упакованный массив отдаем словарем "тема -> вероятность"
+            if MASTERY_KEY in student:
+                student["topic_mastery"] = self.tracer.mastery_map(student)
+                del student[MASTERY_KEY]
+                student.pop(LAYOUT_KEY, None)
 
             # Рассчитываем прогресс
             total_topics = sum(len(t["subtopics"]) for t in THEORY_DATABASE.values())
             studied_count = len(student.get("studied_topics", []))
-            student["overall_progress_percentage"] = (studied_count / total_topics * 100) \
-                if total_topics > 0 else 0
+            student["overall_progress_percentage"] = (
+                (studied_count / total_topics * 100) if total_topics > 0 else 0
+            )
 
             # Рассчитываем точность
             total_q = student.get("total_questions_answered", 0)
             correct_q = student.get("total_correct_answers", 0)
-            student["accuracy_percentage"] = (correct_q / total_q * 100) \
-                if total_q > 0 else 0
+            student["accuracy_percentage"] = (
+                (correct_q / total_q * 100) if total_q > 0 else 0
+            )
 
             # Информация о текущем пути
             learning_path = student.get("learning_path", [])
@@ -614,14 +1195,18 @@ class AdaptiveLearningEngine:
                 student["path_progress"] = {
                     "current": current_index + 1,
                     "total": len(learning_path),
-                    "percentage": (current_index / len(learning_path) * 100)
-                    if learning_path else 0
+                    "percentage": (
+                        (current_index / len(learning_path) * 100)
+                        if learning_path
+                        else 0
+                    ),
                 }
 
             return student
 
         return {"error": "Студент не найден"}
 
+    @with_student_lock
     def get_recommendations(self, student_id: str) -> List[Dict]:
         """
         Возвращает персональные рекомендации
@@ -634,14 +1219,28 @@ class AdaptiveLearningEngine:
         if not student.get("assessment"):
             return []
 
-        # Базовые рекомендации на основе оценок
-        recommendations = self.assessor.recommend_topics(
-            student["assessment"],
-            student["specialization"]
+        # Базовые рекомендации на основе вероятностей освоения тем
+        recommendations, _ = self._build_plan(
+            student, student["assessment"], student["current_level"]
+        )
+
+        # Подмешиваем темы, с которыми не справлялись похожие студенты
+        recommendations = blend_recommendations(
+            recommendations,
+            self.neighbor_table,
+            student["assessment"].get("topic_scores", {}),
+            self.tracer.state(student),
+            student["specialization"],
+            self.assessor.RECOMMEND_THRESHOLD,
         )
 
         # Добавляем рекомендации на основе истории изучения
         studied_topics = {t["topic"] for t in student.get("studied_topics", [])}
+        graph = get_topic_graph()
+        studied_mask = graph.mask_of(
+            f"{t.get('topic_id')}/{t.get('subtopic_id')}"
+            for t in student.get("studied_topics", [])
+        )
 
         enhanced_recs = []
         for rec in recommendations:
@@ -650,11 +1249,21 @@ class AdaptiveLearningEngine:
             if topic_key not in studied_topics:
                 # Добавляем дополнительную информацию
                 topic_id, subtopic_id = rec["content_link"].split("/")
-                if topic_id in THEORY_DATABASE and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]:
+                if (
+                    topic_id in THEORY_DATABASE
+                    and subtopic_id in THEORY_DATABASE[topic_id]["subtopics"]
+                ):
                     topic_data = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]
-                    rec["estimated_time"] = self._estimate_study_time(topic_data["content"])
+                    rec["estimated_time"] = self._study_time_for_words(
+                        get_lesson_word_count(topic_id, subtopic_id)
+                    )
                     rec["level"] = topic_data["level"]
-                    rec["prerequisites"] = self._get_prerequisites(topic_id, subtopic_id)
+                    rec["prerequisites"] = self._get_prerequisites(
+                        topic_id, subtopic_id
+                    )
+                    rec["prerequisites_met"] = graph.is_unlocked(
+                        rec["content_link"], studied_mask
+                    )
 
                     enhanced_recs.append(rec)
 
@@ -664,46 +1273,194 @@ class AdaptiveLearningEngine:
         """
         Возвращает предварительные требования для темы
         """
-        prerequisites = []
+        return get_topic_graph().prerequisite_names(f"{topic_id}/{subtopic_id}")
 
-        if topic_id == "functions" and subtopic_id == "basic_functions":
-            prerequisites.append("Переменные и типы данных")
-            prerequisites.append("Основные операторы")
+    def _apply_changes(self, student_id: str):
+        """
+        Применяет к записи студента изменения из журнала, которых в ней
+        еще нет (после конфликта версий - все несохраненные), и
+        возвращает результат последнего. Вызывается под блокировкой
+        студента.
+        """
+        result = None
+        changes = self.student_progress.unapplied_changes(student_id)
+        for index, (method, args, kwargs) in enumerate(changes):
+            self.student_progress.mark_applied(student_id)
+            self._call_depth.changed = False
+            try:
+                result = method(self, student_id, *args, **kwargs)
+            except VersionConflictError:
+                raise
+            except Exception as e:
+                if index == len(changes) - 1:
+                    raise
+                # Повторить раньше сохраненный вызов не вышло: отбрасываем его
+                print(f"Изменение студента {student_id} не применено повторно: {e}")
+                self.student_progress.forget_change(student_id, changes[index])
+        return result
+
+    def _resolve_conflicts(self, student_ids: Iterable[str]):
+        """
+        Применяет несохраненные изменения студентов, чьи записи проиграли
+        конфликт версий, к свежим записям из хранилища
+        """
+        for student_id in sorted(student_ids):
+            with self._student_locks.for_key(student_id):
+                depth = getattr(self._call_depth, "value", 0)
+                self._call_depth.value = 1
+                try:
+                    for _ in range(MAX_CONFLICT_RETRIES):
+                        try:
+                            self._apply_changes(student_id)
+                            break
+                        except VersionConflictError:
+                            self.student_progress.invalidate(student_id)
+                finally:
+                    self._call_depth.value = depth
 
-        elif topic_id == "oop" and subtopic_id == "classes":
-            prerequisites.append("Функции")
-            prerequisites.append("Списки и словари")
+    def _mark_dirty(self, student_id: str):
+        """
+        Отмечает студента как изменившегося с последнего сохранения и
+        обновляет сводную статистику
+        """
+        self._call_depth.changed = True
+        self.student_progress.mark_dirty(student_id)
+        if not self.store.supports_population_counters:
+            self.population.update(student_id, self.student_progress[student_id])
+
+    def save_progress(
+        self, filepath: Optional[str] = None, student_id: Optional[str] = None
+    ):
+        """
+        Сохраняет прогресс изменившихся студентов в хранилище.
+
+        Методы движка передают student_id и сохраняют только запись
+        студента, блокировку которого они держат. В режиме write-behind
+        запись выполняет фоновый поток, а здесь он только оповещается
+        об изменениях. Если явно указан filepath, прогресс всех
+        студентов выгружается в этот файл целиком.
+        """
+        if self.flusher is not None and filepath is None:
+            self.flusher.notify()
+            return
+
+        if student_id is not None:
+            with self._student_locks.for_key(student_id):
+                self.student_progress.flush([student_id])
+            self._save_population_stats()
+        else:
+            self._flush_all()
 
-        return prerequisites
+        if filepath is not None:
+            JsonProgressStore(filepath).save_all(self.store.load_all())
 
-    def save_progress(self, filepath: str = "data/student_progress.json"):
+    def _flush_all(self):
         """
-        Сохраняет прогресс всех студентов
+        Сохраняет всех измененных студентов, снимая копии их записей
+        под блокировками
         """
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        for _ in range(100):
+            try:
+                self.student_progress.flush(lock_for=self._student_locks.for_key)
+            except VersionConflictError as e:
+                # Устаревшие копии выброшены, остальные записи сохранены;
+                # изменения проигравших студентов применяем к свежим записям
+                print(f"Сохранение прогресса: {e}")
+                self._resolve_conflicts(e.student_ids)
+            if not self.student_progress.dirty_count():
+                break
+            # Кто-то из студентов сейчас меняется, повторим чуть позже
+            time.sleep(0.01)
+        self._save_population_stats(force=True)
 
-        # Преобразуем datetime в строки
-        serializable_progress = {}
-        for student_id, data in self.student_progress.items():
-            serializable_data = data.copy()
-            # Убеждаемся, что все даты - строки
-            for key, value in data.items():
-                if isinstance(value, datetime):
-                    serializable_data[key] = value.isoformat()
-            serializable_progress[student_id] = serializable_data
+    def _save_population_stats(self, force: bool = False):
+        """
+        Сохраняет сводную статистику в stats_path, если она могла
+        измениться и с прошлого сохранения прошло stats_interval секунд
+        (force - не дожидаясь интервала)
+        """
+        if not self.stats_path:
+            return
+        if not force and time.monotonic() - self._stats_saved_at < self.stats_interval:
+            return
+
+        with self._stats_lock:
+            counters = self.store.population_counters()
+            if counters is not None:
+                save_stats_file(self.stats_path, stats_from_counters(counters))
+            else:
+                version = self.population.version
+                if version == self._saved_stats_version:
+                    return
+                self.population.save(self.stats_path)
+                self._saved_stats_version = version
+            self._stats_saved_at = time.monotonic()
+
+    def get_population_stats(self) -> Dict:
+        """
+        Возвращает сводку по всем студентам без обхода их записей
+        """
+        counters = self.store.population_counters()
+        if counters is not None:
+            return stats_snapshot(stats_from_counters(counters))
+        return self.population.snapshot()
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(serializable_progress, f, ensure_ascii=False, indent=2)
+    def load_progress(self, filepath: Optional[str] = None):
+        """
+        Подключает прогресс студентов из хранилища (или из указанного
+        JSON-файла, который становится хранилищем движка).
 
-    def load_progress(self, filepath: str = "data/student_progress.json"):
+        Сами записи читаются лениво, при первом обращении к студенту.
         """
-        Загружает прогресс студентов
+        if filepath is not None:
+            self.store = JsonProgressStore(filepath)
+
+        self.student_progress = StudentCache(self.store, self.cache_size)
+        # Очередь повторений и сводку SQLite хранит сама, и запуск не
+        # перебирает студентов; файловые хранилища и так читают все
+        # записи, для них очередь и счетчики строятся в памяти
+        self.reviews = ReviewScheduler()
+        self.population = PopulationStats()
+        if not self.store.supports_review_queue:
+            self.reviews.load(self.store.studied_topic_entries())
+        if not self.store.supports_population_counters:
+            self.population.load(self.store.student_summaries())
+
+        if self.flusher is not None:
+            self.flusher.stop()
+            self.flusher = None
+        if self.write_behind:
+            self.flusher = WriteBehindFlusher(
+                self.student_progress,
+                self.flush_interval,
+                self.flush_threshold,
+                lock_for=self._student_locks.for_key,
+                after_flush=self._save_population_stats,
+                on_conflict=self._resolve_conflicts,
+            )
+            self.flusher.start()
+
+    def close(self):
         """
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    self.student_progress = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.student_progress = {}
-        else:
-            self.student_progress = {}
\ No newline at end of file
+        Сохраняет несохраненные изменения и закрывает хранилище
+        """
+        if self.flusher is not None:
+            self.flusher.stop()
+            self.flusher = None
+        self.save_progress()
+        self.store.close()
+
+    def get_storage_metrics(self) -> Dict:
+        """
+        Возвращает метрики хранения прогресса
+        """
+        metrics = {
+            "backend": type(self.store).__name__,
+            "write_behind": self.flusher is not None,
+            "cached_students": self.student_progress.loaded_count(),
+            "queue_depth": self.student_progress.dirty_count(),
+            "recommendation_cache": self.recommendation_cache.metrics(),
+        }
+        if self.flusher is not None:
+            metrics.update(self.flusher.metrics())
+        return metrics
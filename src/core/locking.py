@@ -0,0 +1,28 @@
+"""
+Блокировки для параллельной работы с прогрессом студентов
+"""
+
+import threading
+import zlib
+from typing import List
+
+
+class StripedLock:
+    """
+    Набор из фиксированного числа блокировок ("полос").
+
+    Каждый студент отображается на одну полосу по хешу идентификатора,
+    поэтому запросы разных студентов почти никогда не ждут друг друга,
+    а запросы одного студента выполняются строго по очереди. Блокировки
+    реентерабельные: методы движка могут вызывать друг друга.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks: List[threading.RLock] = [threading.RLock() for _ in range(stripes)]
+
+    def for_key(self, key: str) -> threading.RLock:
+        """
+        Возвращает блокировку полосы для ключа
+        """
+        # crc32 стабилен между процессами, в отличие от hash() для строк
+        return self._locks[zlib.crc32(key.encode("utf-8")) % len(self._locks)]
@@ -0,0 +1,237 @@
+"""
+Сводная статистика по всем студентам, обновляемая при каждом изменении
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+LEVELS = ("beginner", "intermediate", "advanced")
+DEFAULT_STATS_PATH = "data/population_stats.json"
+
+# (специализация, уровень, изучено тем, дата последней активности)
+Summary = Tuple[str, str, int, str]
+
+
+def make_summary(
+    specialization: Optional[str],
+    level: Optional[str],
+    studied: int,
+    last_activity: Optional[str],
+) -> Summary:
+    """
+    Вклад студента по полям его записи (как их отдает
+    ProgressStore.student_summaries)
+    """
+    return (
+        sys.intern(specialization or "unknown"),
+        sys.intern(level or "unknown"),
+        studied,
+        (last_activity or "")[:10],
+    )
+
+
+def summarize(record: Dict) -> Summary:
+    """
+    Вклад одного студента в статистику
+    """
+    return make_summary(
+        record.get("specialization"),
+        record.get("current_level"),
+        len(record.get("studied_topics") or ()),
+        record.get("last_activity"),
+    )
+
+
+class PopulationStats:
+    """
+    Счетчики по студентам: сколько их всего, по специализациям, по
+    уровням, сколько тем изучено и сколько было активно в каждый день.
+
+    Для каждого студента хранится его последний учтенный вклад
+    (summarize), поэтому изменение записи обновляет счетчики разностью
+    старого и нового вклада за O(1), а snapshot() не перебирает
+    студентов.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, Summary] = {}
+        self.by_specialization: Dict[str, int] = {}
+        self.by_level: Dict[str, int] = {level: 0 for level in LEVELS}
+        self.total_topics_studied = 0
+        self.active_by_date: Dict[str, int] = {}
+        # Растет при каждом изменении счетчиков
+        self.version = 0
+
+    def load(
+        self,
+        summaries: Iterable[
+            Tuple[str, Optional[str], Optional[str], int, Optional[str]]
+        ],
+    ):
+        """
+        Заполняет счетчики заново по строкам ProgressStore.student_summaries()
+        """
+        with self._lock:
+            self._summaries.clear()
+            self.by_specialization.clear()
+            self.by_level = {level: 0 for level in LEVELS}
+            self.total_topics_studied = 0
+            self.active_by_date.clear()
+            for student_id, specialization, level, studied, last_activity in summaries:
+                summary = make_summary(specialization, level, studied, last_activity)
+                self._summaries[student_id] = summary
+                self._apply(summary, 1)
+            self.version += 1
+
+    def _apply(self, summary: Summary, sign: int):
+        specialization, level, studied, activity_date = summary
+        self.by_specialization[specialization] = (
+            self.by_specialization.get(specialization, 0) + sign
+        )
+        if not self.by_specialization[specialization]:
+            del self.by_specialization[specialization]
+        if level in self.by_level:
+            self.by_level[level] += sign
+        self.total_topics_studied += sign * studied
+        if activity_date:
+            self.active_by_date[activity_date] = (
+                self.active_by_date.get(activity_date, 0) + sign
+            )
+            if not self.active_by_date[activity_date]:
+                del self.active_by_date[activity_date]
+
+    def update(self, student_id: str, record: Dict):
+        """
+        Учитывает новое состояние записи студента (или нового студента)
+        """
+        summary = summarize(record)
+        with self._lock:
+            previous = self._summaries.get(student_id)
+            if previous == summary:
+                return
+            if previous is not None:
+                self._apply(previous, -1)
+            self._summaries[student_id] = summary
+            self._apply(summary, 1)
+            self.version += 1
+
+    def remove(self, student_id: str):
+        """
+        Убирает студента из статистики
+        """
+        with self._lock:
+            previous = self._summaries.pop(student_id, None)
+            if previous is not None:
+                self._apply(previous, -1)
+                self.version += 1
+
+    def snapshot(self, day: Optional[date] = None) -> Dict:
+        """
+        Текущие счетчики; active_today - для дня day (по умолчанию сегодня)
+        """
+        day_key = (day or date.today()).isoformat()
+        with self._lock:
+            return {
+                "total_students": len(self._summaries),
+                "by_specialization": dict(self.by_specialization),
+                "by_level": dict(self.by_level),
+                "total_topics_studied": self.total_topics_studied,
+                "active_today": self.active_by_date.get(day_key, 0),
+                "date": day_key,
+                "version": self.version,
+            }
+
+    def to_dict(self) -> Dict:
+        """
+        Все счетчики, включая активность по дням
+        """
+        with self._lock:
+            return {
+                "total_students": len(self._summaries),
+                "by_specialization": dict(self.by_specialization),
+                "by_level": dict(self.by_level),
+                "total_topics_studied": self.total_topics_studied,
+                "active_by_date": dict(self.active_by_date),
+                "updated_at": datetime.now().isoformat(),
+            }
+
+    def save(self, path: str):
+        """
+        Сохраняет счетчики в JSON-файл для отчетов, которые не поднимают
+        движок
+        """
+        save_stats_file(path, self.to_dict())
+
+
+def stats_from_counters(counters: Dict[str, Dict[str, int]]) -> Dict:
+    """
+    Счетчики, которые ведет хранилище (ProgressStore.population_counters),
+    в формате PopulationStats.to_dict
+    """
+    levels = counters.get("level", {})
+    return {
+        "total_students": counters.get("students", {}).get("", 0),
+        "by_specialization": dict(counters.get("specialization", {})),
+        "by_level": {level: levels.get(level, 0) for level in LEVELS},
+        "total_topics_studied": counters.get("topics", {}).get("", 0),
+        "active_by_date": dict(counters.get("active", {})),
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+def stats_from_store(store) -> Dict:
+    """
+    Счетчики по хранилищу прогресса в формате PopulationStats.to_dict:
+    готовые (population_counters) или собранные обходом записей
+    """
+    counters = store.population_counters()
+    if counters is not None:
+        return stats_from_counters(counters)
+    stats = PopulationStats()
+    stats.load(store.student_summaries())
+    return stats.to_dict()
+
+
+def stats_snapshot(stats: Dict, day: Optional[date] = None) -> Dict:
+    """
+    Сводка в формате PopulationStats.snapshot по счетчикам в формате to_dict
+    """
+    day_key = (day or date.today()).isoformat()
+    return {
+        "total_students": stats["total_students"],
+        "by_specialization": stats["by_specialization"],
+        "by_level": stats["by_level"],
+        "total_topics_studied": stats["total_topics_studied"],
+        "active_today": stats["active_by_date"].get(day_key, 0),
+        "date": day_key,
+    }
+
+
+def save_stats_file(path: str, payload: Dict):
+    """
+    Атомарно записывает счетчики в JSON-файл: читатель видит либо
+    старый, либо новый файл целиком
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_stats_file(path: str = DEFAULT_STATS_PATH) -> Optional[Dict]:
+    """
+    Читает счетчики, сохраненные PopulationStats.save; None, если файла нет
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,107 @@
+"""
+Кэш рекомендаций и путей обучения по отпечатку состояния студента
+"""
+
+import hashlib
+import json
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.data.catalog import knowledge_base_version
+
+Plan = Tuple[List[Dict], List[Dict]]
+
+
+class RecommendationCache:
+    """
+    LRU рекомендаций и пути обучения.
+
+    Ключ - отпечаток всего, от чего зависит результат: баллов тем,
+    вероятностей освоения, специализации, уровня и версии базы знаний.
+    Поэтому отдельная инвалидация не нужна: изменение балла в
+    mark_topic_completed или новая версия каталога дают новый ключ, а
+    старая запись вытесняется как давно не использованная. Студенты с
+    одинаковым состоянием (например, с одинаковыми ответами теста)
+    делят одну запись.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._entries: "OrderedDict[bytes, Plan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(
+        topic_scores: Dict[str, float],
+        specialization: str,
+        level: str,
+        mastery: Optional[array] = None,
+    ) -> bytes:
+        """
+        Возвращает отпечаток состояния студента
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            json.dumps(
+                [
+                    knowledge_base_version(),
+                    specialization,
+                    level,
+                    sorted(topic_scores.items()),
+                ]
+            ).encode("utf-8")
+        )
+        if mastery is not None:
+            digest.update(bytes(mastery))
+        return digest.digest()
+
+    def get_or_build(self, key: bytes, builder: Callable[[], Plan]) -> Plan:
+        """
+        Возвращает копию (рекомендации, путь) из кэша или строит их
+        """
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if plan is None:
+            plan = builder()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = plan
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+
+        # Вызывающий код дополняет элементы, поэтому отдаем копии
+        recommendations, learning_path = plan
+        return [dict(rec) for rec in recommendations], [
+            dict(rec) for rec in learning_path
+        ]
+
+    def clear(self):
+        """
+        Очищает кэш и счетчики
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def metrics(self) -> Dict:
+        """
+        Возвращает размер кэша и счетчики попаданий
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
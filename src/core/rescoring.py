@@ -0,0 +1,302 @@
+"""
+Массовый пересчет оценок и путей обучения всех студентов
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.catalog import knowledge_base_version, load_content_pack
+from src.storage import SQLiteProgressStore, create_progress_store
+from src.storage.base import ProgressStore, serialize_record
+
+MANIFEST_NAME = "manifest.json"
+
+# Движок и хранилище процесса-воркера (создаются в _init_worker)
+_worker_engine: AdaptiveLearningEngine
+_worker_store: Optional[ProgressStore] = None
+
+
+def _planner(thresholds: Optional[Dict[str, float]]) -> AdaptiveLearningEngine:
+    """
+    Движок без данных для пересчета; thresholds - новые пороги оценки
+    (атрибуты SimpleKnowledgeAssessor), заданные только этому движку
+    """
+    engine = AdaptiveLearningEngine(SQLiteProgressStore(":memory:"))
+    for name, value in (thresholds or {}).items():
+        if not name.endswith("_THRESHOLD") or not hasattr(engine.assessor, name):
+            raise ValueError(f"Неизвестный порог оценки: {name}")
+        setattr(engine.assessor, name, value)
+    return engine
+
+
+def _init_worker(
+    backend: str,
+    path: str,
+    point_reads: bool,
+    content_pack: Optional[str],
+    thresholds: Optional[Dict[str, float]],
+):
+    """
+    Готовит воркер: свой движок без данных и, если хранилище умеет
+    точечное чтение, свое подключение к нему. Все настройки приходят
+    аргументами, поэтому воркер не зависит от способа запуска процессов
+    (fork или spawn)
+    """
+    global _worker_engine, _worker_store
+    if content_pack:
+        load_content_pack(content_pack)
+    _worker_engine = _planner(thresholds)
+    _worker_store = create_progress_store(backend, path) if point_reads else None
+
+
+def _rescore_chunk(
+    task: Tuple[int, str, List[str], Optional[Mapping[str, Optional[Dict]]]],
+) -> Tuple[int, int]:
+    """
+    Пересчитывает одну часть студентов и атомарно записывает результат
+    в файл части (JSON Lines). Возвращает номер части и число студентов
+    """
+    index, chunk_path, student_ids, records = task
+    if records is None:
+        # Записи не переданы только хранилищам с точечным чтением
+        assert _worker_store is not None
+        records = {
+            student_id: _worker_store.load_student(student_id)
+            for student_id in student_ids
+        }
+
+    tmp_path = chunk_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for student_id, record in records.items():
+            if record is None:
+                continue
+            data = serialize_record(_worker_engine.rebuild_plan(record))
+            f.write(
+                json.dumps(
+                    {"id": student_id, "data": data},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+                + "\n"
+            )
+    os.replace(tmp_path, chunk_path)
+    return index, len(student_ids)
+
+
+def _read_chunk(chunk_path: str) -> Dict[str, Dict]:
+    with open(chunk_path, "r", encoding="utf-8") as f:
+        return {entry["id"]: entry["data"] for entry in map(json.loads, f)}
+
+
+class PopulationRescorer:
+    """
+    Пересчитывает оценку, рекомендации и путь обучения всех студентов
+    в пуле процессов (AdaptiveLearningEngine.rebuild_plan).
+
+    Студенты в порядке идентификаторов делятся на части по chunk_size.
+    Каждая пересчитанная часть сразу записывается в каталог staging -
+    это и есть контрольная точка: повторный запуск с теми же
+    параметрами пересчитывает только недостающие части. В конце все
+    части сохраняются в хранилище одним вызовом save_batches (в SQLite -
+    одной транзакцией) с проверкой версий: записи, измененные за время
+    пересчета, не перезаписываются, а пересчитываются еще раз.
+
+    Новые пороги оценки передаются в thresholds ({"STRONG_THRESHOLD": 85})
+    и доходят до воркеров через аргументы их инициализации.
+
+    Во время пересчета сервис лучше остановить: журнал и JSON-файл не
+    рассчитаны на параллельную запись из другого процесса.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        path: str,
+        staging_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 2000,
+        content_pack: Optional[str] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+        progress: Optional[Callable[[int, int, float], None]] = None,
+    ):
+        self.backend = backend
+        self.path = path
+        self.staging_dir = staging_dir or os.path.splitext(path)[0] + ".rescore"
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.content_pack = content_pack
+        self.thresholds = thresholds
+        self.progress = progress
+
+    def run(self) -> Dict:
+        """
+        Выполняет пересчет и возвращает статистику
+        """
+        started = time.perf_counter()
+        if self.content_pack:
+            load_content_pack(self.content_pack)
+        store = create_progress_store(self.backend, self.path)
+        try:
+            student_ids = sorted(store.student_ids())
+            chunks = [
+                student_ids[i : i + self.chunk_size]
+                for i in range(0, len(student_ids), self.chunk_size)
+            ]
+            resumed = self._prepare_staging(student_ids)
+
+            pending = [
+                index
+                for index in range(len(chunks))
+                if not os.path.exists(self._chunk_path(index))
+            ]
+            done = len(student_ids) - sum(len(chunks[index]) for index in pending)
+            self._report(done, len(student_ids), started)
+
+            # Файловые хранилища читает родитель (у него все записи уже
+            # в памяти), SQLite - каждый воркер сам
+            records = None if store.supports_point_reads else store.load_all()
+            self._rescore_parallel(
+                chunks,
+                pending,
+                records,
+                store.supports_point_reads,
+                done,
+                len(student_ids),
+                started,
+            )
+
+            chunk_paths = [self._chunk_path(index) for index in range(len(chunks))]
+            conflicts = store.save_batches(
+                _read_chunk(chunk_path) for chunk_path in chunk_paths
+            )
+            retried = self._retry_conflicts(store, conflicts)
+            shutil.rmtree(self.staging_dir)
+        finally:
+            store.close()
+
+        return {
+            "students": len(student_ids),
+            "chunks": len(chunks),
+            "resumed_chunks": len(chunks) - len(pending) if resumed else 0,
+            "conflicts": len(conflicts),
+            "unresolved_conflicts": len(conflicts) - retried,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+
+    def _rescore_parallel(
+        self,
+        chunks: List[List[str]],
+        pending: List[int],
+        records: Optional[Dict[str, Dict]],
+        point_reads: bool,
+        done: int,
+        total: int,
+        started: float,
+    ):
+        """
+        Раздает части воркерам; в работе держим не больше двух частей
+        на воркер, чтобы не копировать в очередь все записи сразу
+        """
+        if not pending:
+            return
+
+        tasks = iter(pending)
+        initargs = (
+            self.backend,
+            self.path,
+            point_reads,
+            self.content_pack,
+            self.thresholds,
+        )
+        with ProcessPoolExecutor(
+            self.workers, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            in_flight: Set[Future] = set()
+            while True:
+                while len(in_flight) < self.workers * 2:
+                    index = next(tasks, None)
+                    if index is None:
+                        break
+                    chunk_records = (
+                        None
+                        if records is None
+                        else {
+                            student_id: records[student_id]
+                            for student_id in chunks[index]
+                        }
+                    )
+                    in_flight.add(
+                        pool.submit(
+                            _rescore_chunk,
+                            (
+                                index,
+                                self._chunk_path(index),
+                                chunks[index],
+                                chunk_records,
+                            ),
+                        )
+                    )
+                if not in_flight:
+                    break
+
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    _, count = future.result()
+                    done += count
+                self._report(done, total, started)
+
+    def _retry_conflicts(self, store: ProgressStore, conflicts) -> int:
+        """
+        Пересчитывает записи, измененные за время пересчета, по их
+        свежим версиям. Возвращает число сохраненных записей
+        """
+        if not conflicts:
+            return 0
+        planner = _planner(self.thresholds)
+        fresh = {}
+        for student_id in conflicts:
+            record = store.load_student(student_id)
+            if record is not None:
+                fresh[student_id] = planner.rebuild_plan(record)
+        return len(fresh) - len(store.save_students(fresh))
+
+    def _prepare_staging(self, student_ids: List[str]) -> bool:
+        """
+        Продолжает прерванный пересчет, если он запускался для тех же
+        студентов, базы знаний и размера части; иначе начинает заново.
+        Возвращает True, если пересчет продолжается
+        """
+        manifest = {
+            "backend": self.backend,
+            "path": os.path.abspath(self.path),
+            "knowledge_base_version": knowledge_base_version(),
+            "chunk_size": self.chunk_size,
+            "thresholds": self.thresholds or {},
+            "students_hash": hashlib.sha256(
+                "\n".join(student_ids).encode("utf-8")
+            ).hexdigest(),
+        }
+        manifest_path = os.path.join(self.staging_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                if json.load(f) == manifest:
+                    return True
+
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        os.makedirs(self.staging_dir)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return False
+
+    def _chunk_path(self, index: int) -> str:
+        return os.path.join(self.staging_dir, f"chunk-{index:06d}.jsonl")
+
+    def _report(self, done: int, total: int, started: float):
+        if self.progress is not None:
+            self.progress(done, total, time.perf_counter() - started)
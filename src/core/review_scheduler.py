@@ -0,0 +1,156 @@
+"""
+Интервальные повторения изученных тем (SM-2) и общая очередь повторений
+"""
+
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_EASINESS = 2.5
+MIN_EASINESS = 1.3
+# Самый длинный интервал между повторениями, дней
+MAX_INTERVAL_DAYS = 365
+
+
+def quality_from_score(score: float) -> int:
+    """
+    Переводит долю верных ответов quiz (0-1) в оценку SM-2 (0-5)
+    """
+    return min(5, max(0, round(score * 5)))
+
+
+def sm2_update(entry: Dict, quality: int, now: datetime) -> datetime:
+    """
+    Пересчитывает интервал повторения темы по алгоритму SM-2.
+
+    Обновляет в записи studied_topics поля easiness, repetitions,
+    interval_days и next_review; возвращает время следующего повторения.
+    """
+    easiness = entry.get("easiness", DEFAULT_EASINESS)
+    repetitions = entry.get("repetitions", 0)
+    interval = entry.get("interval_days", 0)
+
+    if quality >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = min(MAX_INTERVAL_DAYS, round(interval * easiness))
+        repetitions += 1
+    else:
+        # Тема забыта: начинаем цепочку повторений заново
+        repetitions = 0
+        interval = 1
+
+    easiness += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    due = now + timedelta(days=interval)
+
+    entry["easiness"] = round(max(MIN_EASINESS, easiness), 2)
+    entry["repetitions"] = repetitions
+    entry["interval_days"] = interval
+    entry["next_review"] = due.isoformat()
+    return due
+
+
+def review_due(entry: Dict) -> Optional[datetime]:
+    """
+    Возвращает время повторения темы; для записей, изученных до
+    появления повторений, - через день после изучения
+    """
+    if entry.get("next_review"):
+        return datetime.fromisoformat(entry["next_review"])
+    if entry.get("completed_date"):
+        return datetime.fromisoformat(entry["completed_date"]) + timedelta(days=1)
+    return None
+
+
+class ReviewScheduler:
+    """
+    Очередь повторений всех студентов: куча (время, студент, тема).
+
+    Перенос повторения не ищет старый элемент в куче: актуальное время
+    пары (студент, тема) хранится в словаре, а устаревшие элементы
+    отбрасываются при извлечении. Поэтому и планирование, и выбор
+    "что пора повторить" стоят O(log n) на элемент, без обхода студентов.
+
+    Очередь живет в памяти процесса и строится при загрузке прогресса из
+    файловых хранилищ; SQLite выбирает повторения сама (due_reviews).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, str, str]] = []
+        self._due: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def load(self, entries: Iterable[Tuple[str, Dict]]):
+        """
+        Заполняет очередь записями studied_topics из хранилища
+        """
+        heap = []
+        due_map = {}
+        for student_id, entry in entries:
+            due = review_due(entry)
+            if due is not None:
+                timestamp = due.timestamp()
+                due_map[(student_id, entry["topic"])] = timestamp
+                heap.append((timestamp, student_id, entry["topic"]))
+        heapq.heapify(heap)
+
+        with self._lock:
+            self._heap = heap
+            self._due = due_map
+
+    def schedule(self, student_id: str, topic_key: str, due: datetime):
+        """
+        Планирует (или переносит) повторение темы студентом
+        """
+        timestamp = due.timestamp()
+        with self._lock:
+            self._due[(student_id, topic_key)] = timestamp
+            heapq.heappush(self._heap, (timestamp, student_id, topic_key))
+            self._compact()
+
+    def remove(self, student_id: str, topic_key: str):
+        """
+        Отменяет повторение темы
+        """
+        with self._lock:
+            self._due.pop((student_id, topic_key), None)
+
+    def due(
+        self, now: Optional[datetime] = None, limit: int = 100
+    ) -> List[Tuple[str, str, datetime]]:
+        """
+        Возвращает до limit повторений, время которых наступило, -
+        сначала самые просроченные
+        """
+        timestamp = (now or datetime.now()).timestamp()
+        result: List[Tuple[str, str, datetime]] = []
+        with self._lock:
+            taken = []
+            while self._heap and len(result) < limit and self._heap[0][0] <= timestamp:
+                item = heapq.heappop(self._heap)
+                if self._due.get((item[1], item[2])) != item[0]:
+                    continue  # устаревший элемент
+                taken.append(item)
+                result.append((item[1], item[2], datetime.fromtimestamp(item[0])))
+            # Выбор ничего не отменяет: возвращаем элементы в кучу
+            for item in taken:
+                heapq.heappush(self._heap, item)
+        return result
+
+    def _compact(self):
+        """
+        Перестраивает кучу, когда устаревших элементов стало больше живых
+        """
+        if len(self._heap) > 2 * len(self._due) + 1024:
+            self._heap = [
+                (timestamp, student_id, topic_key)
+                for (student_id, topic_key), timestamp in self._due.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
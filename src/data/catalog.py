@@ -0,0 +1,132 @@
+"""
+Версия каталога знаний, кэш построенных по нему структур и доступ
+к текстам уроков
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.data.content_pack import ContentPack
+from src.data.knowledge_base import (
+    INITIAL_TEST_QUESTIONS,
+    SPECIALIZATIONS,
+    THEORY_DATABASE,
+)
+
+_lock = threading.RLock()
+_version: Optional[str] = None
+_derived: Dict[str, Tuple[str, Any]] = {}
+_content_pack: Optional[ContentPack] = None
+
+
+def knowledge_base_version() -> str:
+    """
+    Возвращает хеш содержимого THEORY_DATABASE.
+
+    Хеш считается один раз и пересчитывается только после
+    invalidate_catalog().
+    """
+    global _version
+    with _lock:
+        if _version is None:
+            payload = json.dumps(THEORY_DATABASE, sort_keys=True, ensure_ascii=False)
+            _version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return _version
+
+
+def invalidate_catalog():
+    """
+    Сообщает, что база знаний изменилась: все производные структуры
+    будут построены заново при следующем обращении
+    """
+    global _version
+    with _lock:
+        _version = None
+        _derived.clear()
+
+
+def catalog_cached(name: str, builder: Callable[[], Any]) -> Any:
+    """
+    Возвращает структуру, построенную builder() по текущей версии
+    каталога; строит ее только при первом обращении после изменения
+    """
+    version = knowledge_base_version()
+    cached = _derived.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = builder()
+        _derived[name] = (version, value)
+        return value
+
+
+def load_content_pack(path: str, body_cache_size: int = 256) -> ContentPack:
+    """
+    Подменяет встроенную базу знаний пакетом контента.
+
+    THEORY_DATABASE, SPECIALIZATIONS и INITIAL_TEST_QUESTIONS обновляются
+    на месте, поэтому модули, импортировавшие их раньше, видят новый
+    каталог. Тексты уроков в память не загружаются. Вызывается при
+    старте приложения, до обработки запросов.
+    """
+    global _content_pack
+    pack = ContentPack(path, body_cache_size=body_cache_size)
+    manifest = pack.manifest
+
+    with _lock:
+        previous = _content_pack
+        THEORY_DATABASE.clear()
+        THEORY_DATABASE.update(manifest["topics"])
+        if "specializations" in manifest:
+            SPECIALIZATIONS.clear()
+            SPECIALIZATIONS.update(manifest["specializations"])
+        if "initial_test_questions" in manifest:
+            INITIAL_TEST_QUESTIONS.clear()
+            INITIAL_TEST_QUESTIONS.update(manifest["initial_test_questions"])
+        _content_pack = pack
+        invalidate_catalog()
+
+    if previous is not None:
+        previous.close()
+    return pack
+
+
+def get_lesson_body(topic_id: str, subtopic_id: str, cache: bool = True) -> str:
+    """
+    Возвращает текст урока подтемы; из пакета контента он читается
+    только при обращении (cache=False - в обход кэша текстов)
+    """
+    subtopic_data = THEORY_DATABASE[topic_id]["subtopics"][subtopic_id]
+    if "content" in subtopic_data or _content_pack is None:
+        return subtopic_data["content"]
+    return _content_pack.read_body(subtopic_data["body"], cache=cache)
+
+
+def get_lesson_word_count(topic_id: str, subtopic_id: str) -> int:
+    """
+    Возвращает число слов в уроке, не читая текст из пакета
+    """
+    return catalog_cached("lesson_word_counts", _count_lesson_words)[
+        (topic_id, subtopic_id)
+    ]
+
+
+def _count_lesson_words() -> Dict[Tuple[str, str], int]:
+    """
+    Считает слова всех уроков: у пакета контента число готово в манифесте
+    """
+    return {
+        (topic_id, subtopic_id): (
+            subtopic_data["word_count"]
+            if "word_count" in subtopic_data
+            else len(subtopic_data["content"].split())
+        )
+        for topic_id, topic_data in THEORY_DATABASE.items()
+        for subtopic_id, subtopic_data in topic_data["subtopics"].items()
+    }
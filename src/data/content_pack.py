@@ -0,0 +1,134 @@
+"""
+Внешние пакеты контента: манифест каталога + отдельно лежащие тексты уроков
+
+Формат пакета (каталог или .zip-архив с той же структурой):
+
+    manifest.json
+    lessons/<topic_id>/<subtopic_id>.md
+
+manifest.json содержит темы, подтемы, уровни, вопросы и тексты
+специализаций в том же виде, что и THEORY_DATABASE, но вместо поля
+"content" у подтемы указаны путь к тексту урока ("body"), число слов
+("word_count") и хеш текста ("body_hash"). Тексты уроков читаются
+только когда они действительно нужны.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Dict, Optional
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+
+class ContentPack:
+    """
+    Открытый пакет контента с LRU-кэшем недавно прочитанных уроков
+    """
+
+    def __init__(self, path: str, body_cache_size: int = 256):
+        self.path = path
+        self.body_cache_size = body_cache_size
+        self._lock = threading.Lock()
+        self._bodies: "OrderedDict[str, str]" = OrderedDict()
+        self._zip: Optional[zipfile.ZipFile] = None
+
+        if zipfile.is_zipfile(path):
+            self._zip = zipfile.ZipFile(path)
+
+        self.manifest = json.loads(self._read_text(MANIFEST_NAME))
+        if self.manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(
+                f"Неподдерживаемый формат пакета контента: {self.manifest.get('format')}"
+            )
+
+    def _read_text(self, relative_path: str) -> str:
+        """
+        Читает текстовый файл пакета
+        """
+        if self._zip is not None:
+            with self._lock:
+                return self._zip.read(relative_path).decode("utf-8")
+
+        with open(os.path.join(self.path, relative_path), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def read_body(self, relative_path: str, cache: bool = True) -> str:
+        """
+        Возвращает текст урока, недавно прочитанные берутся из кэша.
+        cache=False - для массового чтения (построение индексов), которое
+        не должно вытеснять из кэша уроки, нужные студентам
+        """
+        with self._lock:
+            body = self._bodies.get(relative_path)
+            if body is not None:
+                self._bodies.move_to_end(relative_path)
+                return body
+
+        body = self._read_text(relative_path)
+        if not cache:
+            return body
+
+        with self._lock:
+            self._bodies[relative_path] = body
+            self._bodies.move_to_end(relative_path)
+            while len(self._bodies) > self.body_cache_size:
+                self._bodies.popitem(last=False)
+        return body
+
+    def close(self):
+        """
+        Закрывает архив пакета
+        """
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+def export_content_pack(
+    theory_database: Dict,
+    path: str,
+    specializations: Optional[Dict] = None,
+    initial_test_questions: Optional[Dict] = None,
+):
+    """
+    Сохраняет базу знаний в формате пакета контента (каталог)
+    """
+    topics = {}
+    for topic_id, topic_data in theory_database.items():
+        subtopics = {}
+        for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+            body = subtopic_data["content"]
+            body_path = f"lessons/{topic_id}/{subtopic_id}.md"
+
+            full_path = os.path.join(path, body_path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "w", encoding="utf-8") as f:
+                f.write(body)
+
+            entry = {
+                key: value for key, value in subtopic_data.items() if key != "content"
+            }
+            entry["body"] = body_path
+            entry["word_count"] = len(body.split())
+            entry["body_hash"] = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+            subtopics[subtopic_id] = entry
+
+        topics[topic_id] = {
+            key: value for key, value in topic_data.items() if key != "subtopics"
+        }
+        topics[topic_id]["subtopics"] = subtopics
+
+    manifest = {"format": FORMAT_VERSION, "topics": topics}
+    if specializations is not None:
+        manifest["specializations"] = specializations
+    if initial_test_questions is not None:
+        manifest["initial_test_questions"] = initial_test_questions
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
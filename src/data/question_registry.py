@@ -0,0 +1,149 @@
+"""
+Реестр вопросов: быстрый поиск вопроса по его ID
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from src.data.catalog import catalog_cached
+from src.data.knowledge_base import THEORY_DATABASE
+
+
+class QuestionRecord(NamedTuple):
+    """
+    Компактное описание вопроса базы знаний
+    """
+
+    question_id: str
+    topic_id: str
+    subtopic_id: str
+    index: int  # type: ignore[assignment]  # поле, а не tuple.index
+    correct: int
+    level: str
+
+    @property
+    def topic_key(self) -> str:
+        return f"{self.topic_id}_{self.subtopic_id}"
+
+
+class QuestionRegistry:
+    """
+    Индекс всех вопросов THEORY_DATABASE, построенный один раз.
+
+    ID вопроса имеет вид {topic_id}_{subtopic_id}_q{index}; разбирать его
+    по "_" неоднозначно (basic_functions, stacks_queues), поэтому ID
+    просто сопоставляется с заранее построенной записью.
+    """
+
+    def __init__(self, theory_database: Dict):
+        self._by_id: Dict[str, QuestionRecord] = {}
+        self._by_subtopic: Dict[Tuple[str, str], Tuple[QuestionRecord, ...]] = {}
+        self._by_level: Dict[str, List[QuestionRecord]] = {}
+
+        for topic_id, topic_data in theory_database.items():
+            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+                level = subtopic_data["level"]
+                records = tuple(
+                    QuestionRecord(
+                        question_id=f"{topic_id}_{subtopic_id}_q{i}",
+                        topic_id=topic_id,
+                        subtopic_id=subtopic_id,
+                        index=i,
+                        correct=question["correct"],
+                        level=level,
+                    )
+                    for i, question in enumerate(subtopic_data["questions"])
+                )
+                self._by_subtopic[(topic_id, subtopic_id)] = records
+                self._by_level.setdefault(level, []).extend(records)
+                for record in records:
+                    self._by_id[record.question_id] = record
+
+    def get(self, question_id: str) -> Optional[QuestionRecord]:
+        """
+        Возвращает запись вопроса по ID или None
+        """
+        return self._by_id.get(question_id)
+
+    def __getitem__(self, question_id: str) -> QuestionRecord:
+        """
+        Возвращает запись вопроса по ID (KeyError, если вопроса нет)
+        """
+        return self._by_id[question_id]
+
+    def questions_for(
+        self, topic_id: str, subtopic_id: str
+    ) -> Optional[Tuple[QuestionRecord, ...]]:
+        """
+        Возвращает вопросы подтемы или None, если подтемы нет
+        """
+        return self._by_subtopic.get((topic_id, subtopic_id))
+
+    def by_level(self, level: str) -> List[QuestionRecord]:
+        """
+        Возвращает вопросы всех подтем уровня
+        """
+        return self._by_level.get(level, [])
+
+    def levels(self) -> List[str]:
+        """
+        Возвращает уровни, для которых есть вопросы
+        """
+        return list(self._by_level)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+def get_question_registry() -> QuestionRegistry:
+    """
+    Возвращает реестр вопросов для текущей версии базы знаний
+    """
+    return catalog_cached(
+        "question_registry", lambda: QuestionRegistry(THEORY_DATABASE)
+    )
+
+
+def build_question_pools(
+    theory_database: Dict, registry: QuestionRegistry
+) -> Dict[str, Tuple[Mapping, ...]]:
+    """
+    Строит пулы вопросов начального теста по уровням.
+
+    Вопросы - неизменяемые общие записи (MappingProxyType): их можно
+    раздавать всем запросам, не боясь, что кто-то их изменит.
+    """
+    pools: Dict[str, Tuple[Mapping, ...]] = {}
+    for level in registry.levels():
+        records = registry.by_level(level)
+        questions = []
+        for record in records:
+            topic_data = theory_database[record.topic_id]
+            subtopic_data = topic_data["subtopics"][record.subtopic_id]
+            question = subtopic_data["questions"][record.index]
+            questions.append(
+                MappingProxyType(
+                    {
+                        "id": record.question_id,
+                        "topic": topic_data["topic"],
+                        "subtopic": record.subtopic_id,
+                        "subtopic_name": subtopic_data.get("name", record.subtopic_id),
+                        "question": question["text"],
+                        "options": tuple(question["options"]),
+                        "correct_answer": record.correct,
+                        "level": level,
+                    }
+                )
+            )
+        pools[level] = tuple(questions)
+    return pools
+
+
+def get_question_pools() -> Dict[str, Tuple[Mapping, ...]]:
+    """
+    Возвращает пулы вопросов по уровням для текущей версии базы знаний
+    """
+    return catalog_cached(
+        "question_pools",
+        lambda: build_question_pools(THEORY_DATABASE, get_question_registry()),
+    )
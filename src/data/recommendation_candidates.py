@@ -0,0 +1,145 @@
+"""
+Заранее построенные таблицы кандидатов для рекомендаций тем
+"""
+
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from src.data.catalog import catalog_cached
+from src.data.knowledge_base import THEORY_DATABASE
+
+
+class Candidate(NamedTuple):
+    """
+    Неизменяемая часть рекомендации подтемы для одной специализации
+    """
+
+    topic_key: str
+    topic: str
+    subtopic: str
+    subtopic_name: str
+    specialization_application: str
+    content_link: str
+
+
+class CandidateTable:
+    """
+    Подтемы каталога в его порядке с готовыми текстами для специализации.
+
+    Оценка студента хранится только для пройденных в тесте тем; у
+    остальных она 0, то есть максимальный приоритет. Поэтому лучшие k
+    кандидатов - это k наименьших пар (балл, позиция) среди оцененных
+    тем и первых k неоцененных: стоимость выбора зависит от числа
+    оцененных тем и k, а не от размера каталога.
+    """
+
+    def __init__(self, theory_database: Dict, specialization: str):
+        self.candidates: List[Candidate] = []
+        self.position: Dict[str, int] = {}
+
+        for topic_id, topic_data in theory_database.items():
+            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+                topic_key = f"{topic_id}_{subtopic_id}"
+                self.position[topic_key] = len(self.candidates)
+                self.candidates.append(
+                    Candidate(
+                        topic_key=topic_key,
+                        topic=topic_data["topic"],
+                        subtopic=subtopic_id,
+                        subtopic_name=subtopic_data.get("name", subtopic_id),
+                        specialization_application=subtopic_data.get(
+                            "specializations", {}
+                        ).get(
+                            specialization,
+                            f"Эта тема важна для вашей специализации ({specialization}).",
+                        ),
+                        content_link=f"{topic_id}/{subtopic_id}",
+                    )
+                )
+
+    def top_k(
+        self, topic_scores: Dict[str, float], k: int, threshold: float
+    ) -> List[Dict]:
+        """
+        Возвращает k подтем с наибольшим приоритетом (100 - балл) среди
+        тем с баллом ниже threshold; при равенстве - в порядке каталога
+        """
+        if k <= 0:
+            return []
+
+        # (балл, позиция) оцененных тем ниже порога
+        scored = []
+        for topic_key, score in topic_scores.items():
+            position = self.position.get(topic_key)
+            if position is not None and score < threshold:
+                scored.append((score, position))
+
+        # Первые k неоцененных тем (балл 0)
+        if threshold > 0:
+            unscored = 0
+            for position, candidate in enumerate(self.candidates):
+                if unscored == k:
+                    break
+                if candidate.topic_key not in topic_scores:
+                    scored.append((0, position))
+                    unscored += 1
+
+        winners = heapq.nsmallest(
+            k, scored, key=lambda item: (-(100 - item[0]), item[1])
+        )
+        return [self.recommendation(position, score) for score, position in winners]
+
+    def top_k_by_mastery(
+        self, mastery: Sequence[float], k: int, threshold: float
+    ) -> List[Dict]:
+        """
+        То же по вероятностям освоения всех тем (в порядке каталога):
+        балл темы - вероятность * 100
+        """
+        scores = np.asarray(mastery, dtype=np.float64) * 100
+        eligible = np.flatnonzero(scores < threshold)
+        if k <= 0 or not len(eligible):
+            return []
+
+        if len(eligible) > k:
+            # k-я наименьшая оценка и все темы с оценкой не выше нее
+            cutoff = np.partition(scores[eligible], k - 1)[k - 1]
+            eligible = eligible[scores[eligible] <= cutoff]
+        # Сортировка по баллу, при равенстве - по позиции в каталоге
+        winners = eligible[np.lexsort((eligible, scores[eligible]))][:k]
+
+        return [
+            self.recommendation(position, float(scores[position]), digits=1)
+            for position in winners.tolist()
+        ]
+
+    def recommendation(
+        self, position: int, score: float, digits: Optional[int] = None
+    ) -> Dict:
+        """
+        Возвращает рекомендацию подтемы с баллом score (0-100);
+        digits - до скольких знаков округлять баллы
+        """
+        candidate = self.candidates[position]
+        return {
+            "topic": candidate.topic,
+            "subtopic": candidate.subtopic,
+            "subtopic_name": candidate.subtopic_name,
+            "priority": 100 - score if digits is None else round(100 - score, digits),
+            "current_score": score if digits is None else round(score, digits),
+            "specialization_application": candidate.specialization_application,
+            "content_link": candidate.content_link,
+        }
+
+
+def get_candidate_table(specialization: str) -> CandidateTable:
+    """
+    Возвращает таблицу кандидатов специализации для текущей версии
+    базы знаний
+    """
+    return catalog_cached(
+        f"recommendation_candidates:{specialization}",
+        lambda: CandidateTable(THEORY_DATABASE, specialization),
+    )
@@ -0,0 +1,314 @@
+"""
+Полнотекстовый поиск по урокам базы знаний (BM25)
+"""
+
+import functools
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.catalog import catalog_cached, get_lesson_body, knowledge_base_version
+from src.data.knowledge_base import THEORY_DATABASE
+
+DEFAULT_INDEX_PATH = "data/search_index.npz"
+INDEX_FORMAT = 1
+
+_TOKEN_RE = re.compile(r"[0-9a-zа-яё_]+")
+
+# Окончания русских слов, от длинных к коротким
+_RU_ENDINGS = tuple(
+    sorted(
+        (
+            "ившись",
+            "ывшись",
+            "ующими",
+            "ющими",
+            "иями",
+            "ями",
+            "ами",
+            "ого",
+            "его",
+            "ому",
+            "ему",
+            "ыми",
+            "ими",
+            "ией",
+            "ость",
+            "ости",
+            "ение",
+            "ения",
+            "ений",
+            "ние",
+            "ния",
+            "ний",
+            "ать",
+            "ять",
+            "ить",
+            "еть",
+            "ует",
+            "ют",
+            "ут",
+            "ет",
+            "ит",
+            "ый",
+            "ий",
+            "ой",
+            "ая",
+            "яя",
+            "ое",
+            "ее",
+            "ые",
+            "ие",
+            "ых",
+            "их",
+            "ом",
+            "ем",
+            "ам",
+            "ям",
+            "ах",
+            "ях",
+            "ов",
+            "ев",
+            "ей",
+            "ию",
+            "ия",
+            "а",
+            "я",
+            "о",
+            "е",
+            "ы",
+            "и",
+            "у",
+            "ю",
+            "ь",
+            "й",
+        ),
+        key=len,
+        reverse=True,
+    )
+)
+_EN_ENDINGS = ("ing", "ed", "es", "s")
+_MIN_STEM = 3
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Упрощенный стеммер: отрезает типичное окончание, оставляя основу
+    не короче трех букв
+    """
+    endings = _RU_ENDINGS if re.search("[а-я]", word) else _EN_ENDINGS
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[: -len(ending)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбивает текст на нормализованные основы слов
+    """
+    return [stem(token) for token in _TOKEN_RE.findall(text.lower().replace("ё", "е"))]
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс подтем с ранжированием BM25.
+
+    Документ - подтема: текст урока, название, вопросы и пояснения
+    к ним. Списки документов всех основ лежат подряд в массивах NumPy
+    (как в CSR-матрице), а вклад каждой пары (основа, документ) в
+    оценку BM25 считается заранее, поэтому запрос сводится к сложению
+    нескольких срезов массива.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(
+        self,
+        version: str,
+        documents: List[Tuple[str, str]],
+        doc_lengths: np.ndarray,
+        terms: List[str],
+        offsets: np.ndarray,
+        post_docs: np.ndarray,
+        post_tfs: np.ndarray,
+    ):
+        self.version = version
+        self.documents = documents
+        self.doc_lengths = doc_lengths
+        self.terms = {term: row for row, term in enumerate(terms)}
+        self.offsets = offsets
+        self.post_docs = post_docs
+        self.post_tfs = post_tfs
+
+        count = len(documents)
+        avgdl = float(doc_lengths.mean()) if count else 0.0
+        norms = (
+            self.k1 * (1 - self.b + self.b * doc_lengths / avgdl)
+            if avgdl
+            else np.full(count, self.k1)
+        )
+        doc_freq = np.diff(offsets)
+        idf = np.log(1 + (count - doc_freq + 0.5) / (doc_freq + 0.5))
+        tfs = post_tfs.astype(np.float64)
+        self._impacts = (
+            np.repeat(idf, doc_freq) * tfs * (self.k1 + 1) / (tfs + norms[post_docs])
+        ).astype(np.float32)
+
+    @classmethod
+    def build(cls, theory_database: Dict, version: str) -> "SearchIndex":
+        """
+        Строит индекс по базе знаний
+        """
+        documents: List[Tuple[str, str]] = []
+        doc_lengths = []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for topic_id, topic_data in theory_database.items():
+            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+                parts = [
+                    topic_data["topic"],
+                    subtopic_data.get("name", subtopic_id),
+                    get_lesson_body(topic_id, subtopic_id, cache=False),
+                ]
+                for question in subtopic_data["questions"]:
+                    parts.append(question["text"])
+                    parts.append(question.get("explanation", ""))
+                tokens = tokenize("\n".join(parts))
+
+                doc = len(documents)
+                documents.append((topic_id, subtopic_id))
+                doc_lengths.append(len(tokens))
+
+                frequencies: Dict[str, int] = {}
+                for token in tokens:
+                    frequencies[token] = frequencies.get(token, 0) + 1
+                for term, tf in frequencies.items():
+                    postings.setdefault(term, []).append((doc, tf))
+
+        terms = list(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(postings[term]) for term in terms])
+        flat = [posting for term in terms for posting in postings[term]]
+        pairs = np.array(flat, dtype=np.int32).reshape(-1, 2)
+
+        return cls(
+            version,
+            documents,
+            np.array(doc_lengths, dtype=np.float64),
+            terms,
+            offsets,
+            pairs[:, 0].copy(),
+            pairs[:, 1].copy(),
+        )
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Возвращает подтемы, лучше всего подходящие под запрос
+        """
+        rows = {self.terms[term] for term in tokenize(query) if term in self.terms}
+        if not rows or limit <= 0:
+            return []
+
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for row in rows:
+            start, end = self.offsets[row], self.offsets[row + 1]
+            # Внутри одной основы документы не повторяются
+            scores[self.post_docs[start:end]] += self._impacts[start:end]
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(scores[matched], -limit)[-limit:]]
+        best = matched[np.argsort(-scores[matched], kind="stable")]
+
+        return [
+            {
+                "topic_id": self.documents[doc][0],
+                "subtopic_id": self.documents[doc][1],
+                "score": round(float(scores[doc]), 4),
+            }
+            for doc in best
+        ]
+
+    def save(self, path: str):
+        """
+        Сохраняет индекс на диск (.npz)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        meta = {
+            "format": INDEX_FORMAT,
+            "version": self.version,
+            "documents": self.documents,
+            "terms": list(self.terms),
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                doc_lengths=self.doc_lengths,
+                offsets=self.offsets,
+                post_docs=self.post_docs,
+                post_tfs=self.post_tfs,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SearchIndex"]:
+        """
+        Загружает индекс с диска; None, если файла нет или он поврежден
+        """
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                arrays = {
+                    name: data[name]
+                    for name in ("doc_lengths", "offsets", "post_docs", "post_tfs")
+                }
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if meta.get("format") != INDEX_FORMAT:
+            return None
+
+        return cls(
+            meta["version"],
+            [tuple(doc) for doc in meta["documents"]],
+            arrays["doc_lengths"],
+            meta["terms"],
+            arrays["offsets"],
+            arrays["post_docs"],
+            arrays["post_tfs"],
+        )
+
+
+def load_or_build_index(path: Optional[str] = DEFAULT_INDEX_PATH) -> SearchIndex:
+    """
+    Загружает индекс с диска, если он построен для текущей версии
+    базы знаний, иначе строит его заново и сохраняет
+    """
+    version = knowledge_base_version()
+    if path:
+        index = SearchIndex.load(path)
+        if index is not None and index.version == version:
+            return index
+
+    index = SearchIndex.build(THEORY_DATABASE, version)
+    if path:
+        index.save(path)
+    return index
+
+
+def get_search_index(path: Optional[str] = DEFAULT_INDEX_PATH) -> SearchIndex:
+    """
+    Возвращает индекс для текущей версии базы знаний
+    """
+    return catalog_cached("search_index", lambda: load_or_build_index(path))
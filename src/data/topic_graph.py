@@ -0,0 +1,192 @@
+"""
+Граф зависимостей подтем: предварительные требования и связанные темы
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+from src.data.catalog import catalog_cached
+from src.data.knowledge_base import THEORY_DATABASE
+
+
+class TopicGraph:
+    """
+    Граф подтем, скомпилированный из полей "prerequisites" и "related"
+    базы знаний.
+
+    Подтема обозначается ключом "topic_id/subtopic_id" (как content_link
+    в рекомендациях) и получает номер. Для каждой подтемы заранее
+    посчитаны позиция в топологическом порядке и битовая маска всех
+    ее требований с учетом транзитивности, поэтому проверки сводятся
+    к операциям над целыми числами.
+    """
+
+    def __init__(self, theory_database: Dict):
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+
+        for topic_id, topic_data in theory_database.items():
+            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+                self.index[f"{topic_id}/{subtopic_id}"] = len(self.keys)
+                self.keys.append(f"{topic_id}/{subtopic_id}")
+                self.names.append(subtopic_data.get("name", subtopic_id))
+
+        # Списки смежности: прямые требования и связанные темы
+        self.prerequisites: List[Tuple[int, ...]] = []
+        self.related: List[Tuple[Tuple[int, str], ...]] = []
+        for topic_id, topic_data in theory_database.items():
+            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+                key = f"{topic_id}/{subtopic_id}"
+                self.prerequisites.append(
+                    tuple(
+                        self._resolve(key, prerequisite)
+                        for prerequisite in subtopic_data.get("prerequisites", [])
+                    )
+                )
+                self.related.append(
+                    tuple(
+                        (self._resolve(key, link["id"]), link.get("reason", ""))
+                        for link in subtopic_data.get("related", [])
+                    )
+                )
+
+        self.order = self._topological_order()
+        self.rank = [0] * len(self.keys)
+        for position, node in enumerate(self.order):
+            self.rank[node] = position
+
+        # Транзитивное замыкание требований: бит u в ancestors[v] означает,
+        # что u нужно изучить раньше v
+        self.ancestors = [0] * len(self.keys)
+        for node in self.order:
+            mask = 0
+            for prerequisite in self.prerequisites[node]:
+                mask |= self.ancestors[prerequisite] | (1 << prerequisite)
+            self.ancestors[node] = mask
+
+    def _resolve(self, key: str, reference: str) -> int:
+        if reference not in self.index:
+            raise ValueError(f"{key}: неизвестная тема {reference}")
+        return self.index[reference]
+
+    def _topological_order(self) -> List[int]:
+        """
+        Алгоритм Кана; при равенстве сохраняется порядок каталога
+        """
+        dependents: List[List[int]] = [[] for _ in self.keys]
+        pending = [len(prerequisites) for prerequisites in self.prerequisites]
+        for node, prerequisites in enumerate(self.prerequisites):
+            for prerequisite in prerequisites:
+                dependents[prerequisite].append(node)
+
+        ready = [node for node, count in enumerate(pending) if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            node = heapq.heappop(ready)
+            order.append(node)
+            for dependent in dependents[node]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+
+        if len(order) != len(self.keys):
+            cycle = [self.keys[node] for node, count in enumerate(pending) if count]
+            raise ValueError(f"Циклические требования между темами: {', '.join(cycle)}")
+        return order
+
+    def mask_of(self, keys: Iterable[str]) -> int:
+        """
+        Возвращает битовую маску известных ключей
+        """
+        mask = 0
+        for key in keys:
+            node = self.index.get(key)
+            if node is not None:
+                mask |= 1 << node
+        return mask
+
+    def prerequisite_names(self, key: str) -> List[str]:
+        """
+        Возвращает названия прямых требований подтемы
+        """
+        node = self.index.get(key)
+        if node is None:
+            return []
+        return [self.names[prerequisite] for prerequisite in self.prerequisites[node]]
+
+    def related_topics(self, key: str) -> List[Tuple[str, str]]:
+        """
+        Возвращает связанные подтемы как пары (ключ, причина)
+        """
+        node = self.index.get(key)
+        if node is None:
+            return []
+        return [(self.keys[other], reason) for other, reason in self.related[node]]
+
+    def is_unlocked(self, key: str, completed_mask: int) -> bool:
+        """
+        Проверяет, что все требования подтемы (с учетом транзитивных)
+        входят в completed_mask
+        """
+        node = self.index.get(key)
+        return node is None or self.ancestors[node] & ~completed_mask == 0
+
+    def missing_prerequisites(self, key: str, completed_mask: int) -> List[str]:
+        """
+        Возвращает неизученные требования подтемы в порядке изучения
+        """
+        node = self.index.get(key)
+        if node is None:
+            return []
+        missing = self.ancestors[node] & ~completed_mask
+        return [self.keys[other] for other in self._nodes_of(missing)]
+
+    def _nodes_of(self, mask: int) -> List[int]:
+        nodes = []
+        while mask:
+            low = mask & -mask
+            nodes.append(low.bit_length() - 1)
+            mask ^= low
+        nodes.sort(key=self.rank.__getitem__)
+        return nodes
+
+    def order_keys(self, keys: List[str]) -> List[str]:
+        """
+        Упорядочивает подтемы так, чтобы требования шли раньше
+        зависящих от них тем, в остальном сохраняя исходный порядок
+        """
+        slot_of: Dict[int, int] = {}
+        for slot, key in enumerate(keys):
+            node = self.index.get(key)
+            if node is not None:
+                slot_of.setdefault(node, slot)
+        selected = self.mask_of(keys)
+
+        # Зависимости только внутри выбранного набора
+        pending = [0] * len(keys)
+        dependents: List[List[int]] = [[] for _ in keys]
+        for node, slot in slot_of.items():
+            for prerequisite in self._nodes_of(self.ancestors[node] & selected):
+                pending[slot] += 1
+                dependents[slot_of[prerequisite]].append(slot)
+
+        ready = [slot for slot, count in enumerate(pending) if count == 0]
+        heapq.heapify(ready)
+        ordered = []
+        while ready:
+            slot = heapq.heappop(ready)
+            ordered.append(keys[slot])
+            for dependent in dependents[slot]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+        return ordered
+
+
+def get_topic_graph() -> TopicGraph:
+    """
+    Возвращает граф подтем для текущей версии базы знаний
+    """
+    return catalog_cached("topic_graph", lambda: TopicGraph(THEORY_DATABASE))
@@ -0,0 +1,223 @@
+"""
+Похожие по содержанию подтемы: заранее посчитанные соседи по TF-IDF
+или по локальной модели эмбеддингов
+"""
+
+import inspect
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.catalog import catalog_cached, get_lesson_body, knowledge_base_version
+from src.data.knowledge_base import THEORY_DATABASE
+from src.data.search_index import tokenize
+
+DEFAULT_SIMILARITY_PATH = "data/topic_similarity.npz"
+TABLE_FORMAT = 1
+
+# Сколько строк матрицы сходства считать за раз: память - BLOCK x число подтем
+BLOCK = 1024
+
+
+def topic_document(
+    topic_data: Dict, subtopic_id: str, subtopic_data: Dict, body: str
+) -> str:
+    """
+    Текст подтемы для сравнения: название, урок (body), вопросы и
+    пояснения для специализаций
+    """
+    parts = [topic_data["topic"], subtopic_data.get("name", subtopic_id), body]
+    for question in subtopic_data.get("questions", []):
+        parts.append(question.get("text", ""))
+        parts.append(question.get("explanation", ""))
+    parts.extend(subtopic_data.get("specializations", {}).values())
+    return "\n".join(parts)
+
+
+class TopicSimilarity:
+    """
+    Для каждой подтемы - до N самых похожих подтем и сходство с ними.
+
+    Подтемы обозначаются ключами "topic_id/subtopic_id" (как в графе
+    подтем). Таблица строится один раз для версии базы знаний и метода
+    и хранится на диске, поэтому запрос - чтение одной строки.
+    """
+
+    def __init__(
+        self, version: str, keys: List[str], neighbors: np.ndarray, weights: np.ndarray
+    ):
+        self.version = version
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.neighbors = neighbors  # int32 [подтемы x N], -1 - пусто
+        self.weights = weights  # float32 [подтемы x N]
+
+    @classmethod
+    def build(
+        cls,
+        theory_database: Dict,
+        version: str,
+        method: str = "tfidf",
+        model: Optional[str] = None,
+        neighbors: int = 5,
+    ) -> "TopicSimilarity":
+        """
+        Считает векторы подтем и оставляет для каждой N ближайших.
+
+        method "tfidf" - TF-IDF по основам слов (как в поиске);
+        "embeddings" - модель sentence-transformers, которая уже лежит
+        локально (model - путь или имя в локальном кэше); в сеть
+        построение не ходит
+        """
+        keys = []
+        documents = []
+        for topic_id, topic_data in theory_database.items():
+            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+                keys.append(f"{topic_id}/{subtopic_id}")
+                documents.append(
+                    topic_document(
+                        topic_data,
+                        subtopic_id,
+                        subtopic_data,
+                        get_lesson_body(topic_id, subtopic_id, cache=False),
+                    )
+                )
+
+        if method == "tfidf":
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            vectors = TfidfVectorizer(
+                tokenizer=tokenize,
+                lowercase=False,
+                token_pattern=None,
+                sublinear_tf=True,
+            ).fit_transform(documents)
+        elif method == "embeddings":
+            from sentence_transformers import SentenceTransformer
+
+            if not model:
+                raise ValueError("Для метода embeddings нужна локальная модель")
+            options: Dict[str, Any] = {"device": "cpu"}
+            if (
+                "local_files_only"
+                in inspect.signature(SentenceTransformer.__init__).parameters
+            ):
+                options["local_files_only"] = True
+            elif not os.path.isdir(model):
+                # sentence-transformers до 2.3 не умеет запрещать загрузку
+                # из сети, поэтому принимаем только путь к модели на диске
+                raise ValueError(
+                    "Для этой версии sentence-transformers нужен путь "
+                    "к каталогу модели"
+                )
+            encoder = SentenceTransformer(model, **options)
+            vectors = encoder.encode(documents, normalize_embeddings=True)
+        else:
+            raise ValueError(f"Неизвестный метод сходства: {method}")
+
+        # Векторы нормированы, поэтому скалярное произведение - косинус
+        table_neighbors = np.full((len(keys), neighbors), -1, dtype=np.int32)
+        table_weights = np.zeros((len(keys), neighbors), dtype=np.float32)
+        for start in range(0, len(keys), BLOCK):
+            block = vectors[start : start + BLOCK] @ vectors.T
+            block = block.toarray() if hasattr(block, "toarray") else np.asarray(block)
+            for offset, row in enumerate(block):
+                row[start + offset] = 0.0
+                candidates = np.flatnonzero(row > 0)
+                # По убыванию сходства, при равенстве - в порядке каталога
+                order = candidates[np.lexsort((candidates, -row[candidates]))][
+                    :neighbors
+                ]
+                table_neighbors[start + offset, : len(order)] = order
+                table_weights[start + offset, : len(order)] = row[order]
+
+        return cls(version, keys, table_neighbors, table_weights)
+
+    def related(self, key: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Возвращает до limit похожих подтем как пары (ключ, сходство)
+        """
+        position = self.index.get(key)
+        if position is None:
+            return []
+        related = []
+        for neighbor, weight in zip(
+            self.neighbors[position, :limit].tolist(),
+            self.weights[position, :limit].tolist(),
+        ):
+            if neighbor < 0:
+                break
+            related.append((self.keys[neighbor], weight))
+        return related
+
+    def save(self, path: str):
+        """
+        Сохраняет таблицу на диск (.npz)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        meta = {"format": TABLE_FORMAT, "version": self.version, "keys": self.keys}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                neighbors=self.neighbors,
+                weights=self.weights,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TopicSimilarity"]:
+        """
+        Загружает таблицу с диска; None, если файла нет или он поврежден
+        """
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                neighbors = data["neighbors"]
+                weights = data["weights"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if meta.get("format") != TABLE_FORMAT:
+            return None
+        return cls(meta["version"], meta["keys"], neighbors, weights)
+
+
+def load_or_build_similarity(
+    path: Optional[str] = DEFAULT_SIMILARITY_PATH,
+    method: str = "tfidf",
+    model: Optional[str] = None,
+) -> TopicSimilarity:
+    """
+    Загружает таблицу с диска, если она построена для текущей версии
+    базы знаний тем же методом, иначе строит ее заново и сохраняет
+    """
+    version = f"{knowledge_base_version()}:{method}:{model or ''}"
+    if path:
+        table = TopicSimilarity.load(path)
+        if table is not None and table.version == version:
+            return table
+
+    table = TopicSimilarity.build(THEORY_DATABASE, version, method=method, model=model)
+    if path:
+        table.save(path)
+    return table
+
+
+def get_topic_similarity(
+    path: Optional[str] = None, method: str = "tfidf", model: Optional[str] = None
+) -> TopicSimilarity:
+    """
+    Возвращает таблицу похожих подтем для текущей версии базы знаний
+    """
+    # Таблицы с разными путем, методом или моделью кэшируются отдельно
+    return catalog_cached(
+        f"topic_similarity:{path}:{method}:{model or ''}",
+        lambda: load_or_build_similarity(path, method=method, model=model),
+    )
@@ -0,0 +1,167 @@
+"""
+Адаптивное тестирование на основе IRT (двухпараметрическая модель)
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.catalog import catalog_cached
+from src.data.knowledge_base import THEORY_DATABASE
+from src.data.question_registry import get_question_pools
+
+# Параметры по умолчанию, если у вопроса нет поля "irt": {"a": ..., "b": ...}
+DEFAULT_DISCRIMINATION = 1.5
+LEVEL_DIFFICULTY = {"beginner": -1.0, "intermediate": 0.0, "advanced": 1.0}
+
+# Сетка значений способности для оценки EAP и таблиц информации
+THETA_GRID = np.linspace(-4.0, 4.0, 161)
+
+
+class ItemBank:
+    """
+    Банк вопросов с заранее посчитанными таблицами модели 2PL.
+
+    Для каждой точки сетки способности хранится информация Фишера всех
+    вопросов, а для каждого вопроса - логарифмы вероятностей верного
+    и неверного ответа, поэтому выбор вопроса и пересчет оценки - это
+    несколько операций над готовыми строками массивов.
+    """
+
+    def __init__(self, questions: Sequence[Mapping], parameters: Dict[str, Dict]):
+        self.questions: List[Mapping] = list(questions)
+        self.index = {question["id"]: i for i, question in enumerate(self.questions)}
+
+        self.discrimination = np.array(
+            [
+                parameters.get(q["id"], {}).get("a", DEFAULT_DISCRIMINATION)
+                for q in self.questions
+            ]
+        )
+        self.difficulty = np.array(
+            [
+                parameters.get(q["id"], {}).get(
+                    "b", LEVEL_DIFFICULTY.get(q["level"], 0.0)
+                )
+                for q in self.questions
+            ]
+        )
+
+        # P[i, g] - вероятность верного ответа на вопрос i при способности grid[g]
+        logits = self.discrimination[:, None] * (
+            THETA_GRID[None, :] - self.difficulty[:, None]
+        )
+        probability = 1.0 / (1.0 + np.exp(-logits))
+        self.log_correct = np.log(probability)
+        self.log_wrong = np.log1p(-probability)
+        # information[g, i]: строка для точки сетки лежит в памяти подряд
+        self.information = np.ascontiguousarray(
+            (self.discrimination[:, None] ** 2 * probability * (1 - probability)).T
+        )
+        self.expected_score = (
+            probability.mean(axis=0) * 100
+            if len(self.questions)
+            else np.zeros_like(THETA_GRID)
+        )
+        # Нормальное априорное распределение N(0, 1)
+        self.log_prior = -0.5 * THETA_GRID**2
+
+    def estimate(
+        self, responses: Sequence[Tuple[str, int]]
+    ) -> Tuple[float, float, int]:
+        """
+        Возвращает оценку способности (EAP), ее стандартную ошибку и
+        индекс ближайшей точки сетки
+        """
+        log_posterior = self.log_prior.copy()
+        for question_id, correct in responses:
+            item = self.index.get(question_id)
+            if item is not None:
+                log_posterior += (
+                    self.log_correct[item] if correct else self.log_wrong[item]
+                )
+
+        weights = np.exp(log_posterior - log_posterior.max())
+        weights /= weights.sum()
+        theta = float(weights @ THETA_GRID)
+        se = float(np.sqrt(weights @ (THETA_GRID - theta) ** 2))
+        grid_point = int(np.abs(THETA_GRID - theta).argmin())
+        return theta, se, grid_point
+
+    def next_item(self, grid_point: int, used: Sequence[str]) -> Optional[Mapping]:
+        """
+        Возвращает еще не заданный вопрос с максимальной информацией
+        в точке сетки
+        """
+        information = self.information[grid_point].copy()
+        for question_id in used:
+            item = self.index.get(question_id)
+            if item is not None:
+                information[item] = -1.0
+
+        best = int(information.argmax()) if len(information) else -1
+        if best < 0 or information[best] < 0:
+            return None
+        return self.questions[best]
+
+
+def build_item_bank() -> ItemBank:
+    """
+    Строит банк из всех вопросов базы знаний
+    """
+    questions = [
+        question for pool in get_question_pools().values() for question in pool
+    ]
+    parameters = {}
+    for topic_id, topic_data in THEORY_DATABASE.items():
+        for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+            for i, question in enumerate(subtopic_data["questions"]):
+                if "irt" in question:
+                    parameters[f"{topic_id}_{subtopic_id}_q{i}"] = question["irt"]
+    return ItemBank(questions, parameters)
+
+
+def get_item_bank() -> ItemBank:
+    """
+    Возвращает банк вопросов для текущей версии базы знаний
+    """
+    return catalog_cached("irt_item_bank", build_item_bank)
+
+
+class AdaptiveTest:
+    """
+    Правила адаптивного теста: тест заканчивается, когда стандартная
+    ошибка оценки опускается ниже se_threshold (но не раньше min_items
+    вопросов), после max_items вопросов или когда вопросы кончились
+    """
+
+    def __init__(
+        self, se_threshold: float = 0.5, min_items: int = 3, max_items: int = 10
+    ):
+        self.se_threshold = se_threshold
+        self.min_items = min_items
+        self.max_items = max_items
+
+    def step(self, responses: Sequence[Tuple[str, int]]) -> Dict:
+        """
+        Оценивает способность по ответам и выбирает следующий вопрос;
+        "question" равен None, если тест закончен
+        """
+        bank = get_item_bank()
+        theta, se, grid_point = bank.estimate(responses)
+
+        question = None
+        finished = len(responses) >= self.max_items or (
+            len(responses) >= self.min_items and se < self.se_threshold
+        )
+        if not finished:
+            question = bank.next_item(
+                grid_point, [question_id for question_id, _ in responses]
+            )
+
+        return {
+            "ability": theta,
+            "ability_se": se,
+            "expected_score": float(bank.expected_score[grid_point]),
+            "question": question,
+        }
@@ -0,0 +1,241 @@
+"""
+Коллаборативная фильтрация тем: таблица похожих тем по трудностям
+студентов
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.catalog import knowledge_base_version
+from src.data.recommendation_candidates import get_candidate_table
+from src.models.knowledge_tracing import get_topic_layout
+from src.storage.base import ProgressStore
+
+DEFAULT_NEIGHBORS_PATH = "data/topic_neighbors.npz"
+TABLE_FORMAT = 1
+
+
+class NeighborTable:
+    """
+    Для каждой темы - до N самых похожих тем и вес сходства.
+
+    Сходство тем - косинусное сходство столбцов матрицы "студент x
+    тема", где значение - насколько студент не справился с темой
+    (1 - балл / 100). Темы похожи, если с ними не справлялись одни и те
+    же студенты. Строки таблицы лежат в порядке раскладки тем
+    (TopicLayout), поэтому онлайн-запрос - чтение k строк фиксированной
+    длины, без обращения к матрице.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        layout_id: str,
+        neighbors: np.ndarray,
+        weights: np.ndarray,
+        meta: Optional[Dict] = None,
+    ):
+        self.keys = keys
+        self.layout_id = layout_id
+        self.neighbors = neighbors  # int32 [темы x N], -1 - пусто
+        self.weights = weights  # float32 [темы x N]
+        self.meta = meta or {}
+
+    def neighbor_scores(self, seeds: Iterable[Tuple[int, float]]) -> Dict[int, float]:
+        """
+        Суммирует веса соседей тем-"затравок" (позиция, трудность):
+        чем сильнее студент не справился с темой, тем больше вклад ее
+        соседей. Стоимость - O(число затравок x N)
+        """
+        scores: Dict[int, float] = {}
+        for position, struggle in seeds:
+            for neighbor, weight in zip(
+                self.neighbors[position].tolist(), self.weights[position].tolist()
+            ):
+                if neighbor < 0:
+                    break
+                scores[neighbor] = scores.get(neighbor, 0.0) + weight * struggle
+        return scores
+
+    def save(self, path: str):
+        """
+        Сохраняет таблицу на диск (.npz)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        meta = dict(
+            self.meta, format=TABLE_FORMAT, keys=self.keys, layout_id=self.layout_id
+        )
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                neighbors=self.neighbors,
+                weights=self.weights,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["NeighborTable"]:
+        """
+        Загружает таблицу с диска; None, если файла нет или он поврежден
+        """
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                neighbors = data["neighbors"]
+                weights = data["weights"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if meta.get("format") != TABLE_FORMAT:
+            return None
+        return cls(meta.pop("keys"), meta.pop("layout_id"), neighbors, weights, meta)
+
+
+def _iter_records(store: ProgressStore) -> Iterable[Dict]:
+    """
+    Перебирает записи студентов, не держа в памяти лишнего: SQLite
+    читается по одной записи, файловые хранилища и так загружены целиком
+    """
+    if store.supports_point_reads:
+        for student_id in store.student_ids():
+            record = store.load_student(student_id)
+            if record is not None:
+                yield record
+    else:
+        yield from store.load_all().values()
+
+
+def build_neighbor_table(store: ProgressStore, neighbors: int = 10) -> NeighborTable:
+    """
+    Строит таблицу соседей по баллам тем (topic_scores) всех студентов
+    """
+    # Тяжелые импорты нужны только офлайн-сборке
+    from scipy.sparse import csr_matrix
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    layout = get_topic_layout()
+    rows: List[int] = []
+    columns: List[int] = []
+    values: List[float] = []
+    students = 0
+    for record in _iter_records(store):
+        topic_scores = (record.get("assessment") or {}).get("topic_scores", {})
+        for topic_key, score in topic_scores.items():
+            position = layout.index.get(topic_key)
+            struggle = 1 - min(max(score / 100, 0.0), 1.0)
+            if position is not None and struggle > 0:
+                rows.append(students)
+                columns.append(position)
+                values.append(struggle)
+        students += 1
+
+    matrix = csr_matrix(
+        (np.array(values, dtype=np.float32), (rows, columns)),
+        shape=(students, len(layout.keys)),
+    )
+    similarity = cosine_similarity(matrix.T, dense_output=False).tolil()
+    similarity.setdiag(0)
+    similarity = similarity.tocsr()
+
+    table_neighbors = np.full((len(layout.keys), neighbors), -1, dtype=np.int32)
+    table_weights = np.zeros((len(layout.keys), neighbors), dtype=np.float32)
+    for position in range(len(layout.keys)):
+        start, end = similarity.indptr[position], similarity.indptr[position + 1]
+        row_columns = similarity.indices[start:end]
+        row_values = similarity.data[start:end]
+        keep = row_values > 0
+        row_columns, row_values = row_columns[keep], row_values[keep]
+        # По убыванию веса, при равенстве - в порядке каталога
+        order = np.lexsort((row_columns, -row_values))[:neighbors]
+        table_neighbors[position, : len(order)] = row_columns[order]
+        table_weights[position, : len(order)] = row_values[order]
+
+    meta = {
+        "knowledge_base_version": knowledge_base_version(),
+        "students": students,
+        "built_at": datetime.now().isoformat(),
+    }
+    return NeighborTable(
+        list(layout.keys), layout.layout_id, table_neighbors, table_weights, meta
+    )
+
+
+def load_neighbor_table(path: str = DEFAULT_NEIGHBORS_PATH) -> Optional[NeighborTable]:
+    """
+    Загружает таблицу, если она построена для текущего набора тем
+    """
+    table = NeighborTable.load(path)
+    if table is None or table.layout_id != get_topic_layout().layout_id:
+        return None
+    return table
+
+
+def blend_recommendations(
+    recommendations: List[Dict],
+    table: Optional[NeighborTable],
+    topic_scores: Dict[str, float],
+    mastery: Sequence[float],
+    specialization: str,
+    threshold: float,
+    weight: float = 0.3,
+    seeds: int = 5,
+) -> List[Dict]:
+    """
+    Смешивает рекомендации по собственным баллам с темами, похожими на
+    те, с которыми студент не справился.
+
+    Итоговый вес темы: (1 - weight) * (1 - освоение) + weight * вес
+    соседей (нормированный к 1). Темы с освоением не ниже threshold
+    не предлагаются. Без актуальной таблицы рекомендации не меняются
+    """
+    if table is None or table.layout_id != get_topic_layout().layout_id:
+        return recommendations
+
+    layout = get_topic_layout()
+    struggles = sorted(
+        (score, layout.index[topic_key])
+        for topic_key, score in topic_scores.items()
+        if topic_key in layout.index and score < threshold
+    )[:seeds]
+    scores = table.neighbor_scores(
+        (position, 1 - float(mastery[position])) for _, position in struggles
+    )
+    if not scores:
+        return recommendations
+
+    top = max(scores.values())
+    candidates = get_candidate_table(specialization)
+    by_position = {
+        candidates.position[rec["content_link"].replace("/", "_")]: rec
+        for rec in recommendations
+    }
+    for position in sorted(scores, key=lambda p: (-scores[p], p))[
+        : len(recommendations) or seeds
+    ]:
+        if position not in by_position and mastery[position] * 100 < threshold:
+            by_position[position] = candidates.recommendation(
+                position, float(mastery[position]) * 100, digits=1
+            )
+
+    blended = []
+    for position, rec in by_position.items():
+        collaborative = scores.get(position, 0.0) / top
+        rec["collaborative_score"] = round(collaborative, 3)
+        blended.append(
+            (
+                (1 - weight) * (1 - float(mastery[position])) + weight * collaborative,
+                position,
+                rec,
+            )
+        )
+    blended.sort(key=lambda item: (-item[0], item[1]))
+    return [rec for _, _, rec in blended]
@@ -2,15 +2,63 @@
 Модель для оценки уровня знаний студента
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
 import json
 
+import numpy as np
+
+LEVELS = ("beginner", "intermediate", "advanced")
+
+
+class BatchAssessment(NamedTuple):
+    """
+    Оценки группы студентов: строка массива - студент, столбец - тема
+    """
+
+    topics: List[str]
+    topic_scores: np.ndarray  # баллы 0-100, NaN если по теме нет ответов
+    answered_mask: np.ndarray
+    weak_mask: np.ndarray
+    strong_mask: np.ndarray
+    overall_score: np.ndarray
+    overall_level: np.ndarray  # индексы в LEVELS
+
+    def to_assessment(self, row: int) -> Dict:
+        """
+        Возвращает оценку одного студента в формате create_initial_assessment
+        """
+        answered = self.answered_mask[row]
+        return {
+            "overall_level": LEVELS[self.overall_level[row]],
+            "topic_scores": {
+                topic: float(score)
+                for topic, score, has_answers in zip(
+                    self.topics, self.topic_scores[row], answered
+                )
+                if has_answers
+            },
+            "weak_topics": [
+                t for t, weak in zip(self.topics, self.weak_mask[row]) if weak
+            ],
+            "strong_topics": [
+                t for t, strong in zip(self.topics, self.strong_mask[row]) if strong
+            ],
+            "overall_score": float(self.overall_score[row]) if answered.any() else 0,
+        }
+
 
 class SimpleKnowledgeAssessor:
     """
     Упрощенный класс для оценки знаний студента на основе тестов
     """
 
+    # Пороги в процентах
+    STRONG_THRESHOLD = 80
+    WEAK_THRESHOLD = 50
+    ADVANCED_THRESHOLD = 75
+    INTERMEDIATE_THRESHOLD = 40
+    RECOMMEND_THRESHOLD = 70
+
     def __init__(self):
         self.student_profiles = {}
 
@@ -18,12 +66,12 @@ class SimpleKnowledgeAssessor:
         """
         Создает начальную оценку знаний на основе ответов на тест
         """
-        assessment = {
+        assessment: Dict[str, Any] = {
             "overall_level": "beginner",
             "topic_scores": {},
             "weak_topics": [],
             "strong_topics": [],
-            "overall_score": 0
+            "overall_score": 0,
         }
 
         total_correct = 0
@@ -39,9 +87,9 @@ class SimpleKnowledgeAssessor:
             assessment["topic_scores"][topic] = score
 
             # Определяем уровень по теме
-            if score >= 80:
+            if score >= self.STRONG_THRESHOLD:
                 assessment["strong_topics"].append(topic)
-            elif score < 50:
+            elif score < self.WEAK_THRESHOLD:
                 assessment["weak_topics"].append(topic)
 
             total_correct += correct
@@ -52,57 +100,122 @@ class SimpleKnowledgeAssessor:
             overall_score = (total_correct / total_questions) * 100
             assessment["overall_score"] = overall_score
 
-            if overall_score >= 75:
-                assessment["overall_level"] = "advanced"
-            elif overall_score >= 40:
-                assessment["overall_level"] = "intermediate"
-            else:
-                assessment["overall_level"] = "beginner"
+            assessment["overall_level"] = self.level_for_score(overall_score)
 
         return assessment
 
-    def recommend_topics(self, assessment: Dict, specialization: str) -> List[Dict]:
+    def level_for_score(self, overall_score: float) -> str:
         """
-        Рекомендует темы для изучения на основе оценки и специализации
+        Определяет общий уровень по общему баллу (0-100%)
         """
-        recommendations = []
+        if overall_score >= self.ADVANCED_THRESHOLD:
+            return "advanced"
+        elif overall_score >= self.INTERMEDIATE_THRESHOLD:
+            return "intermediate"
+        return "beginner"
 
-        # Импортируем тут, чтобы избежать циклических импортов
-        from src.data.knowledge_base import THEORY_DATABASE
-
-        for topic_id, topic_data in THEORY_DATABASE.items():
-            for subtopic_id, subtopic_data in topic_data["subtopics"].items():
-                topic_key = f"{topic_id}_{subtopic_id}"
-                score = assessment["topic_scores"].get(topic_key, 0)
-
-                # Если знание темы ниже 70%
-                if score < 70:
-                    # Берем текст специализации или заглушку
-                    specialization_text = subtopic_data.get("specializations", {}).get(
-                        specialization,
-                        f"Эта тема важна для вашей специализации ({specialization})."
-                    )
+    def reclassify(self, assessment: Dict) -> Dict:
+        """
+        Заново делит темы на сильные и слабые и определяет общий уровень
+        по сохраненным баллам оценки (например, после изменения порогов).
+        Возвращает новую оценку, остальные поля копируются как есть
+        """
+        reclassified = dict(assessment)
+        topic_scores = assessment.get("topic_scores", {})
+        reclassified["strong_topics"] = [
+            topic
+            for topic, score in topic_scores.items()
+            if score >= self.STRONG_THRESHOLD
+        ]
+        reclassified["weak_topics"] = [
+            topic
+            for topic, score in topic_scores.items()
+            if score < self.WEAK_THRESHOLD and score < self.STRONG_THRESHOLD
+        ]
+        reclassified["overall_level"] = self.level_for_score(
+            assessment.get("overall_score", 0)
+        )
+        return reclassified
+
+    def assess_batch(
+        self, answers: np.ndarray, question_topics: Sequence[str]
+    ) -> BatchAssessment:
+        """
+        Оценивает сразу всех студентов.
 
-                    recommendations.append({
-                        "topic": topic_data["topic"],
-                        "subtopic": subtopic_id,
-                        "subtopic_name": subtopic_data.get("name", subtopic_id),
-                        "priority": 100 - score,
-                        "current_score": score,
-                        "specialization_application": specialization_text,
-                        "content_link": f"{topic_id}/{subtopic_id}"
-                    })
+        answers - матрица студент x вопрос: 1 - верный ответ, 0 - неверный,
+        -1 - вопрос не задавался. question_topics[j] - тема вопроса j.
+        Результат совпадает с create_initial_assessment для каждого
+        студента, если его ответы перечислены в порядке тем topics.
+        """
+        answers = np.asarray(answers)
+        topics = list(dict.fromkeys(question_topics))
+        column = {topic: i for i, topic in enumerate(topics)}
+        topic_index = np.array([column[t] for t in question_topics], dtype=np.intp)
+
+        # Матрица вопрос x тема: суммы по темам - одно умножение матриц
+        membership = np.zeros((answers.shape[1], len(topics)), dtype=np.int64)
+        membership[np.arange(answers.shape[1]), topic_index] = 1
+
+        correct = (answers == 1).astype(np.int64) @ membership
+        answered = (answers >= 0).astype(np.int64) @ membership
+        answered_mask = answered > 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            topic_scores = np.where(answered_mask, (correct / answered) * 100, np.nan)
+
+            total_correct = correct.sum(axis=1)
+            total_questions = answered.sum(axis=1)
+            overall_score = np.where(
+                total_questions > 0, (total_correct / total_questions) * 100, 0.0
+            )
+
+        strong_mask = answered_mask & (topic_scores >= self.STRONG_THRESHOLD)
+        weak_mask = answered_mask & ~strong_mask & (topic_scores < self.WEAK_THRESHOLD)
+
+        overall_level = np.zeros(len(answers), dtype=np.int8)
+        overall_level[overall_score >= self.INTERMEDIATE_THRESHOLD] = 1
+        overall_level[overall_score >= self.ADVANCED_THRESHOLD] = 2
+
+        return BatchAssessment(
+            topics,
+            topic_scores,
+            answered_mask,
+            weak_mask,
+            strong_mask,
+            overall_score,
+            overall_level,
+        )
+
+    def recommend_topics(
+        self,
+        assessment: Dict,
+        specialization: str,
+        k: int = 5,
+        mastery: Optional[Sequence[float]] = None,
+    ) -> List[Dict]:
+        """
+        Рекомендует темы для изучения на основе оценки и специализации:
+        k тем с баллом ниже RECOMMEND_THRESHOLD, самые слабые первыми.
+        Если передан массив вероятностей освоения тем (KnowledgeTracer),
+        баллы берутся из него, а не из topic_scores оценки
+        """
+        # Импортируем тут, чтобы избежать циклических импортов
+        from src.data.recommendation_candidates import get_candidate_table
 
-        # Сортируем по приоритету и берем топ-5
-        recommendations.sort(key=lambda x: x["priority"], reverse=True)
-        return recommendations[:5]
+        table = get_candidate_table(specialization)
+        if mastery is not None:
+            return table.top_k_by_mastery(mastery, k, self.RECOMMEND_THRESHOLD)
+        return table.top_k(assessment["topic_scores"], k, self.RECOMMEND_THRESHOLD)
 
     def update_assessment(self, student_id: str, new_answers: Dict) -> Dict:
         """
         Обновляет оценку знаний студента
         """
         if student_id not in self.student_profiles:
-            self.student_profiles[student_id] = self.create_initial_assessment(new_answers)
+            self.student_profiles[student_id] = self.create_initial_assessment(
+                new_answers
+            )
         else:
             # Простая логика обновления
             old_assessment = self.student_profiles[student_id]
@@ -112,10 +225,10 @@ class SimpleKnowledgeAssessor:
             for topic in new_assessment["topic_scores"]:
                 if topic in old_assessment["topic_scores"]:
                     new_assessment["topic_scores"][topic] = (
-                            old_assessment["topic_scores"][topic] * 0.3 +
-                            new_assessment["topic_scores"][topic] * 0.7
+                        old_assessment["topic_scores"][topic] * 0.3
+                        + new_assessment["topic_scores"][topic] * 0.7
                     )
 
             self.student_profiles[student_id] = new_assessment
 
-        return self.student_profiles[student_id]
\ No newline at end of file
+        return self.student_profiles[student_id]
@@ -0,0 +1,163 @@
+"""
+Байесовское отслеживание знаний (BKT) по темам
+"""
+
+import base64
+import hashlib
+from array import array
+from typing import Dict, List, Optional
+
+from src.data.catalog import catalog_cached
+from src.data.knowledge_base import THEORY_DATABASE
+
+# Поля записи студента: вероятности освоения тем и раскладка массива
+MASTERY_KEY = "mastery"
+LAYOUT_KEY = "mastery_layout"
+
+
+class TopicLayout:
+    """
+    Порядок тем в массиве вероятностей освоения - порядок каталога.
+    Идентификатор раскладки меняется, когда меняется набор тем.
+    """
+
+    def __init__(self, theory_database: Dict):
+        self.keys: List[str] = [
+            f"{topic_id}_{subtopic_id}"
+            for topic_id, topic_data in theory_database.items()
+            for subtopic_id in topic_data["subtopics"]
+        ]
+        self.index: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self.layout_id = hashlib.sha256(
+            "\n".join(self.keys).encode("utf-8")
+        ).hexdigest()[:16]
+
+
+def get_topic_layout() -> TopicLayout:
+    """
+    Возвращает раскладку тем для текущей версии базы знаний
+    """
+    return catalog_cached("topic_layout", lambda: TopicLayout(THEORY_DATABASE))
+
+
+def unpack_mastery(packed: str) -> array:
+    """
+    Восстанавливает массив вероятностей из строки хранилища
+    (serialize_record сохраняет массивы как base64)
+    """
+    values = array("f")
+    values.frombytes(base64.b64decode(packed))
+    return values
+
+
+class KnowledgeTracer:
+    """
+    Модель BKT: вероятность освоения темы пересчитывается после
+    каждого ответа за O(1).
+
+    Вероятности всех тем студента лежат в одном массиве float32
+    (MASTERY_KEY записи), а не во вложенных словарях; в хранилище
+    массив попадает строкой base64.
+    """
+
+    # Порог, после которого тема считается освоенной
+    MASTERED = 0.95
+
+    def __init__(
+        self,
+        p_init: float = 0.3,
+        p_transit: float = 0.1,
+        p_slip: float = 0.1,
+        p_guess: float = 0.25,
+    ):
+        self.p_init = p_init
+        self.p_transit = p_transit
+        self.p_slip = p_slip
+        self.p_guess = p_guess
+
+    def state(self, student: Dict) -> array:
+        """
+        Возвращает массив вероятностей студента.
+
+        Строка из хранилища распаковывается один раз. Если массива еще
+        нет или изменился набор тем, он заполняется по topic_scores
+        оценки (балл / 100), остальные темы - p_init.
+        """
+        layout = get_topic_layout()
+        values = student.get(MASTERY_KEY)
+        if isinstance(values, str):
+            values = unpack_mastery(values)
+            student[MASTERY_KEY] = values
+
+        if (
+            values is None
+            or student.get(LAYOUT_KEY) != layout.layout_id
+            or len(values) != len(layout.keys)
+        ):
+            values = self.seed(
+                student, (student.get("assessment") or {}).get("topic_scores", {})
+            )
+        return values
+
+    def seed(self, student: Dict, topic_scores: Dict[str, float]) -> array:
+        """
+        Заполняет вероятности заново: темы из topic_scores - балл / 100
+        (в той же шкале, что порог рекомендаций), остальные - p_init
+        """
+        layout = get_topic_layout()
+        values = array("f", [self.p_init]) * len(layout.keys)
+        for topic_key, score in topic_scores.items():
+            position = layout.index.get(topic_key)
+            if position is not None:
+                values[position] = min(max(score / 100, 0.0), 1.0)
+        student[MASTERY_KEY] = values
+        student[LAYOUT_KEY] = layout.layout_id
+        return values
+
+    def reset(self, student: Dict):
+        """
+        Сбрасывает все темы к начальной вероятности p_init
+        """
+        self.seed(student, {})
+
+    def observe(self, student: Dict, topic_key: str, correct: float) -> Optional[float]:
+        """
+        Учитывает ответ по теме и возвращает новую вероятность освоения.
+
+        correct - 1 (верно) или 0 (неверно); дробное значение (например,
+        доля верных ответов quiz без разбивки по вопросам) смешивает
+        оба исхода в этой пропорции.
+        """
+        position = get_topic_layout().index.get(topic_key)
+        if position is None:
+            return None
+
+        values = self.state(student)
+        known = values[position]
+
+        right = known * (1 - self.p_slip)
+        after_right = right / (right + (1 - known) * self.p_guess)
+        wrong = known * self.p_slip
+        after_wrong = wrong / (wrong + (1 - known) * (1 - self.p_guess))
+
+        posterior = correct * after_right + (1 - correct) * after_wrong
+        values[position] = posterior + (1 - posterior) * self.p_transit
+        return values[position]
+
+    def mastery(self, student: Dict, topic_key: str) -> Optional[float]:
+        """
+        Возвращает вероятность освоения темы
+        """
+        position = get_topic_layout().index.get(topic_key)
+        if position is None:
+            return None
+        return self.state(student)[position]
+
+    def mastery_map(self, student: Dict) -> Dict[str, float]:
+        """
+        Возвращает вероятности освоения всех тем словарем (для отображения)
+        """
+        return {
+            key: round(value, 4)
+            for key, value in zip(get_topic_layout().keys, self.state(student))
+        }
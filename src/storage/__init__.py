@@ -0,0 +1,46 @@
+"""
+Хранилища прогресса студентов
+"""
+
+import os
+
+from src.storage.base import ProgressStore, import_records
+from src.storage.cache import StudentCache
+from src.storage.json_store import JsonProgressStore
+from src.storage.journal_store import JournalProgressStore
+from src.storage.sqlite_store import SQLiteProgressStore
+
+DEFAULT_PROGRESS_PATH = "data/student_progress.json"
+
+
+def create_progress_store(
+    backend: str = "json", path: str = DEFAULT_PROGRESS_PATH
+) -> ProgressStore:
+    """
+    Создает хранилище прогресса по имени бэкенда
+    """
+    if backend == "json":
+        return JsonProgressStore(path)
+    if backend == "journal":
+        return JournalProgressStore(path)
+    if backend == "sqlite":
+        db_path = os.path.splitext(path)[0] + ".db"
+        is_new = not os.path.exists(db_path)
+        store = SQLiteProgressStore(db_path)
+        # При первом запуске переносим прогресс из старого JSON-файла
+        if is_new and os.path.exists(path):
+            import_records(store, JsonProgressStore(path).load_all())
+        return store
+    raise ValueError(f"Неизвестный бэкенд хранилища: {backend}")
+
+
+__all__ = [
+    "ProgressStore",
+    "JsonProgressStore",
+    "JournalProgressStore",
+    "SQLiteProgressStore",
+    "StudentCache",
+    "import_records",
+    "DEFAULT_PROGRESS_PATH",
+    "create_progress_store",
+]
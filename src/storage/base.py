@@ -0,0 +1,182 @@
+"""
+Базовый интерфейс хранилища прогресса студентов
+"""
+
+import base64
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Ключ записи с номером ее версии в хранилище
+VERSION_KEY = "_version"
+
+
+class VersionConflictError(Exception):
+    """
+    Запись студента изменил другой процесс: сохраняемая копия устарела
+    """
+
+    def __init__(self, student_ids: Iterable[str]):
+        self.student_ids = set(student_ids)
+        super().__init__(
+            f"Конфликт версий для студентов: {', '.join(sorted(self.student_ids))}"
+        )
+
+
+def serialize_record(data: Dict) -> Dict:
+    """
+    Возвращает копию записи студента, пригодную для JSON
+    """
+    serializable_data = data.copy()
+    # Убеждаемся, что все даты - строки, а упакованные массивы - base64
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            serializable_data[key] = value.isoformat()
+        elif isinstance(value, array):
+            serializable_data[key] = base64.b64encode(value.tobytes()).decode("ascii")
+    return serializable_data
+
+
+class ProgressStore:
+    """
+    Хранилище прогресса студентов.
+
+    Движок работает только через этот интерфейс, поэтому способ
+    хранения (один JSON-файл, журнал, база данных) можно менять,
+    не трогая логику обучения.
+    """
+
+    # Умеет ли хранилище дешево читать одну запись без загрузки всех
+    supports_point_reads = False
+    # Ведет ли хранилище сводные счетчики по студентам (population_counters)
+    supports_population_counters = False
+    # Умеет ли хранилище само выбирать наступившие повторения (due_reviews)
+    supports_review_queue = False
+
+    def load_all(self) -> Dict[str, Dict]:
+        """
+        Загружает прогресс всех студентов
+        """
+        raise NotImplementedError
+
+    def load_student(self, student_id: str) -> Optional[Dict]:
+        """
+        Загружает прогресс одного студента
+        """
+        return self.load_all().get(student_id)
+
+    def _all_records(self) -> Dict[str, Dict]:
+        """
+        Возвращает все записи для обхода студентов (student_ids,
+        studied_topic_entries, student_summaries). Хранилища, которые
+        держат записи в памяти, отдают их без повторного чтения
+        """
+        return self.load_all()
+
+    def save_students(self, records: Dict[str, Dict]) -> Set[str]:
+        """
+        Сохраняет изменившиеся записи студентов.
+
+        Хранилища с версиями сохраняют запись, только если ее версия
+        совпадает с сохраненной (compare-and-swap), и увеличивают версию
+        в переданной записи. Возвращает идентификаторы записей, которые
+        не сохранены из-за конфликта версий.
+        """
+        raise NotImplementedError
+
+    def save_batches(self, batches: Iterable[Dict[str, Dict]]) -> Set[str]:
+        """
+        Сохраняет несколько пачек записей как одно изменение (для
+        массовой замены записей). Файловые хранилища и так держат все
+        записи в памяти, поэтому по умолчанию пачки объединяются
+        в один вызов save_students
+        """
+        records: Dict[str, Dict] = {}
+        for batch in batches:
+            records.update(batch)
+        return self.save_students(records)
+
+    def get_version(self, student_id: str) -> Optional[int]:
+        """
+        Возвращает сохраненную версию записи (None - версии не ведутся
+        или записи нет)
+        """
+        return None
+
+    def delete_student(self, student_id: str):
+        """
+        Удаляет запись студента
+        """
+        raise NotImplementedError
+
+    def student_ids(self) -> Iterable[str]:
+        """
+        Возвращает идентификаторы всех студентов
+        """
+        return list(self._all_records().keys())
+
+    def studied_topic_entries(self) -> Iterable[Tuple[str, Dict]]:
+        """
+        Возвращает пары (идентификатор студента, запись studied_topics)
+        для всех студентов
+        """
+        for student_id, data in self._all_records().items():
+            for topic in data.get("studied_topics", []):
+                yield student_id, topic
+
+    def student_summaries(
+        self,
+    ) -> Iterable[Tuple[str, Optional[str], Optional[str], int, Optional[str]]]:
+        """
+        Возвращает для всех студентов кортежи (идентификатор,
+        специализация, уровень, число изученных тем, последняя активность)
+        """
+        for student_id, data in self._all_records().items():
+            yield (
+                student_id,
+                data.get("specialization"),
+                data.get("current_level"),
+                len(data.get("studied_topics", [])),
+                data.get("last_activity"),
+            )
+
+    def population_counters(self) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Возвращает сводные счетчики по студентам, которые хранилище
+        обновляет при каждой записи: {вид: {ключ: число}} для видов
+        students, specialization, level, topics и active (по дням), или
+        None, если хранилище их не ведет
+        """
+        return None
+
+    def due_reviews(
+        self, now: datetime, limit: int
+    ) -> Optional[List[Tuple[str, str, datetime]]]:
+        """
+        Возвращает до limit наступивших повторений всех студентов
+        (студент, тема, время) - сначала самые просроченные, или None,
+        если хранилище не умеет выбирать их само
+        """
+        return None
+
+    def close(self):
+        """
+        Освобождает ресурсы хранилища
+        """
+
+
+def import_records(
+    store: ProgressStore, records: Dict[str, Dict], batch_size: int = 1000
+):
+    """
+    Переносит записи (например, из старого JSON-файла) в хранилище пачками
+    """
+    batch: Dict[str, Dict] = {}
+    for student_id, data in records.items():
+        # Версии другого хранилища к новому отношения не имеют
+        data = {key: value for key, value in data.items() if key != VERSION_KEY}
+        batch[student_id] = data
+        if len(batch) >= batch_size:
+            store.save_students(batch)
+            batch = {}
+    store.save_students(batch)
@@ -0,0 +1,392 @@
+"""
+Словарь прогресса студентов с ленивой загрузкой из хранилища
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from src.storage.base import VERSION_KEY, ProgressStore, VersionConflictError
+
+
+class StudentCache(MutableMapping):
+    """
+    Ведет себя как словарь student_id -> запись, но загружает запись
+    из хранилища только при первом обращении к студенту.
+
+    Записи держатся в LRU ограниченного размера. Вытесненная измененная
+    запись остается в очереди на сохранение и записывается ближайшим
+    flush(). Поэтому память процесса зависит от числа активных
+    студентов, а не от общего числа зарегистрированных.
+
+    Все записи в хранилище идут через flush() и по одной за раз, а копия
+    записи снимается под блокировкой студента, так что более старая
+    копия записи не может перезаписать более новую.
+
+    Кроме записей кэш хранит журнал несохраненных изменений каждого
+    студента (record_change): если сохранение проиграло конфликт версий,
+    устаревшая запись выбрасывается, а изменения из журнала можно
+    применить заново к свежей записи из хранилища.
+    """
+
+    def __init__(self, store: ProgressStore, capacity: Optional[int] = 10000):
+        self.store = store
+        self.capacity = capacity
+        self._records: "OrderedDict[str, Dict]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        # Вытесненные из LRU, но еще не сохраненные записи
+        self._pending: Dict[str, Dict] = {}
+        # Записи, которые прямо сейчас сохраняются в хранилище
+        self._in_flight: Dict[str, Dict] = {}
+        # Журнал несохраненных изменений и сколько первых из них уже
+        # применено к записи в памяти (после сброса записи - ни одного)
+        self._changes: Dict[str, List[Any]] = {}
+        self._applied: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+
+    def __getitem__(self, student_id: str) -> Dict:
+        with self._lock:
+            record = self._resident(student_id)
+        if record is not None:
+            return record
+
+        # Чтение из хранилища - без общей блокировки, чтобы промах по
+        # одному студенту не задерживал обращения к остальным
+        loaded = self.store.load_student(student_id)
+
+        with self._lock:
+            # Пока шло чтение, запись могла появиться в кэше
+            record = self._resident(student_id)
+            if record is not None:
+                return record
+            if loaded is None:
+                raise KeyError(student_id)
+            self._insert(student_id, loaded)
+            return loaded
+
+    def _resident(self, student_id: str) -> Optional[Dict]:
+        """
+        Запись из памяти (LRU, очереди на сохранение или записываемых)
+        или None, если ее надо читать из хранилища
+        """
+        record = self._records.get(student_id)
+        if record is not None:
+            self._records.move_to_end(student_id)
+            return record
+
+        record = self._pending.pop(student_id, None)
+        if record is not None:
+            self._insert(student_id, record)
+            self._dirty.add(student_id)
+            return record
+
+        record = self._in_flight.get(student_id)
+        if record is not None:
+            self._insert(student_id, record)
+            return record
+        return None
+
+    def __setitem__(self, student_id: str, record: Dict):
+        with self._lock:
+            self._insert(student_id, record)
+
+    def __delitem__(self, student_id: str):
+        with self._lock:
+            if student_id not in self:
+                raise KeyError(student_id)
+            self._records.pop(student_id, None)
+            self._pending.pop(student_id, None)
+            self._dirty.discard(student_id)
+            self._changes.pop(student_id, None)
+            self._applied.pop(student_id, None)
+            self.store.delete_student(student_id)
+
+    def __contains__(self, student_id) -> bool:
+        try:
+            self[student_id]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            resident = list(self._records) + list(self._pending)
+        yield from resident
+        resident_set = set(resident)
+        for student_id in self.store.student_ids():
+            if student_id not in resident_set:
+                yield student_id
+
+    def __len__(self) -> int:
+        with self._lock:
+            resident = set(self._records).union(self._pending)
+        return len(resident.union(self.store.student_ids()))
+
+    def _insert(self, student_id: str, record: Dict):
+        """
+        Кладет запись в кэш и вытесняет самые давние записи
+        """
+        self._records[student_id] = record
+        self._records.move_to_end(student_id)
+
+        if self.capacity is None:
+            return
+
+        while len(self._records) > self.capacity:
+            evicted_id, evicted_record = self._records.popitem(last=False)
+            if evicted_id in self._dirty:
+                # Измененную запись откладываем до ближайшего сохранения
+                self._dirty.discard(evicted_id)
+                self._pending[evicted_id] = evicted_record
+
+    def mark_dirty(self, student_id: str):
+        """
+        Отмечает запись как измененную с последнего сохранения
+        """
+        with self._lock:
+            if student_id in self._records:
+                self._dirty.add(student_id)
+
+    def record_change(self, student_id: str, change: Any):
+        """
+        Добавляет изменение в журнал студента (еще не примененным к записи)
+        """
+        with self._lock:
+            self._changes.setdefault(student_id, []).append(change)
+
+    def unapplied_changes(self, student_id: str) -> List[Any]:
+        """
+        Изменения из журнала, которых еще нет в записи в памяти, по порядку
+        """
+        with self._lock:
+            return self._changes.get(student_id, [])[self._applied.get(student_id, 0) :]
+
+    def mark_applied(self, student_id: str):
+        """
+        Отмечает, что к записи применено следующее изменение из журнала
+        """
+        with self._lock:
+            self._applied[student_id] = self._applied.get(student_id, 0) + 1
+
+    def forget_change(self, student_id: str, change: Any):
+        """
+        Убирает из журнала изменение, которое ничего не изменило или не
+        выполнилось
+        """
+        with self._lock:
+            changes = self._changes.get(student_id, [])
+            for index, logged in enumerate(changes):
+                if logged is change:
+                    del changes[index]
+                    if index < self._applied.get(student_id, 0):
+                        self._applied[student_id] -= 1
+                    break
+            self._trim_changes(student_id, 0)
+
+    def _trim_changes(self, student_id: str, saved: int):
+        """
+        Убирает из журнала первые saved изменений, попавших в хранилище
+        """
+        changes = self._changes.get(student_id)
+        if changes is None:
+            return
+        del changes[:saved]
+        self._applied[student_id] = max(self._applied.get(student_id, 0) - saved, 0)
+        if not changes:
+            del self._changes[student_id]
+            self._applied.pop(student_id, None)
+
+    def dirty_count(self) -> int:
+        """
+        Возвращает число несохраненных записей
+        """
+        return len(self._dirty) + len(self._pending)
+
+    def _take_dirty(
+        self, student_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Снимает отметку с измененных записей (всех или указанных)
+        и переводит их в состояние "записывается"
+        """
+        with self._lock:
+            if student_ids is None:
+                student_ids = list(self._dirty) + list(self._pending)
+
+            records = {}
+            for student_id in student_ids:
+                if student_id in self._dirty:
+                    self._dirty.discard(student_id)
+                    records[student_id] = self._records[student_id]
+                elif student_id in self._pending:
+                    records[student_id] = self._pending.pop(student_id)
+
+            # Пока запись идет, читатели должны видеть эти записи,
+            # а не устаревшие версии из хранилища
+            self._in_flight.update(records)
+            return records
+
+    def _finish(
+        self,
+        records: Dict[str, Dict],
+        written: bool,
+        saved_changes: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Завершает запись; несохраненные записи снова отмечаются
+        измененными, у сохраненных из журнала убираются попавшие в
+        хранилище изменения (saved_changes)
+        """
+        with self._lock:
+            for student_id, record in records.items():
+                if self._in_flight.get(student_id) is record:
+                    del self._in_flight[student_id]
+                if written:
+                    self._trim_changes(
+                        student_id, (saved_changes or {}).get(student_id, 0)
+                    )
+                    continue
+                if student_id in self._records:
+                    self._dirty.add(student_id)
+                else:
+                    self._pending.setdefault(student_id, record)
+
+    def flush(
+        self,
+        student_ids: Optional[Iterable[str]] = None,
+        lock_for: Optional[Callable[[str], Any]] = None,
+    ) -> int:
+        """
+        Сохраняет измененные записи в хранилище.
+        Возвращает число сохраненных записей.
+
+        Без lock_for записи сохраняются как есть: вызывающий код должен
+        держать блокировки этих студентов. С lock_for каждая запись
+        копируется под блокировкой своего студента; если блокировка
+        занята (студент прямо сейчас меняется), запись остается
+        в очереди до следующего сброса.
+
+        Если запись изменил другой процесс, устаревшая копия выбрасывается,
+        а журнал изменений студента остается: их нужно применить заново
+        (unapplied_changes) к записи, перечитанной из хранилища. Такие
+        студенты перечисляются в VersionConflictError.
+        """
+        with self._flush_lock:
+            records = self._take_dirty(student_ids)
+            if not records:
+                return 0
+
+            # Сколько изменений из журнала попадет в хранилище с каждой записью
+            with self._lock:
+                saved_changes = {
+                    student_id: self._applied.get(student_id, 0)
+                    for student_id in records
+                }
+
+            to_write = records
+            if lock_for is not None:
+                to_write, busy = {}, {}
+                for student_id, record in records.items():
+                    lock = lock_for(student_id)
+                    if lock.acquire(blocking=False):
+                        try:
+                            with self._lock:
+                                saved_changes[student_id] = self._applied.get(
+                                    student_id, 0
+                                )
+                            to_write[student_id] = copy.deepcopy(record)
+                        finally:
+                            lock.release()
+                    else:
+                        busy[student_id] = record
+                self._finish(busy, written=False)
+
+            originals = {student_id: records[student_id] for student_id in to_write}
+            try:
+                conflicts = self.store.save_students(to_write) if to_write else set()
+            except Exception:
+                self._finish(originals, written=False)
+                raise
+
+            for student_id in conflicts:
+                # Запись изменил другой процесс: устаревшую копию выбрасываем,
+                # при следующем обращении она перечитается из хранилища
+                del to_write[student_id]
+                self._drop(student_id)
+
+            for student_id, written in to_write.items():
+                if written is not originals[student_id] and VERSION_KEY in written:
+                    originals[student_id][VERSION_KEY] = written[VERSION_KEY]
+            self._finish(
+                {student_id: originals[student_id] for student_id in to_write},
+                written=True,
+                saved_changes=saved_changes,
+            )
+
+            if conflicts:
+                raise VersionConflictError(conflicts)
+            return len(to_write)
+
+    def _drop(self, student_id: str):
+        """
+        Забывает запись студента без сохранения; журнал изменений
+        остается, но ни одно из них больше не считается примененным
+        """
+        with self._lock:
+            self._records.pop(student_id, None)
+            self._pending.pop(student_id, None)
+            self._in_flight.pop(student_id, None)
+            self._dirty.discard(student_id)
+            if student_id in self._changes:
+                self._applied[student_id] = 0
+
+    def invalidate(self, student_id: str):
+        """
+        Выбрасывает запись из кэша вместе с несохраненными изменениями
+        (журнал изменений остается для повторного применения)
+        """
+        self._drop(student_id)
+
+    def revalidate(self, student_id: str):
+        """
+        Выбрасывает запись из кэша, если другой процесс сохранил более
+        новую версию (записи с несохраненными изменениями не трогаются:
+        их запись сама обнаружит конфликт)
+        """
+        if not self._is_clean(student_id):
+            return
+
+        # Версия читается без общей блокировки: это запрос к хранилищу
+        version = self.store.get_version(student_id)
+        if version is None:
+            return
+
+        with self._lock:
+            # Пока шло чтение, запись могли изменить или перечитать
+            if (
+                self._is_clean(student_id)
+                and self._records[student_id][VERSION_KEY] < version
+            ):
+                del self._records[student_id]
+
+    def _is_clean(self, student_id: str) -> bool:
+        """
+        Загружена ли запись с версией и без несохраненных изменений
+        """
+        with self._lock:
+            record = self._records.get(student_id)
+            return (
+                record is not None
+                and VERSION_KEY in record
+                and student_id not in self._dirty
+                and not self._applied.get(student_id)
+            )
+
+    def loaded_count(self) -> int:
+        """
+        Возвращает число загруженных в память записей
+        """
+        return len(self._records)
@@ -0,0 +1,298 @@
+"""
+Хранилище прогресса со снимком и журналом изменений (write-ahead journal)
+"""
+
+import glob
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, TextIO, Tuple
+
+from src.storage.base import ProgressStore, serialize_record
+
+
+class JournalProgressStore(ProgressStore):
+    """
+    Хранит прогресс как снимок (обычный student_progress.json) плюс
+    журнал изменений в формате JSON Lines.
+
+    Каждое сохранение дописывает в журнал по одной строке на
+    изменившегося студента, поэтому стоимость записи зависит от размера
+    изменения, а не от числа студентов. Когда журнал разрастается,
+    он "запечатывается" в отдельный сегмент, а фоновый поток сворачивает
+    снимок и сегменты в новый снимок.
+
+    Записи журнала - полные записи студентов, поэтому повторное
+    применение журнала идемпотентно: сбой в середине компактации
+    ничего не ломает.
+
+    Журнал рассчитан на один процесс; для нескольких воркеров
+    используйте JSON- или SQLite-хранилище с версиями записей.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = "data/student_progress.json",
+        journal_path: Optional[str] = None,
+        compact_every: int = 1000,
+        fsync: bool = False,
+    ):
+        self.snapshot_path = snapshot_path
+        self.journal_path = (
+            journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        )
+        self.compact_every = compact_every
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._journal_file: Optional[TextIO] = None
+        self._records_since_compaction = 0
+        self._compaction_thread: Optional[threading.Thread] = None
+        # Индекс записей для точечного чтения, строится при первом обращении
+        self._records: Optional[Dict[str, Dict]] = None
+
+    # ---------- чтение ----------
+
+    def load_all(self) -> Dict[str, Dict]:
+        """
+        Восстанавливает прогресс: снимок + запечатанные сегменты + журнал
+        """
+        with self._lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> Dict[str, Dict]:
+        """
+        Читает снимок и журнал; вызывается под блокировкой
+        """
+        progress = self._read_snapshot()
+        for _, segment_path in self._sealed_segments():
+            self._replay(segment_path, progress)
+        self._records_since_compaction = self._replay(self.journal_path, progress)
+        return progress
+
+    def load_student(self, student_id: str) -> Optional[Dict]:
+        """
+        Возвращает запись студента; снимок и журнал читаются при первом обращении
+        """
+        return self._all_records().get(student_id)
+
+    def _all_records(self) -> Dict[str, Dict]:
+        """
+        Возвращает индекс записей; снимок и журнал читаются один раз,
+        дальше индекс обновляется при каждом сохранении
+        """
+        with self._lock:
+            # Индекс строится под той же блокировкой, что и дозапись в
+            # журнал, поэтому сохранение не может проскочить между чтением
+            # журнала и появлением индекса
+            if self._records is None:
+                self._records = self._load_locked()
+            return self._records
+
+    def _read_snapshot(self) -> Dict[str, Dict]:
+        """
+        Читает последний снимок
+        """
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                return {}
+        return {}
+
+    @staticmethod
+    def _replay(path: str, progress: Dict[str, Dict]) -> int:
+        """
+        Применяет записи журнала к словарю прогресса.
+        Возвращает число примененных записей.
+        """
+        if not os.path.exists(path):
+            return 0
+
+        applied = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Оборванная последняя строка после аварийного завершения
+                    continue
+
+                if entry.get("op") == "put":
+                    progress[entry["id"]] = entry["data"]
+                elif entry.get("op") == "del":
+                    progress.pop(entry["id"], None)
+                applied += 1
+
+        return applied
+
+    def _sealed_segments(self) -> List[Tuple[int, str]]:
+        """
+        Возвращает запечатанные сегменты журнала по возрастанию номера
+        """
+        segments = []
+        for path in glob.glob(glob.escape(self.journal_path) + ".*"):
+            suffix = path.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        segments.sort()
+        return segments
+
+    # ---------- запись ----------
+
+    def save_students(self, records: Dict[str, Dict]) -> Set[str]:
+        """
+        Дописывает в журнал по одной записи на студента
+        """
+        if not records:
+            return set()
+
+        lines = "".join(
+            self._encode(
+                {"op": "put", "id": student_id, "data": serialize_record(data)}
+            )
+            for student_id, data in records.items()
+        )
+        self._append(lines, len(records), lambda index: index.update(records))
+        return set()
+
+    def delete_student(self, student_id: str):
+        """
+        Дописывает в журнал запись об удалении студента
+        """
+        self._append(
+            self._encode({"op": "del", "id": student_id}),
+            1,
+            lambda index: index.pop(student_id, None),
+        )
+
+    @staticmethod
+    def _encode(entry: Dict) -> str:
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def _append(
+        self,
+        lines: str,
+        count: int,
+        update_index: Optional[Callable[[Dict[str, Dict]], Any]] = None,
+    ):
+        """
+        Дописывает строки в активный журнал и обновляет индекс записей
+        (если он уже построен)
+        """
+        with self._lock:
+            if update_index is not None and self._records is not None:
+                update_index(self._records)
+
+            if self._journal_file is None:
+                directory = os.path.dirname(self.journal_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+
+            self._journal_file.write(lines)
+            self._journal_file.flush()
+            if self.fsync:
+                os.fsync(self._journal_file.fileno())
+
+            self._records_since_compaction += count
+            need_compaction = (
+                self.compact_every > 0
+                and self._records_since_compaction >= self.compact_every
+            )
+
+        if need_compaction:
+            self.compact(background=True)
+
+    # ---------- компактация ----------
+
+    def compact(self, background: bool = False):
+        """
+        Сворачивает журнал в новый снимок.
+
+        Активный журнал мгновенно запечатывается в сегмент, после чего
+        запись продолжается в новый файл; сворачивание сегментов в снимок
+        выполняется в фоне, если background=True.
+        """
+        with self._lock:
+            if (
+                self._compaction_thread is not None
+                and self._compaction_thread.is_alive()
+            ):
+                return
+
+            self._seal_active_journal()
+            self._records_since_compaction = 0
+
+            if background:
+                self._compaction_thread = threading.Thread(
+                    target=self._fold_sealed_segments,
+                    name="progress-journal-compaction",
+                    daemon=True,
+                )
+                self._compaction_thread.start()
+                return
+
+        self._fold_sealed_segments()
+
+    def _seal_active_journal(self):
+        """
+        Переименовывает активный журнал в очередной сегмент
+        """
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0:
+            segments = self._sealed_segments()
+            next_number = segments[-1][0] + 1 if segments else 1
+            os.replace(self.journal_path, f"{self.journal_path}.{next_number}")
+
+    def _fold_sealed_segments(self):
+        """
+        Строит новый снимок из старого снимка и запечатанных сегментов
+        """
+        segments = self._sealed_segments()
+        if not segments:
+            return
+
+        progress = self._read_snapshot()
+        for _, segment_path in segments:
+            self._replay(segment_path, progress)
+
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Пишем во временный файл и атомарно подменяем снимок
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(progress, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        for _, segment_path in segments:
+            os.remove(segment_path)
+
+    def wait_for_compaction(self, timeout: Optional[float] = None):
+        """
+        Дожидается завершения фоновой компактации
+        """
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self):
+        """
+        Дожидается компактации и закрывает журнал
+        """
+        self.wait_for_compaction()
+        with self._lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
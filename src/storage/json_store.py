@@ -0,0 +1,162 @@
+"""
+Хранилище прогресса в одном JSON-файле
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional, Set
+
+from src.storage.base import VERSION_KEY, ProgressStore, serialize_record
+from src.storage.file_lock import FileLock
+
+
+class JsonProgressStore(ProgressStore):
+    """
+    Хранит прогресс всех студентов в одном JSON-файле.
+
+    Каждое сохранение перезаписывает файл целиком, поэтому стоимость
+    записи растет вместе с числом студентов.
+
+    Файл безопасно использовать из нескольких процессов: сохранение
+    идет под файловой блокировкой, файл перед записью перечитывается,
+    и запись студента заменяется, только если ее версия не изменилась
+    с момента чтения (compare-and-swap).
+    """
+
+    def __init__(self, filepath: str = "data/student_progress.json"):
+        self.filepath = filepath
+        self.lock_path = filepath + ".lock"
+        self._records: Optional[Dict[str, Dict]] = None
+        # Размер и время изменения файла на момент последнего чтения
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_file(self) -> Dict[str, Dict]:
+        """
+        Читает файл с диска
+        """
+        if os.path.exists(self.filepath):
+            try:
+                with open(self.filepath, "r", encoding="utf-8") as f:
+                    records = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                records = {}
+        else:
+            records = {}
+
+        for data in records.values():
+            data.setdefault(VERSION_KEY, 0)
+        return records
+
+    def load_all(self) -> Dict[str, Dict]:
+        """
+        Загружает прогресс студентов из файла
+        """
+        with self._lock:
+            self._signature = self._file_signature()
+            self._records = self._read_file()
+            return self._records
+
+    def _refresh(self) -> Dict[str, Dict]:
+        """
+        Перечитывает файл, если он еще не прочитан или его изменил
+        другой процесс, и возвращает записи
+        """
+        if self._records is None or self._file_signature() != self._signature:
+            return self.load_all()
+        return self._records
+
+    def load_student(self, student_id: str) -> Optional[Dict]:
+        """
+        Возвращает запись студента; файл читается при первом обращении
+        """
+        with self._lock:
+            return self._refresh().get(student_id)
+
+    def get_version(self, student_id: str) -> Optional[int]:
+        """
+        Возвращает версию записи в файле
+        """
+        with self._lock:
+            data = self._refresh().get(student_id)
+            return data.get(VERSION_KEY, 0) if data is not None else None
+
+    def _all_records(self) -> Dict[str, Dict]:
+        """
+        Возвращает все записи; файл перечитывается, только если изменился
+        """
+        with self._lock:
+            return self._refresh()
+
+    def save_students(self, records: Dict[str, Dict]) -> Set[str]:
+        """
+        Обновляет записи и перезаписывает файл целиком
+        """
+        conflicts: Set[str] = set()
+        if not records:
+            return conflicts
+
+        with self._lock, FileLock(self.lock_path):
+            # Под блокировкой перечитываем файл: другие процессы могли
+            # сохранить своих студентов
+            current = self._read_file()
+
+            for student_id, data in records.items():
+                stored = current.get(student_id)
+                expected = data.get(VERSION_KEY)
+                if expected is None:
+                    # Новая запись: студента не должен был создать кто-то еще
+                    if stored is not None:
+                        conflicts.add(student_id)
+                        continue
+                    expected = 0
+                elif stored is None or stored.get(VERSION_KEY, 0) != expected:
+                    conflicts.add(student_id)
+                    continue
+
+                data[VERSION_KEY] = expected + 1
+                current[student_id] = data
+
+            self.save_all(current)
+            self._records = current
+            self._signature = self._file_signature()
+
+        return conflicts
+
+    def delete_student(self, student_id: str):
+        """
+        Удаляет запись студента и перезаписывает файл
+        """
+        with self._lock, FileLock(self.lock_path):
+            current = self._read_file()
+            if current.pop(student_id, None) is not None:
+                self.save_all(current)
+            self._records = current
+            self._signature = self._file_signature()
+
+    def save_all(self, progress: Dict[str, Dict]):
+        """
+        Перезаписывает файл всеми переданными записями
+        """
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        serializable_progress = {
+            student_id: serialize_record(data) for student_id, data in progress.items()
+        }
+
+        # Пишем во временный файл и атомарно подменяем: читатели из
+        # других процессов никогда не увидят недописанный файл
+        tmp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(serializable_progress, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.filepath)
@@ -0,0 +1,604 @@
+"""
+Хранилище прогресса в SQLite
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.storage.base import VERSION_KEY, ProgressStore, serialize_record
+
+# Горячие скалярные поля записи студента, хранимые отдельными колонками
+SCALAR_FIELDS = (
+    "specialization",
+    "current_level",
+    "start_date",
+    "last_activity",
+    "last_study_date",
+    "streak_days",
+    "total_questions_answered",
+    "total_correct_answers",
+    "current_topic_index",
+)
+
+STUDIED_TOPIC_FIELDS = (
+    "topic",
+    "topic_id",
+    "subtopic_id",
+    "completed_date",
+    "score",
+    "retake_count",
+    "last_retake_date",
+    "easiness",
+    "interval_days",
+    "repetitions",
+    "next_review",
+)
+
+# Колонки повторений, добавленные в studied_topics позже остальных
+REVIEW_COLUMNS = {
+    "easiness": "REAL",
+    "interval_days": "INTEGER",
+    "repetitions": "INTEGER",
+    "next_review": "TEXT",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    specialization TEXT,
+    current_level TEXT,
+    start_date TEXT,
+    last_activity TEXT,
+    last_study_date TEXT,
+    streak_days INTEGER,
+    total_questions_answered INTEGER,
+    total_correct_answers INTEGER,
+    current_topic_index INTEGER,
+    extra TEXT NOT NULL DEFAULT '{}',
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS studied_topics (
+    student_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    topic TEXT NOT NULL,
+    topic_id TEXT,
+    subtopic_id TEXT,
+    completed_date TEXT,
+    score REAL,
+    retake_count INTEGER,
+    last_retake_date TEXT,
+    easiness REAL,
+    interval_days INTEGER,
+    repetitions INTEGER,
+    next_review TEXT,
+    PRIMARY KEY (student_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS achievements (
+    student_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    achievement_id TEXT NOT NULL,
+    description TEXT,
+    date_earned TEXT,
+    PRIMARY KEY (student_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS learning_path (
+    student_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    content_link TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (student_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_students_specialization ON students (specialization);
+CREATE INDEX IF NOT EXISTS idx_students_level ON students (current_level);
+CREATE INDEX IF NOT EXISTS idx_students_last_activity ON students (last_activity);
+"""
+
+# Сводные счетчики по студентам: (вид, ключ) -> число. Таблица
+# создается и заполняется один раз, дальше ее обновляет каждая запись
+# студента в той же транзакции, поэтому все процессы видят одни и те же
+# числа
+POPULATION_COUNTERS_SCHEMA = (
+    """
+    CREATE TABLE population_counters (
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (kind, key)
+    ) WITHOUT ROWID
+    """,
+    "INSERT INTO population_counters SELECT 'students', '', COUNT(*) FROM students",
+    "INSERT INTO population_counters SELECT 'specialization',"
+    " COALESCE(NULLIF(specialization, ''), 'unknown'), COUNT(*) FROM students GROUP BY 2",
+    "INSERT INTO population_counters SELECT 'level',"
+    " COALESCE(NULLIF(current_level, ''), 'unknown'), COUNT(*) FROM students GROUP BY 2",
+    "INSERT INTO population_counters SELECT 'topics', '', COUNT(*) FROM studied_topics",
+    "INSERT INTO population_counters SELECT 'active', substr(last_activity, 1, 10), COUNT(*)"
+    " FROM students WHERE COALESCE(last_activity, '') <> '' GROUP BY 2",
+)
+
+# (специализация, уровень, изучено тем, дата последней активности)
+CounterSummary = Tuple[str, str, int, str]
+
+
+def _counter_summary(
+    specialization: Optional[str],
+    level: Optional[str],
+    studied: int,
+    last_activity: Optional[str],
+) -> CounterSummary:
+    """
+    Вклад студента в population_counters
+    """
+    return (
+        specialization or "unknown",
+        level or "unknown",
+        studied,
+        (last_activity or "")[:10],
+    )
+
+
+class SQLiteProgressStore(ProgressStore):
+    """
+    Хранит прогресс в SQLite: одна строка на студента для горячих полей
+    и дочерние таблицы для изученных тем, достижений и учебного пути.
+
+    Чтение и запись затрагивают только строки одного студента, поэтому
+    память и задержка не зависят от общего числа студентов.
+
+    Базу можно делить между процессами: у каждой строки студента есть
+    версия, и запись проходит, только если версия не изменилась с
+    момента чтения (compare-and-swap).
+    """
+
+    supports_point_reads = True
+    supports_population_counters = True
+    supports_review_queue = True
+
+    def __init__(self, db_path: str = "data/student_progress.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        # Транзакциями управляем сами (BEGIN IMMEDIATE), timeout - сколько
+        # ждать, пока другой процесс держит блокировку записи
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """
+        Добавляет колонки версии и повторений в базы, созданные до их появления
+        """
+        columns = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(students)")
+        }
+        if "version" not in columns:
+            self._conn.execute(
+                "ALTER TABLE students ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+
+        columns = {
+            row["name"]
+            for row in self._conn.execute("PRAGMA table_info(studied_topics)")
+        }
+        for column, column_type in REVIEW_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE studied_topics ADD COLUMN {column} {column_type}"
+                )
+
+        # Очередь повторений всех студентов - выборка по индексу; темы,
+        # изученные до появления повторений, ждут день после изучения
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_studied_topics_next_review "
+            "ON studied_topics (next_review, student_id, topic)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_studied_topics_unscheduled "
+            "ON studied_topics (completed_date) WHERE next_review IS NULL"
+        )
+
+        # Счетчики для уже заполненной базы считаются один раз при переходе
+        with self._transaction():
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'population_counters'"
+            ).fetchone()
+            if exists is None:
+                for statement in POPULATION_COUNTERS_SCHEMA:
+                    self._conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Транзакция с немедленным захватом блокировки записи
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # ---------- чтение ----------
+
+    def load_student(self, student_id: str) -> Optional[Dict]:
+        """
+        Загружает запись одного студента
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM students WHERE student_id = ?", (student_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._build_record(row)
+
+    def load_all(self) -> Dict[str, Dict]:
+        """
+        Загружает записи всех студентов
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM students").fetchall()
+            return {row["student_id"]: self._build_record(row) for row in rows}
+
+    def student_ids(self) -> Iterable[str]:
+        """
+        Возвращает идентификаторы всех студентов
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT student_id FROM students").fetchall()
+        return [row[0] for row in rows]
+
+    def studied_topic_entries(self) -> Iterable[Tuple[str, Dict]]:
+        """
+        Возвращает изученные темы всех студентов одним запросом к
+        studied_topics, не собирая записи целиком
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT student_id, topic, completed_date, next_review FROM studied_topics"
+            ).fetchall()
+        for row in rows:
+            yield row["student_id"], {
+                key: row[key] for key in row.keys()[1:] if row[key] is not None
+            }
+
+    def student_summaries(
+        self,
+    ) -> Iterable[Tuple[str, Optional[str], Optional[str], int, Optional[str]]]:
+        """
+        Возвращает сводку по студентам одним запросом, не собирая записи
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.student_id, s.specialization, s.current_level,"
+                " (SELECT COUNT(*) FROM studied_topics t WHERE t.student_id = s.student_id),"
+                " s.last_activity FROM students s"
+            ).fetchall()
+        for row in rows:
+            yield tuple(row)
+
+    def population_counters(self) -> Dict[str, Dict[str, int]]:
+        """
+        Возвращает сводные счетчики одним запросом к population_counters
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, key, count FROM population_counters WHERE count <> 0"
+            ).fetchall()
+        counters: Dict[str, Dict[str, int]] = {}
+        for kind, key, count in rows:
+            counters.setdefault(kind, {})[key] = count
+        return counters
+
+    def due_reviews(self, now: datetime, limit: int) -> List[Tuple[str, str, datetime]]:
+        """
+        Выбирает наступившие повторения по индексам studied_topics, не
+        перебирая студентов
+        """
+        if limit <= 0:
+            # LIMIT -1 в SQLite означает "без ограничения"
+            return []
+        with self._lock:
+            scheduled = self._conn.execute(
+                "SELECT student_id, topic, next_review FROM studied_topics"
+                " WHERE next_review <= ? ORDER BY next_review, student_id, topic LIMIT ?",
+                (now.isoformat(), limit),
+            ).fetchall()
+            unscheduled = self._conn.execute(
+                "SELECT student_id, topic, completed_date FROM studied_topics"
+                " WHERE next_review IS NULL AND completed_date <= ?"
+                " ORDER BY completed_date LIMIT ?",
+                ((now - timedelta(days=1)).isoformat(), limit),
+            ).fetchall()
+
+        due = [
+            (datetime.fromisoformat(next_review), student_id, topic)
+            for student_id, topic, next_review in scheduled
+        ]
+        due.extend(
+            (datetime.fromisoformat(completed) + timedelta(days=1), student_id, topic)
+            for student_id, topic, completed in unscheduled
+        )
+        due.sort()
+        return [(student_id, topic, at) for at, student_id, topic in due[:limit]]
+
+    def get_version(self, student_id: str) -> Optional[int]:
+        """
+        Возвращает версию записи студента
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM students WHERE student_id = ?", (student_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def count_students(self) -> int:
+        """
+        Возвращает число студентов
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def _build_record(self, row: sqlite3.Row) -> Dict:
+        """
+        Собирает запись студента из строки и дочерних таблиц
+        """
+        student_id = row["student_id"]
+        record = json.loads(row["extra"])
+        record["student_id"] = student_id
+        record[VERSION_KEY] = row["version"]
+        for field in SCALAR_FIELDS:
+            if row[field] is not None:
+                record[field] = row[field]
+
+        record["studied_topics"] = [
+            {
+                field: topic_row[field]
+                for field in STUDIED_TOPIC_FIELDS
+                if topic_row[field] is not None
+            }
+            for topic_row in self._conn.execute(
+                "SELECT * FROM studied_topics WHERE student_id = ? ORDER BY position",
+                (student_id,),
+            )
+        ]
+        record["achievements"] = [
+            {
+                "id": achievement_row["achievement_id"],
+                "description": achievement_row["description"],
+                "date_earned": achievement_row["date_earned"],
+            }
+            for achievement_row in self._conn.execute(
+                "SELECT * FROM achievements WHERE student_id = ? ORDER BY position",
+                (student_id,),
+            )
+        ]
+        record["learning_path"] = [
+            json.loads(path_row["data"])
+            for path_row in self._conn.execute(
+                "SELECT data FROM learning_path WHERE student_id = ? ORDER BY position",
+                (student_id,),
+            )
+        ]
+        return record
+
+    # ---------- запись ----------
+
+    def save_students(self, records: Dict[str, Dict]) -> Set[str]:
+        """
+        Сохраняет записи студентов одной транзакцией
+        """
+        conflicts: Set[str] = set()
+        if not records:
+            return conflicts
+
+        with self._lock, self._transaction():
+            for student_id, data in records.items():
+                new_version = self._write_record(student_id, serialize_record(data))
+                if new_version is None:
+                    conflicts.add(student_id)
+                else:
+                    data[VERSION_KEY] = new_version
+        return conflicts
+
+    def save_batches(self, batches: Iterable[Dict[str, Dict]]) -> Set[str]:
+        """
+        Сохраняет пачки записей одной транзакцией, не собирая их в памяти
+        """
+        conflicts = set()
+        with self._lock, self._transaction():
+            for records in batches:
+                for student_id, data in records.items():
+                    new_version = self._write_record(student_id, serialize_record(data))
+                    if new_version is None:
+                        conflicts.add(student_id)
+                    else:
+                        data[VERSION_KEY] = new_version
+        return conflicts
+
+    def delete_student(self, student_id: str):
+        """
+        Удаляет студента и все его дочерние строки
+        """
+        with self._lock, self._transaction():
+            previous = self._counter_summary(student_id)
+            self._delete_children(student_id)
+            self._conn.execute(
+                "DELETE FROM students WHERE student_id = ?", (student_id,)
+            )
+            self._update_counters(previous, None)
+
+    def _write_record(self, student_id: str, data: Dict) -> Optional[int]:
+        """
+        Записывает строку студента и заменяет его дочерние строки.
+        Возвращает новую версию или None при конфликте версий.
+        """
+        extra = {
+            key: value
+            for key, value in data.items()
+            if key not in SCALAR_FIELDS
+            and key
+            not in (
+                "student_id",
+                "studied_topics",
+                "achievements",
+                "learning_path",
+                VERSION_KEY,
+            )
+        }
+        values = (
+            *(data.get(field) for field in SCALAR_FIELDS),
+            json.dumps(extra, ensure_ascii=False),
+        )
+        expected = data.get(VERSION_KEY)
+        previous = self._counter_summary(student_id) if expected is not None else None
+
+        if expected is None:
+            # Новая запись: студента не должен был создать кто-то еще
+            columns = ", ".join(SCALAR_FIELDS)
+            placeholders = ", ".join("?" for _ in SCALAR_FIELDS)
+            cursor = self._conn.execute(
+                f"INSERT INTO students (student_id, {columns}, extra, version) "
+                f"VALUES (?, {placeholders}, ?, 1) ON CONFLICT(student_id) DO NOTHING",
+                (student_id, *values),
+            )
+            new_version = 1
+        else:
+            updates = ", ".join(f"{field} = ?" for field in SCALAR_FIELDS)
+            cursor = self._conn.execute(
+                f"UPDATE students SET {updates}, extra = ?, version = version + 1 "
+                f"WHERE student_id = ? AND version = ?",
+                (*values, student_id, expected),
+            )
+            new_version = expected + 1
+
+        if cursor.rowcount == 0:
+            return None
+
+        studied_topics = data.get("studied_topics", [])
+        self._update_counters(
+            previous,
+            _counter_summary(
+                data.get("specialization"),
+                data.get("current_level"),
+                len(studied_topics),
+                data.get("last_activity"),
+            ),
+        )
+
+        self._delete_children(student_id)
+        self._conn.executemany(
+            "INSERT INTO studied_topics (student_id, position, "
+            + ", ".join(STUDIED_TOPIC_FIELDS)
+            + ") VALUES (?, ?, "
+            + ", ".join("?" for _ in STUDIED_TOPIC_FIELDS)
+            + ")",
+            [
+                (
+                    student_id,
+                    position,
+                    *(topic.get(field) for field in STUDIED_TOPIC_FIELDS),
+                )
+                for position, topic in enumerate(studied_topics)
+            ],
+        )
+        self._conn.executemany(
+            "INSERT INTO achievements (student_id, position, achievement_id, description, date_earned) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    student_id,
+                    position,
+                    achievement["id"],
+                    achievement.get("description"),
+                    achievement.get("date_earned"),
+                )
+                for position, achievement in enumerate(data.get("achievements", []))
+            ],
+        )
+        self._conn.executemany(
+            "INSERT INTO learning_path (student_id, position, content_link, data) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    student_id,
+                    position,
+                    item.get("content_link"),
+                    json.dumps(item, ensure_ascii=False),
+                )
+                for position, item in enumerate(data.get("learning_path", []))
+            ],
+        )
+        return new_version
+
+    def _counter_summary(self, student_id: str) -> Optional[CounterSummary]:
+        """
+        Текущий вклад студента в счетчики по его строке в базе
+        """
+        row = self._conn.execute(
+            "SELECT specialization, current_level,"
+            " (SELECT COUNT(*) FROM studied_topics t WHERE t.student_id = s.student_id),"
+            " last_activity FROM students s WHERE student_id = ?",
+            (student_id,),
+        ).fetchone()
+        return _counter_summary(*row) if row is not None else None
+
+    def _update_counters(
+        self, previous: Optional[CounterSummary], current: Optional[CounterSummary]
+    ):
+        """
+        Заменяет в population_counters прежний вклад студента новым
+        """
+        if previous == current:
+            return
+        changes: Dict[Tuple[str, str], int] = {}
+        for summary, sign in ((previous, -1), (current, 1)):
+            if summary is None:
+                continue
+            specialization, level, studied, activity_date = summary
+            items = [
+                ("students", "", 1),
+                ("specialization", specialization, 1),
+                ("level", level, 1),
+                ("topics", "", studied),
+            ]
+            if activity_date:
+                items.append(("active", activity_date, 1))
+            for kind, key, amount in items:
+                changes[(kind, key)] = changes.get((kind, key), 0) + sign * amount
+        self._conn.executemany(
+            "INSERT INTO population_counters (kind, key, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(kind, key) DO UPDATE SET count = count + excluded.count",
+            [(kind, key, delta) for (kind, key), delta in changes.items() if delta],
+        )
+
+    def _delete_children(self, student_id: str):
+        for table in ("studied_topics", "achievements", "learning_path"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE student_id = ?", (student_id,)
+            )
+
+    def close(self):
+        """
+        Закрывает соединение с базой
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,153 @@
+"""
+Отложенная (write-behind) запись прогресса фоновым потоком
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from src.storage.base import VersionConflictError
+from src.storage.cache import StudentCache
+
+
+class WriteBehindFlusher:
+    """
+    Фоновый поток, который пачками сохраняет измененные записи кэша.
+
+    Запросы только отмечают студентов измененными, а запись на диск
+    происходит раз в interval секунд или сразу, как только набирается
+    threshold измененных записей. Несколько ответов одного студента
+    между сбросами превращаются в одну запись.
+    """
+
+    def __init__(
+        self,
+        cache: StudentCache,
+        interval: float = 1.0,
+        threshold: int = 500,
+        lock_for: Optional[Callable[[str], Any]] = None,
+        after_flush: Optional[Callable[[], None]] = None,
+        on_conflict: Optional[Callable[[Iterable[str]], None]] = None,
+    ):
+        self.cache = cache
+        self.lock_for = lock_for
+        # Вызывается фоновым потоком после каждого непустого сброса
+        self.after_flush = after_flush
+        # Получает студентов, чьи записи проиграли конфликт версий: их
+        # несохраненные изменения нужно применить к свежим записям
+        self.on_conflict = on_conflict
+        self.interval = interval
+        self.threshold = threshold
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._metrics_lock = threading.Lock()
+        self._flush_count = 0
+        self._records_written = 0
+        self._errors = 0
+        self._conflicts = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def start(self):
+        """
+        Запускает фоновый поток
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="progress-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def notify(self):
+        """
+        Сообщает о новых изменениях; будит поток при превышении порога
+        """
+        if self.cache.dirty_count() >= self.threshold:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                if self.flush() and self.after_flush is not None:
+                    self.after_flush()
+            except Exception as e:
+                # Записи вернулись в очередь, попробуем в следующий раз
+                print(f"Ошибка отложенного сохранения прогресса: {e}")
+
+    def flush(self) -> int:
+        """
+        Сохраняет накопленные изменения. Возвращает число записей.
+        """
+        started = time.perf_counter()
+        try:
+            written = self.cache.flush(lock_for=self.lock_for)
+        except VersionConflictError as e:
+            # Остальные записи сохранены, устаревшие копии перечитаются, а
+            # изменения из журнала применятся к ним и уйдут следующим сбросом
+            with self._metrics_lock:
+                self._conflicts += len(e.student_ids)
+            print(f"Отложенное сохранение: {e}")
+            if self.on_conflict is not None:
+                self.on_conflict(e.student_ids)
+            return 0
+        except Exception:
+            with self._metrics_lock:
+                self._errors += 1
+            raise
+
+        if written:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._metrics_lock:
+                self._flush_count += 1
+                self._records_written += written
+                self._last_flush_ms = elapsed_ms
+                self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+                self._total_flush_ms += elapsed_ms
+        return written
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Останавливает поток и сохраняет все оставшиеся изменения
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        # Записи, занятые запросами в момент сброса, дожидаемся
+        for _ in range(100):
+            self.flush()
+            if not self.cache.dirty_count():
+                break
+            time.sleep(0.01)
+
+    def metrics(self) -> Dict:
+        """
+        Возвращает метрики: задержку сброса и глубину очереди
+        """
+        with self._metrics_lock:
+            return {
+                "queue_depth": self.cache.dirty_count(),
+                "flush_count": self._flush_count,
+                "records_written": self._records_written,
+                "errors": self._errors,
+                "version_conflicts": self._conflicts,
+                "last_flush_ms": self._last_flush_ms,
+                "max_flush_ms": self._max_flush_ms,
+                "avg_flush_ms": (
+                    (self._total_flush_ms / self._flush_count)
+                    if self._flush_count
+                    else 0.0
+                ),
+                "interval_seconds": self.interval,
+                "threshold": self.threshold,
+            }
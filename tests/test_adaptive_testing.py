@@ -0,0 +1,97 @@
+"""
+Тесты для адаптивного тестирования (IRT)
+"""
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.question_registry import get_question_registry
+from src.models.adaptive_testing import AdaptiveTest, get_item_bank
+from src.storage import JsonProgressStore
+
+
+def _run_test(engine, student_id, answer_correctly):
+    """Проходит адаптивный тест до конца, возвращает итог и число вопросов"""
+    registry = get_question_registry()
+    result = engine.start_adaptive_assessment(student_id, "data_science")
+    asked = 0
+    while not result["finished"]:
+        question = result["question"]
+        assert "correct_answer" not in question
+        correct = registry.get(question["id"]).correct
+        answer = (
+            correct
+            if answer_correctly(asked)
+            else (correct + 1) % len(question["options"])
+        )
+        result = engine.submit_adaptive_answer(student_id, question["id"], answer)
+        asked += 1
+    return result, asked
+
+
+class TestItemBank:
+    """Тесты для класса ItemBank"""
+
+    def test_estimate_moves_with_answers(self):
+        """Верные ответы повышают оценку, ошибка оценки уменьшается"""
+        bank = get_item_bank()
+        prior_theta, prior_se, _ = bank.estimate([])
+        question_id = bank.questions[0]["id"]
+
+        theta_up, se_up, _ = bank.estimate([(question_id, 1)])
+        theta_down, _, _ = bank.estimate([(question_id, 0)])
+
+        assert abs(prior_theta) < 1e-9
+        assert theta_down < prior_theta < theta_up
+        assert se_up < prior_se
+
+    def test_next_item_skips_used(self):
+        """Заданные вопросы не повторяются, после всех вопросов - None"""
+        bank = get_item_bank()
+        used = []
+        for _ in range(len(bank.questions)):
+            question = bank.next_item(80, used)
+            assert question["id"] not in used
+            used.append(question["id"])
+        assert bank.next_item(80, used) is None
+
+
+class TestAdaptiveAssessment:
+    """Тесты адаптивного теста в движке"""
+
+    def test_placement(self, tmp_path):
+        """Сильный студент получает уровень выше слабого"""
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+
+        strong, strong_asked = _run_test(engine, "strong", lambda i: True)
+        weak, _ = _run_test(engine, "weak", lambda i: False)
+
+        assert strong["assessment"]["overall_level"] == "advanced"
+        assert weak["assessment"]["overall_level"] == "beginner"
+        assert strong["assessment"]["ability"] > weak["assessment"]["ability"]
+        assert strong_asked <= engine.adaptive_test.max_items
+        assert "adaptive_test" not in engine.student_progress["strong"]
+        assert engine.student_progress["weak"]["learning_path"]
+
+    def test_stops_on_standard_error(self, tmp_path):
+        """Тест заканчивается, когда ошибка оценки ниже порога"""
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+        engine.adaptive_test = AdaptiveTest(se_threshold=0.9, min_items=2)
+
+        result, asked = _run_test(engine, "anna", lambda i: i % 2 == 0)
+        assert asked == 2
+        assert result["assessment"]["ability_se"] < 0.9
+
+    def test_resume_and_wrong_question(self, tmp_path):
+        """Незаконченный тест продолжается после перезапуска"""
+        path = str(tmp_path / "progress.json")
+        engine = AdaptiveLearningEngine(JsonProgressStore(path))
+        first = engine.start_adaptive_assessment("anna", "web_dev")
+
+        assert "error" in engine.submit_adaptive_answer("anna", "missing_q0", 0)
+
+        restarted = AdaptiveLearningEngine(JsonProgressStore(path))
+        resumed = restarted.start_adaptive_assessment("anna", "web_dev")
+        assert resumed["question"]["id"] == first["question"]["id"]
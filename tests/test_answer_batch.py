@@ -0,0 +1,150 @@
+"""
+Тесты для пачки ответов на quiz
+"""
+
+from datetime import datetime, timedelta
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.storage import SQLiteProgressStore
+
+TOPICS = [
+    ("python_basics", "variables"),
+    ("oop", "classes"),
+    ("python_basics", "lists"),
+]
+
+
+class CountingStore(SQLiteProgressStore):
+    """SQLite-хранилище, которое считает вызовы save_students"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.writes = 0
+
+    def save_students(self, records):
+        self.writes += 1
+        return super().save_students(records)
+
+
+def make_engine(store=None):
+    engine = AdaptiveLearningEngine(store or SQLiteProgressStore(":memory:"))
+    for student_id in ("anna", "boris"):
+        engine.start_assessment(student_id, "data_science")
+        engine.submit_assessment(student_id, {"oop_classes_q0": -1})
+    return engine
+
+
+def make_events():
+    return [
+        {
+            "student_id": student_id,
+            "topic_id": topic_id,
+            "subtopic_id": subtopic_id,
+            "answers": [0, 1, 0],
+        }
+        for student_id in ("anna", "boris")
+        for topic_id, subtopic_id in TOPICS
+    ]
+
+
+def test_batch_matches_single_submissions():
+    """Пачка дает те же баллы и тот же прогресс, что и отдельные вызовы"""
+    batch_engine = make_engine()
+    single_engine = make_engine()
+
+    response = batch_engine.submit_answer_batch(make_events())
+    singles = [
+        single_engine.submit_topic_quiz(
+            e["student_id"], e["topic_id"], e["subtopic_id"], e["answers"]
+        )
+        for e in make_events()
+    ]
+
+    assert response["applied"] == len(singles) and response["failed"] == 0
+    assert [r["score"] for r in response["results"]] == [r["score"] for r in singles]
+    assert [r["index"] for r in response["results"]] == list(range(len(singles)))
+    for student_id in ("anna", "boris"):
+        batch = batch_engine.student_progress[student_id]
+        single = single_engine.student_progress[student_id]
+        for key in (
+            "current_topic_index",
+            "total_questions_answered",
+            "total_correct_answers",
+        ):
+            assert batch[key] == single[key]
+        assert [t["topic"] for t in batch["studied_topics"]] == [
+            t["topic"] for t in single["studied_topics"]
+        ]
+        assert (
+            batch["assessment"]["topic_scores"] == single["assessment"]["topic_scores"]
+        )
+
+
+def test_per_item_errors():
+    """Ошибка в одном событии не мешает остальным"""
+    engine = make_engine()
+    events = [
+        {
+            "student_id": "anna",
+            "topic_id": "oop",
+            "subtopic_id": "classes",
+            "answers": [0],
+        },
+        {
+            "student_id": "nobody",
+            "topic_id": "oop",
+            "subtopic_id": "classes",
+            "answers": [0],
+        },
+        {
+            "student_id": "anna",
+            "topic_id": "oop",
+            "subtopic_id": "missing",
+            "answers": [0],
+        },
+        {"student_id": "anna", "topic_id": "oop"},
+        {
+            "student_id": "anna",
+            "topic_id": "oop",
+            "subtopic_id": "classes",
+            "timestamp": "вчера",
+        },
+    ]
+    results = engine.submit_answer_batch(events)["results"]
+
+    assert results[0]["success"] is True
+    assert [r.get("error") for r in results[1:]] == [
+        "Студент не найден",
+        "Тема не найдена",
+        "Неверный формат события",
+        "Неверное время ответа",
+    ]
+
+
+def test_single_write_and_timestamps(tmp_path):
+    """Все студенты сохраняются одной записью; время ответа идет в прогресс"""
+    store = CountingStore(str(tmp_path / "progress.db"))
+    engine = make_engine(store)
+    student = engine.student_progress["anna"]
+    student["last_study_date"] = (datetime.now() - timedelta(days=3)).isoformat()
+    days = [datetime.now() - timedelta(days=d) for d in (2, 1, 0)]
+    events = [
+        {
+            "student_id": "anna",
+            "topic_id": topic_id,
+            "subtopic_id": subtopic_id,
+            "answers": [0],
+            "timestamp": day.isoformat(),
+        }
+        for (topic_id, subtopic_id), day in zip(TOPICS, days)
+    ]
+    events.append(dict(make_events()[0], student_id="boris"))
+
+    writes = store.writes
+    engine.submit_answer_batch(events)
+
+    assert store.writes == writes + 1
+    assert student["streak_days"] == 4
+    assert student["studied_topics"][0]["completed_date"] == days[0].isoformat()
+    saved = store.load_student("anna")
+    assert len(saved["studied_topics"]) == 3
@@ -0,0 +1,193 @@
+"""
+Тесты для асинхронного HTTP-сервиса
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from src.api.executor import BoundedExecutor
+from src.api.service import create_app
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.question_registry import get_question_registry
+from src.storage import SQLiteProgressStore
+
+
+def make_client():
+    engine = AdaptiveLearningEngine(SQLiteProgressStore(":memory:"))
+    return TestClient(create_app(engine, max_workers=4, max_pending=8))
+
+
+def test_learning_flow():
+    """Регистрация, тест, следующая тема и quiz через сессию в cookie"""
+    with make_client() as client:
+        assert client.get("/progress_data").status_code == 401
+
+        registered = client.post("/register", data={"student_id": "anna"}).json()
+        assert registered["specialization"] == "data_science" and registered["test"]
+
+        assert client.post("/submit_test", json={}).status_code == 400
+        result = client.post(
+            "/submit_test", json={"answers": {"oop_classes_q0": -1}}
+        ).json()
+        assert "assessment" in result
+
+        topic = client.get("/get_next_topic").json()["topic_info"]
+        topic_id, subtopic_id = topic["content_link"].split("/")
+        quiz = client.post(
+            "/submit_quiz",
+            json={"topic_id": topic_id, "subtopic_id": subtopic_id, "answers": [0]},
+        )
+        assert quiz.status_code == 200
+
+        assert client.get("/progress_data").json()["student_id"] == "anna"
+        assert client.get("/api/storage_metrics").json()["executor"]["completed"] > 0
+
+
+def test_catalog_endpoints():
+    """Каталожные эндпоинты отвечают так же, как во Flask-приложении"""
+    with make_client() as client:
+        assert client.get("/api/topics").json()["topics"]
+        assert client.get("/api/topic/oop/classes").json()["success"] is True
+        assert client.get("/api/topic/oop").status_code == 400
+        assert client.get("/api/topic/oop/missing").status_code == 404
+        assert client.get("/api/search", params={"q": " "}).status_code == 400
+
+
+def test_population_reviews_require_admin(monkeypatch):
+    """Очередь повторений всех студентов закрыта без ADMIN_TOKEN и без верного токена"""
+    with make_client() as client:
+        params = {"scope": "all"}
+        assert client.get("/api/reviews/due", params=params).status_code == 404
+
+        monkeypatch.setattr("src.api.views.ADMIN_TOKEN", "admin-secret")
+        assert client.get("/api/reviews/due", params=params).status_code == 401
+        assert (
+            client.get(
+                "/api/reviews/due",
+                params=params,
+                headers={"Authorization": "Bearer wrong"},
+            ).status_code
+            == 401
+        )
+        response = client.get(
+            "/api/reviews/due",
+            params=params,
+            headers={"Authorization": "Bearer admin-secret"},
+        )
+        assert response.json() == {"reviews": []}
+
+
+def test_population_reviews_limit_is_clamped(monkeypatch):
+    """Отрицательный limit не снимает ограничение выборки"""
+    monkeypatch.setattr("src.api.views.ADMIN_TOKEN", "admin-secret")
+    with make_client() as client:
+        engine = client.app.state.learner.engine
+        calls = []
+        monkeypatch.setattr(
+            engine,
+            "get_population_due_reviews",
+            lambda now, limit: calls.append(limit) or [],
+        )
+        headers = {"Authorization": "Bearer admin-secret"}
+        for limit in (-1, 0, 5000):
+            assert (
+                client.get(
+                    "/api/reviews/due",
+                    params={"scope": "all", "limit": limit},
+                    headers=headers,
+                ).status_code
+                == 200
+            )
+    assert calls == [1, 1, 1000]
+
+
+def test_executor_bounds_concurrency():
+    """Одновременно в пуле не больше max_workers + max_pending вызовов"""
+    executor = BoundedExecutor(max_workers=2, max_pending=1)
+    # Семафор появляется только в цикле событий (Python 3.9)
+    assert executor._slots is None
+    peak = []
+
+    def work():
+        peak.append(executor.admitted)
+
+    async def main():
+        await asyncio.gather(*(executor.run(work) for _ in range(20)))
+
+    asyncio.run(main())
+    executor.shutdown()
+    assert max(peak) <= 3
+    assert executor.metrics()["completed"] == 20
+
+
+def test_catalog_conditional_requests():
+    """Повторный запрос с If-None-Match получает 304"""
+    with make_client() as client:
+        first = client.get("/api/specializations")
+        assert first.json()["specializations"]
+
+        again = client.get(
+            "/api/specializations", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert again.status_code == 304
+
+
+def test_answer_batch_endpoint(monkeypatch):
+    """Пачка ответов принимается по токену и возвращает результат по каждому событию"""
+    events = [
+        {
+            "student_id": "anna",
+            "topic_id": "oop",
+            "subtopic_id": "classes",
+            "answers": [0],
+        }
+    ] * 3
+    with make_client() as client:
+        client.post("/register", data={"student_id": "anna"})
+        # Без настроенного токена эндпоинт закрыт
+        assert (
+            client.post("/api/answers/batch", json={"events": events}).status_code
+            == 404
+        )
+
+        monkeypatch.setattr("src.api.views.BATCH_API_TOKEN", "secret")
+        assert (
+            client.post("/api/answers/batch", json={"events": events}).status_code
+            == 401
+        )
+        auth = {"Authorization": "Bearer secret"}
+        assert (
+            client.post(
+                "/api/answers/batch", json={"events": []}, headers=auth
+            ).status_code
+            == 400
+        )
+
+        response = client.post(
+            "/api/answers/batch", json={"events": events}, headers=auth
+        ).json()
+        assert response["applied"] == 3 and len(response["results"]) == 3
+
+
+def test_adaptive_test_after_register():
+    """После регистрации адаптивный тест начинается и доводится до оценки"""
+    registry = get_question_registry()
+    with make_client() as client:
+        client.post("/register", data={"student_id": "anna"})
+        result = client.post("/adaptive_test/start").json()
+        assert "question" in result
+
+        assert client.post("/adaptive_test/answer", json={}).status_code == 400
+        while not result["finished"]:
+            question_id = result["question"]["id"]
+            response = client.post(
+                "/adaptive_test/answer",
+                json={
+                    "question_id": question_id,
+                    "answer": registry.get(question_id).correct,
+                },
+            )
+            assert response.status_code == 200
+            result = response.json()
+        assert result["assessment"]["overall_level"]
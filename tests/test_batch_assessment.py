@@ -0,0 +1,55 @@
+"""
+Тесты для пакетной оценки знаний
+"""
+
+import numpy as np
+
+from src.models.knowledge_assessment import LEVELS, SimpleKnowledgeAssessor
+
+
+class TestAssessBatch:
+    """Тесты для SimpleKnowledgeAssessor.assess_batch"""
+
+    def setup_method(self):
+        self.assessor = SimpleKnowledgeAssessor()
+        self.question_topics = ["a", "a", "b", "b", "b", "c"]
+
+    def _scalar(self, row):
+        answers = {}
+        for answer, topic in zip(row, self.question_topics):
+            if answer >= 0:
+                answers.setdefault(topic, []).append(int(answer))
+        return self.assessor.create_initial_assessment(answers)
+
+    def test_matches_scalar_path(self):
+        """Пакетный результат совпадает с оценкой по одному студенту"""
+        rng = np.random.default_rng(0)
+        answers = rng.integers(-1, 2, size=(500, len(self.question_topics)))
+        answers[0] = -1  # студент без ответов
+
+        batch = self.assessor.assess_batch(answers, self.question_topics)
+
+        for i, row in enumerate(answers):
+            assert batch.to_assessment(i) == self._scalar(row)
+
+    def test_masks_and_levels(self):
+        """Маски сильных/слабых тем и уровни считаются по порогам"""
+        answers = np.array(
+            [
+                [1, 1, 1, 1, 1, 1],
+                [1, 0, 0, 0, 1, -1],
+                [-1, -1, -1, -1, -1, -1],
+            ]
+        )
+        batch = self.assessor.assess_batch(answers, self.question_topics)
+
+        assert batch.topics == ["a", "b", "c"]
+        assert batch.strong_mask[0].all()
+        assert batch.weak_mask[1].tolist() == [False, True, False]
+        assert not batch.answered_mask[1, 2]
+        assert [LEVELS[level] for level in batch.overall_level] == [
+            "advanced",
+            "intermediate",
+            "beginner",
+        ]
+        assert batch.overall_score[2] == 0
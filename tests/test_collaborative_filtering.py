@@ -0,0 +1,95 @@
+"""
+Тесты для коллаборативной фильтрации тем
+"""
+
+import numpy as np
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.models.collaborative_filtering import (
+    NeighborTable,
+    blend_recommendations,
+    build_neighbor_table,
+    load_neighbor_table,
+)
+from src.models.knowledge_tracing import get_topic_layout
+from src.storage import SQLiteProgressStore
+
+
+def make_store(count=20):
+    """Половина студентов не справляется с oop_classes и oop_inheritance,
+    другая половина - со списками"""
+    store = SQLiteProgressStore(":memory:")
+    records = {}
+    for i in range(count):
+        if i % 2:
+            scores = {
+                "oop_classes": 10.0,
+                "oop_inheritance": 20.0,
+                "python_basics_lists": 100.0,
+            }
+        else:
+            scores = {"oop_classes": 100.0, "python_basics_lists": 30.0}
+        records[f"student{i}"] = {
+            "specialization": "data_science",
+            "assessment": {"topic_scores": scores},
+        }
+    store.save_students(records)
+    return store
+
+
+def test_build_save_and_load(tmp_path):
+    """Темы, с которыми не справляются вместе, становятся соседями"""
+    table = build_neighbor_table(make_store(), neighbors=3)
+    layout = get_topic_layout()
+    classes = layout.index["oop_classes"]
+
+    assert table.neighbors[classes, 0] == layout.index["oop_inheritance"]
+    assert table.weights[classes, 0] > 0.9
+    assert layout.index["python_basics_lists"] not in table.neighbors[classes].tolist()
+    assert classes not in table.neighbors[classes].tolist()
+    assert table.meta["students"] == 20
+
+    path = str(tmp_path / "neighbors.npz")
+    table.save(path)
+    loaded = load_neighbor_table(path)
+    assert loaded.neighbors.tolist() == table.neighbors.tolist()
+    assert load_neighbor_table(str(tmp_path / "missing.npz")) is None
+
+
+def test_blend_adds_neighbor_topics():
+    """Сосед слабой темы попадает в рекомендации и поднимается наверх"""
+    layout = get_topic_layout()
+    keys = layout.keys
+    neighbors = [[-1] for _ in keys]
+    weights = [[0.0] for _ in keys]
+    neighbors[layout.index["oop_classes"]] = [layout.index["oop_inheritance"]]
+    weights[layout.index["oop_classes"]] = [1.0]
+    table = NeighborTable(
+        list(keys),
+        layout.layout_id,
+        np.array(neighbors, dtype=np.int32),
+        np.array(weights, dtype=np.float32),
+    )
+
+    mastery = [0.9] * len(keys)
+    mastery[layout.index["oop_classes"]] = 0.1
+    mastery[layout.index["oop_inheritance"]] = 0.5
+    blended = blend_recommendations(
+        [], table, {"oop_classes": 10.0}, mastery, "data_science", 70
+    )
+
+    assert [rec["content_link"] for rec in blended] == ["oop/inheritance"]
+    assert blended[0]["collaborative_score"] == 1.0
+    assert blend_recommendations([], None, {}, mastery, "data_science", 70) == []
+
+
+def test_engine_uses_neighbor_table():
+    """get_recommendations работает с таблицей соседей"""
+    engine = AdaptiveLearningEngine(SQLiteProgressStore(":memory:"))
+    engine.neighbor_table = build_neighbor_table(make_store())
+    engine.start_assessment("anna", "data_science")
+    engine.submit_assessment("anna", {"oop_classes_q0": -1})
+
+    links = [rec["content_link"] for rec in engine.get_recommendations("anna")]
+    assert "oop/inheritance" in links
+    assert len(links) <= 5
@@ -0,0 +1,99 @@
+"""
+Тесты для пакетов контента
+"""
+
+import copy
+import shutil
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data import catalog
+from src.data.catalog import invalidate_catalog, load_content_pack
+from src.data.content_pack import export_content_pack
+from src.data.knowledge_base import (
+    INITIAL_TEST_QUESTIONS,
+    SPECIALIZATIONS,
+    THEORY_DATABASE,
+)
+from src.data.question_registry import get_question_registry
+from src.storage import JsonProgressStore
+
+
+@pytest.fixture
+def builtin_catalog():
+    """Восстанавливает встроенную базу знаний после теста"""
+    saved = (
+        copy.deepcopy(THEORY_DATABASE),
+        copy.deepcopy(SPECIALIZATIONS),
+        copy.deepcopy(INITIAL_TEST_QUESTIONS),
+    )
+    yield saved
+    for target, original in zip(
+        (THEORY_DATABASE, SPECIALIZATIONS, INITIAL_TEST_QUESTIONS), saved
+    ):
+        target.clear()
+        target.update(original)
+    if catalog._content_pack is not None:
+        catalog._content_pack.close()
+        catalog._content_pack = None
+    invalidate_catalog()
+
+
+class TestContentPack:
+    """Тесты загрузки базы знаний из пакета контента"""
+
+    def _export(self, path):
+        export_content_pack(
+            THEORY_DATABASE,
+            str(path),
+            specializations=SPECIALIZATIONS,
+            initial_test_questions=INITIAL_TEST_QUESTIONS,
+        )
+
+    def test_bodies_read_on_demand(self, tmp_path, builtin_catalog):
+        """Тексты уроков не хранятся в каталоге и читаются по запросу"""
+        original = builtin_catalog[0]
+        self._export(tmp_path / "pack")
+        pack = load_content_pack(str(tmp_path / "pack"), body_cache_size=2)
+
+        subtopic = THEORY_DATABASE["python_basics"]["subtopics"]["variables"]
+        assert "content" not in subtopic
+        assert len(pack._bodies) == 0
+
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+        content = engine.get_topic_content("python_basics", "variables")
+        assert (
+            content["content"]
+            == original["python_basics"]["subtopics"]["variables"]["content"]
+        )
+        assert content["estimated_time"] == engine._estimate_study_time(
+            content["content"]
+        )
+        assert len(pack._bodies) == 1
+
+        # LRU не растет дальше заданного размера
+        engine.get_topic_content("python_basics", "lists")
+        engine.get_topic_content("functions", "basic_functions")
+        assert len(pack._bodies) == 2
+
+    def test_zip_pack_and_catalog_rebuild(self, tmp_path, builtin_catalog):
+        """Пакет читается из архива, производные структуры перестраиваются"""
+        self._export(tmp_path / "pack")
+        archive = shutil.make_archive(
+            str(tmp_path / "pack"), "zip", str(tmp_path / "pack")
+        )
+
+        registry_before = get_question_registry()
+        load_content_pack(archive)
+
+        assert get_question_registry() is not registry_before
+        assert len(get_question_registry()) == len(registry_before)
+        assert (
+            catalog.get_lesson_body("functions", "basic_functions")
+            == builtin_catalog[0]["functions"]["subtopics"]["basic_functions"][
+                "content"
+            ]
+        )
@@ -0,0 +1,98 @@
+"""
+Тесты HTTP-маршрутов Flask-приложения
+"""
+
+import importlib
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.question_registry import get_question_registry
+from src.storage import SQLiteProgressStore
+
+
+@pytest.fixture(scope="module")
+def flask_app(tmp_path_factory):
+    """Приложение с движком в памяти; файлы при импорте создаются во временном каталоге"""
+    workdir = tmp_path_factory.mktemp("flask_app")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(workdir)
+        patch.setenv("PROGRESS_BACKEND", "sqlite")
+        patch.setenv("POPULATION_STATS_PATH", "")
+        module = importlib.import_module("app")
+    module.app.config["TESTING"] = True
+    module.engine = AdaptiveLearningEngine(SQLiteProgressStore(":memory:"))
+    return module
+
+
+def answer_adaptive_test(client, start):
+    """Отвечает на вопросы адаптивного теста до конца"""
+    registry = get_question_registry()
+    result = start.get_json()
+    while not result["finished"]:
+        question_id = result["question"]["id"]
+        response = client.post(
+            "/adaptive_test/answer",
+            json={
+                "question_id": question_id,
+                "answer": registry.get(question_id).correct,
+            },
+        )
+        assert response.status_code == 200
+        result = response.get_json()
+    return result
+
+
+def test_adaptive_test_after_register(flask_app):
+    """После регистрации адаптивный тест начинается и доводится до оценки"""
+    client = flask_app.app.test_client()
+    assert client.post("/adaptive_test/start").status_code == 401
+
+    client.post("/register", data={"student_id": "adaptive_flask"})
+    start = client.post("/adaptive_test/start")
+    assert start.status_code == 200
+    assert "question" in start.get_json()
+
+    assert client.post("/adaptive_test/answer", json={}).status_code == 400
+    result = answer_adaptive_test(client, start)
+    assert result["assessment"]["overall_level"]
+    assert flask_app.engine.student_progress["adaptive_flask"]["assessment"] is not None
+
+
+def test_population_reviews_require_token(flask_app, monkeypatch):
+    """Очередь повторений всех студентов закрыта без ADMIN_TOKEN и без верного токена"""
+    client = flask_app.app.test_client()
+    assert client.get("/api/reviews/due?scope=all").status_code == 404
+
+    monkeypatch.setattr("src.api.views.ADMIN_TOKEN", "admin-secret")
+    assert (
+        client.get(
+            "/api/reviews/due?scope=all", headers={"Authorization": "Bearer wrong"}
+        ).status_code
+        == 401
+    )
+    response = client.get(
+        "/api/reviews/due?scope=all", headers={"Authorization": "Bearer admin-secret"}
+    )
+    assert response.get_json() == {"reviews": []}
+
+
+def test_population_reviews_limit_is_clamped(flask_app, monkeypatch):
+    """Отрицательный limit не снимает ограничение выборки"""
+    monkeypatch.setattr("src.api.views.ADMIN_TOKEN", "admin-secret")
+    calls = []
+    monkeypatch.setattr(
+        flask_app.engine,
+        "get_population_due_reviews",
+        lambda limit: calls.append(limit) or [],
+    )
+    client = flask_app.app.test_client()
+    headers = {"Authorization": "Bearer admin-secret"}
+    for limit in (-1, 0, 5000):
+        assert (
+            client.get(
+                f"/api/reviews/due?scope=all&limit={limit}", headers=headers
+            ).status_code
+            == 200
+        )
+    assert calls == [1, 1, 1000]
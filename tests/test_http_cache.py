@@ -0,0 +1,85 @@
+"""
+Тесты для HTTP-кэширования каталожных эндпоинтов
+"""
+
+import gzip
+import json
+
+from src.api import http_cache
+from src.api.http_cache import (
+    TopicResponses,
+    accepts_gzip,
+    etag_matches,
+    topic_response,
+    topics_response,
+)
+from src.data.catalog import knowledge_base_version
+
+
+def test_etag_and_not_modified():
+    """ETag - версия каталога; совпавший If-None-Match дает 304 без тела"""
+    status, body, headers = topics_response({})
+    assert status == 200
+    assert headers["ETag"] == f'"{knowledge_base_version()}"'
+    assert "max-age" in headers["Cache-Control"]
+    assert json.loads(body)["topics"]
+
+    status, body, _ = topics_response({"If-None-Match": f'"x", W/{headers["ETag"]}'})
+    assert (status, body) == (304, b"")
+
+
+def test_gzip_variant():
+    """Сжатое тело - отдельное представление со своим ETag"""
+    plain = topic_response("oop/classes", {})
+    status, body, headers = topic_response(
+        "oop/classes", {"Accept-Encoding": "br, gzip"}
+    )
+
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["ETag"] != plain[2]["ETag"]
+    assert gzip.decompress(body) == plain[1]
+    assert (
+        topic_response(
+            "oop/classes",
+            {"If-None-Match": plain[2]["ETag"], "Accept-Encoding": "gzip"},
+        )[0]
+        == 200
+    )
+
+
+def test_errors_are_not_cached():
+    """Ошибки идут без ETag"""
+    status, _, headers = topic_response("oop/missing", {})
+    assert status == 404 and "ETag" not in headers
+    assert topic_response("oop", {})[0] == 400
+
+
+def test_not_modified_topic_is_not_built(monkeypatch):
+    """304 отдается без сборки ответа и чтения урока"""
+
+    def fail(topic_path):
+        raise AssertionError("ответ не должен собираться")
+
+    monkeypatch.setattr(http_cache, "topic_payload", fail)
+    etag = f'"{knowledge_base_version()}"'
+    assert topic_response("oop/inheritance", {"If-None-Match": etag})[0] == 304
+
+
+def test_topic_responses_are_bounded():
+    """Готовые ответы по подтемам держатся в LRU"""
+    responses = TopicResponses(capacity=2)
+    first = responses.get("oop/classes")
+    responses.get("oop/inheritance")
+    responses.get("oop/classes")
+    responses.get("python_basics/variables")
+
+    assert list(responses._responses) == ["oop/classes", "python_basics/variables"]
+    assert responses.get("oop/classes") is first
+
+
+def test_header_parsing():
+    assert accepts_gzip("gzip;q=0.5")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip(None)
+    assert etag_matches("*", '"v"')
+    assert not etag_matches(None, '"v"')
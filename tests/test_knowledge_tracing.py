@@ -0,0 +1,90 @@
+"""
+Тесты для байесовского отслеживания знаний
+"""
+
+from array import array
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.question_registry import get_question_registry
+from src.models.knowledge_tracing import MASTERY_KEY, KnowledgeTracer, get_topic_layout
+from src.storage import create_progress_store
+
+
+class TestKnowledgeTracer:
+    """Тесты для класса KnowledgeTracer"""
+
+    def test_observe_updates_single_topic(self):
+        """Верный ответ повышает вероятность, неверный - понижает"""
+        tracer = KnowledgeTracer()
+        student = {}
+        tracer.reset(student)
+
+        up = tracer.observe(student, "python_basics_lists", 1)
+        down = tracer.observe(student, "python_basics_variables", 0)
+
+        assert isinstance(student[MASTERY_KEY], array)
+        assert len(student[MASTERY_KEY]) == len(get_topic_layout().keys)
+        assert up > tracer.p_init > down
+        assert tracer.mastery(student, "oop_classes") == pytest.approx(tracer.p_init)
+        assert tracer.observe(student, "missing_topic", 1) is None
+
+    def test_seeded_from_topic_scores(self):
+        """Старые записи без массива получают его из topic_scores"""
+        tracer = KnowledgeTracer()
+        student = {"assessment": {"topic_scores": {"oop_classes": 80.0}}}
+
+        assert tracer.mastery(student, "oop_classes") == pytest.approx(0.8)
+        assert tracer.mastery(student, "oop_inheritance") == pytest.approx(
+            tracer.p_init
+        )
+
+
+def test_perfect_topic_not_recommended_after_assessment(tmp_path):
+    """Тема, решенная в тесте без ошибок, не попадает в рекомендации"""
+    engine = AdaptiveLearningEngine(
+        create_progress_store("sqlite", str(tmp_path / "p.db"))
+    )
+    engine.start_assessment("anna", "data_science")
+    registry = get_question_registry()
+    # В начальном тесте на тему обычно один-два вопроса
+    question = registry.questions_for("oop", "classes")[0]
+    result = engine.submit_assessment("anna", {question.question_id: question.correct})
+
+    assert result["assessment"]["topic_scores"]["oop_classes"] == 100
+    assert engine.tracer.mastery(engine.student_progress["anna"], "oop_classes") == 1.0
+    links = [rec["content_link"] for rec in engine.get_recommendations("anna")]
+    assert "oop/classes" not in links
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_engine_persists_mastery(tmp_path, backend):
+    """Вероятности переживают перезапуск и определяют рекомендации"""
+    path = str(tmp_path / "progress.json")
+    engine = AdaptiveLearningEngine(create_progress_store(backend, path))
+    engine.start_assessment("anna", "data_science")
+    engine.submit_assessment("anna", {})
+
+    questions = get_question_registry().questions_for("oop", "classes")
+    for _ in range(3):
+        engine.submit_topic_quiz(
+            "anna", "oop", "classes", [q.correct for q in questions]
+        )
+    engine.submit_topic_quiz("anna", "python_basics", "lists", [-1, -1, -1])
+    engine.close()
+
+    restarted = AdaptiveLearningEngine(create_progress_store(backend, path))
+    progress = restarted.get_student_progress("anna")
+    assert MASTERY_KEY not in progress
+    assert progress["topic_mastery"]["oop_classes"] > 0.95
+    assert progress["assessment"]["topic_scores"]["oop_classes"] > 95
+
+    student = restarted.student_progress["anna"]
+    recommendations = restarted.assessor.recommend_topics(
+        student["assessment"], "data_science", mastery=restarted.tracer.state(student)
+    )
+    links = [rec["content_link"] for rec in recommendations]
+    assert "oop/classes" not in links
+    assert links[0] == "python_basics/lists"
+    restarted.close()
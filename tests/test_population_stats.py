@@ -0,0 +1,162 @@
+"""
+Тесты для сводной статистики по студентам
+"""
+
+from datetime import date
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.core.population_stats import (
+    PopulationStats,
+    load_stats_file,
+    stats_from_store,
+    summarize,
+)
+from src.storage import SQLiteProgressStore
+
+
+def recount(engine):
+    """Статистика, посчитанная полным перебором записей"""
+    stats = PopulationStats()
+    stats.load(
+        (student_id, *summarize(engine.student_progress[student_id]))
+        for student_id in engine.student_progress
+    )
+    return stats.snapshot()
+
+
+def test_counters_follow_mutations(tmp_path):
+    """Регистрация, тест и изученная тема меняют счетчики так же, как полный пересчет"""
+    store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+    engine = AdaptiveLearningEngine(store, stats_path=str(tmp_path / "stats.json"))
+
+    engine.start_assessment("anna", "data_science")
+    engine.start_assessment("boris", "web_dev")
+    assert engine.get_population_stats()["by_specialization"] == {
+        "data_science": 1,
+        "web_dev": 1,
+    }
+
+    engine.submit_assessment("anna", {"oop_classes_q0": -1})
+    topic = engine.get_next_content("anna")["topic_info"]
+    topic_id, subtopic_id = topic["content_link"].split("/")
+    engine.submit_topic_quiz("anna", topic_id, subtopic_id, [0])
+
+    snapshot = engine.get_population_stats()
+    assert snapshot["total_students"] == 2
+    assert snapshot["total_topics_studied"] == 1
+    assert snapshot["active_today"] == 2
+    assert sum(snapshot["by_level"].values()) == 1
+    assert {k: v for k, v in snapshot.items() if k != "version"} == {
+        k: v for k, v in recount(engine).items() if k != "version"
+    }
+
+    # После перезапуска счетчики читаются из хранилища одним запросом
+    engine.close()
+    reloaded = AdaptiveLearningEngine(
+        SQLiteProgressStore(str(tmp_path / "progress.db"))
+    )
+    assert reloaded.get_population_stats()["by_level"] == snapshot["by_level"]
+    assert reloaded.get_population_stats()["total_topics_studied"] == 1
+
+    saved = load_stats_file(str(tmp_path / "stats.json"))
+    assert saved["total_students"] == 2
+    assert saved["active_by_date"] == {date.today().isoformat(): 2}
+
+
+def test_update_and_remove():
+    """Повторное обновление без изменений не меняет версию, remove вычитает вклад"""
+    stats = PopulationStats()
+    record = {
+        "specialization": "web_dev",
+        "current_level": "advanced",
+        "studied_topics": [{}, {}],
+        "last_activity": "2024-05-01T10:00:00",
+    }
+    stats.update("a", record)
+    version = stats.version
+    stats.update("a", dict(record))
+    assert stats.version == version
+
+    snapshot = stats.snapshot(date(2024, 5, 1))
+    assert snapshot["active_today"] == 1 and snapshot["total_topics_studied"] == 2
+
+    stats.remove("a")
+    snapshot = stats.snapshot()
+    assert snapshot["total_students"] == 0
+    assert snapshot["by_specialization"] == {}
+    assert snapshot["by_level"]["advanced"] == 0
+
+
+def test_stats_file_written_on_student_saves(tmp_path):
+    """Без write-behind файл сводки обновляется сохранением одного студента, не только при выходе"""
+    stats_path = str(tmp_path / "stats.json")
+    engine = AdaptiveLearningEngine(
+        SQLiteProgressStore(str(tmp_path / "progress.db")),
+        stats_path=stats_path,
+        stats_interval=0,
+    )
+
+    engine.start_assessment("anna", "data_science")
+    assert load_stats_file(stats_path)["total_students"] == 1
+    engine.start_assessment("boris", "web_dev")
+    assert load_stats_file(stats_path)["by_specialization"] == {
+        "data_science": 1,
+        "web_dev": 1,
+    }
+
+
+def test_counters_shared_between_processes(tmp_path):
+    """Два движка над одной базой (два рабочих процесса) видят общие счетчики"""
+    db_path = str(tmp_path / "progress.db")
+    first = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+    second = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+
+    first.start_assessment("anna", "data_science")
+    second.start_assessment("boris", "web_dev")
+    # Один и тот же студент меняется то в одном процессе, то в другом
+    second.submit_assessment("anna", {"oop_classes_q0": -1})
+    topic = first.get_next_content("anna")["topic_info"]
+    topic_id, subtopic_id = topic["content_link"].split("/")
+    first.submit_topic_quiz("anna", topic_id, subtopic_id, [0])
+
+    snapshot = first.get_population_stats()
+    assert snapshot == second.get_population_stats()
+    assert snapshot["total_students"] == 2
+    assert snapshot["by_specialization"] == {"data_science": 1, "web_dev": 1}
+    assert snapshot["total_topics_studied"] == 1
+    assert first.get_population_stats()["by_level"] == recount(second)["by_level"]
+
+
+def test_counters_built_for_existing_database(tmp_path):
+    """База без таблицы счетчиков получает их одним пересчетом при открытии"""
+    db_path = str(tmp_path / "progress.db")
+    engine = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+    engine.start_assessment("anna", "data_science")
+    engine.start_assessment("boris", "web_dev")
+    expected = engine.get_population_stats()
+    engine.close()
+
+    store = SQLiteProgressStore(db_path)
+    store._conn.execute("DROP TABLE population_counters")
+    store.close()
+
+    assert (
+        AdaptiveLearningEngine(SQLiteProgressStore(db_path)).get_population_stats()
+        == expected
+    )
+
+
+def test_quiz_answer_counts_as_activity(tmp_path):
+    """Ответ на quiz обновляет активность, по которой считаются активные за день"""
+    store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+    engine = AdaptiveLearningEngine(store)
+    engine.start_assessment("anna", "data_science")
+    engine.submit_assessment("anna", {"oop_classes_q0": -1})
+    engine.student_progress["anna"]["last_activity"] = "2024-05-01T10:00:00"
+    engine.student_progress.mark_dirty("anna")
+    engine.save_progress()
+    assert engine.get_population_stats()["active_today"] == 0
+
+    engine.submit_topic_quiz("anna", "oop", "classes", [0])
+    assert engine.get_population_stats()["active_today"] == 1
+    assert stats_from_store(store)["active_by_date"] == {date.today().isoformat(): 1}
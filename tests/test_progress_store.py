@@ -0,0 +1,388 @@
+"""
+Тесты для хранилищ прогресса
+"""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.api.bootstrap import create_engine
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.storage import (
+    JournalProgressStore,
+    JsonProgressStore,
+    SQLiteProgressStore,
+    StudentCache,
+)
+
+
+class TestJournalProgressStore:
+    """Тесты для журнального хранилища"""
+
+    def test_replay_snapshot_and_journal(self, tmp_path):
+        """Снимок и журнал сворачиваются в актуальное состояние"""
+        snapshot = tmp_path / "progress.json"
+        snapshot.write_text(
+            json.dumps({"a": {"student_id": "a", "streak_days": 1}}), encoding="utf-8"
+        )
+
+        store = JournalProgressStore(str(snapshot), compact_every=0)
+        store.save_students({"a": {"student_id": "a", "streak_days": 2}})
+        store.save_students({"b": {"student_id": "b", "streak_days": 1}})
+        store.delete_student("b")
+        store.close()
+
+        progress = JournalProgressStore(str(snapshot)).load_all()
+        assert progress == {"a": {"student_id": "a", "streak_days": 2}}
+
+    def test_save_appends_only_changed_students(self, tmp_path):
+        """Сохранение дописывает одну строку на студента"""
+        store = JournalProgressStore(str(tmp_path / "progress.json"), compact_every=0)
+        store.save_students({"a": {"student_id": "a"}})
+        store.save_students({"a": {"student_id": "a", "streak_days": 3}})
+        store.close()
+
+        lines = (tmp_path / "progress.journal").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[-1])["data"]["streak_days"] == 3
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path):
+        """Компактация переносит журнал в снимок"""
+        snapshot = tmp_path / "progress.json"
+        store = JournalProgressStore(str(snapshot), compact_every=2)
+        store.save_students({"a": {"student_id": "a"}})
+        store.save_students({"b": {"student_id": "b"}})
+        store.wait_for_compaction()
+        store.save_students({"c": {"student_id": "c"}})
+        store.close()
+
+        assert set(json.loads(snapshot.read_text(encoding="utf-8"))) == {"a", "b"}
+        assert set(JournalProgressStore(str(snapshot)).load_all()) == {"a", "b", "c"}
+        assert not list(tmp_path.glob("progress.journal.*"))
+
+    def test_engine_start_reads_journal_once(self, tmp_path, monkeypatch):
+        """Запуск движка и первое чтение студента читают журнал один раз"""
+        snapshot = tmp_path / "progress.json"
+        JournalProgressStore(str(snapshot), compact_every=0).save_students(
+            {"a": {"student_id": "a", "studied_topics": []}}
+        )
+
+        store = JournalProgressStore(str(snapshot))
+        loads = []
+        read_snapshot = store._read_snapshot
+        monkeypatch.setattr(
+            store, "_read_snapshot", lambda: loads.append(1) or read_snapshot()
+        )
+
+        engine = AdaptiveLearningEngine(store)
+        assert engine.student_progress["a"]["student_id"] == "a"
+        assert len(loads) == 1
+
+
+class TestSQLiteProgressStore:
+    """Тесты для SQLite-хранилища"""
+
+    def test_roundtrip_keeps_record(self, tmp_path):
+        """Запись студента читается в том же виде, в каком сохранена"""
+        data_file = Path(__file__).parent.parent / "data" / "student_progress.json"
+        with open(data_file, encoding="utf-8") as f:
+            records = json.load(f)
+
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        store.save_students(records)
+
+        for student_id, record in records.items():
+            assert store.load_student(student_id) == record
+        assert store.load_student("missing") is None
+        assert store.count_students() == len(records)
+
+    def test_engine_reads_students_on_demand(self, tmp_path):
+        """Движок загружает студентов из SQLite по одному"""
+        db_path = str(tmp_path / "progress.db")
+        engine = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+        engine.start_assessment("anna", "data_science")
+        engine.start_assessment("ivan", "web_dev")
+        engine.close()
+
+        reloaded = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+        assert reloaded.student_progress.loaded_count() == 0
+        assert reloaded.get_student_progress("ivan")["specialization"] == "web_dev"
+        assert reloaded.student_progress.loaded_count() == 1
+        assert "nobody" not in reloaded.student_progress
+
+    def test_cache_writes_back_evicted_students(self, tmp_path):
+        """Вытесненные из LRU измененные записи не теряются"""
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        engine = AdaptiveLearningEngine(store, cache_size=2)
+        for student_id in ("a", "b", "c"):
+            engine.start_assessment(student_id, "data_science")
+        # Изменения без сохранения, как при write-behind
+        for student_id in ("a", "b", "c"):
+            engine.student_progress[student_id]["streak_days"] = 5
+            engine.student_progress.mark_dirty(student_id)
+
+        assert engine.student_progress.loaded_count() == 2
+        assert engine.student_progress.dirty_count() == 3
+
+        engine.save_progress()
+        assert store.count_students() == 3
+        assert store.load_student("a")["streak_days"] == 5
+
+    def test_cache_is_bounded_for_file_stores(self, tmp_path):
+        """LRU ограничен и для файловых хранилищ"""
+        store = JsonProgressStore(str(tmp_path / "progress.json"))
+        engine = AdaptiveLearningEngine(store, cache_size=2)
+        for student_id in ("a", "b", "c"):
+            engine.start_assessment(student_id, "data_science")
+
+        assert engine.student_progress.loaded_count() == 2
+        assert engine.student_progress["a"]["specialization"] == "data_science"
+
+    def test_cache_miss_does_not_block_other_students(self, tmp_path):
+        """Пока запись одного студента читается из хранилища, другие читаются из кэша"""
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        store.save_students(
+            {
+                "anna": {"student_id": "anna", "streak_days": 1},
+                "ivan": {"student_id": "ivan", "streak_days": 2},
+            }
+        )
+        cache = StudentCache(store)
+        assert cache["anna"]["streak_days"] == 1
+
+        started, release = threading.Event(), threading.Event()
+        load_student = store.load_student
+
+        def slow_load(student_id):
+            started.set()
+            release.wait(5)
+            return load_student(student_id)
+
+        store.load_student = slow_load
+        loader = threading.Thread(target=lambda: cache["ivan"])
+        loader.start()
+        assert started.wait(5)
+
+        reader = threading.Thread(target=lambda: cache["anna"])
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+
+        release.set()
+        loader.join()
+        assert cache["ivan"]["streak_days"] == 2
+        assert cache.loaded_count() == 2
+
+    def test_revalidate_reads_version_outside_cache_lock(self, tmp_path):
+        """Сверка версии одного студента не задерживает чтение других из кэша"""
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        store.save_students(
+            {
+                "anna": {"student_id": "anna", "streak_days": 1},
+                "ivan": {"student_id": "ivan", "streak_days": 2},
+            }
+        )
+        cache = StudentCache(store)
+        cache["anna"], cache["ivan"]
+
+        started, release = threading.Event(), threading.Event()
+        get_version = store.get_version
+
+        def slow_version(student_id):
+            started.set()
+            release.wait(5)
+            return get_version(student_id)
+
+        store.get_version = slow_version
+        checker = threading.Thread(target=cache.revalidate, args=("ivan",))
+        checker.start()
+        assert started.wait(5)
+
+        reader = threading.Thread(target=lambda: cache["anna"])
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+
+        release.set()
+        checker.join()
+        # Версия не изменилась - запись остается в кэше
+        assert cache.loaded_count() == 2
+
+
+class TestEngineWithStore:
+    """Тесты сохранения прогресса движком"""
+
+    def test_engine_persists_only_dirty_students(self, tmp_path):
+        """Движок сохраняет изменения через хранилище"""
+        store = JournalProgressStore(str(tmp_path / "progress.json"), compact_every=0)
+        engine = AdaptiveLearningEngine(store)
+        engine.start_assessment("anna", "data_science")
+        engine.start_assessment("ivan", "web_dev")
+        engine.save_progress()
+        engine.save_progress()
+        engine.close()
+
+        lines = (tmp_path / "progress.journal").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+
+        reloaded = AdaptiveLearningEngine(
+            JournalProgressStore(str(tmp_path / "progress.json"))
+        )
+        assert reloaded.student_progress["ivan"]["specialization"] == "web_dev"
+
+    def test_page_views_same_day_are_not_saved(self, tmp_path):
+        """Повторный просмотр урока в тот же день не ставит запись в очередь"""
+        engine = AdaptiveLearningEngine(
+            JournalProgressStore(str(tmp_path / "progress.json"))
+        )
+        engine.start_assessment("anna", "data_science")
+        engine.submit_assessment("anna", {"oop_classes_q0": -1})
+        engine.get_next_content("anna")
+        engine.save_progress()
+
+        engine.get_next_content("anna")
+        assert engine.student_progress.dirty_count() == 0
+
+    def test_journal_refuses_several_workers(self, monkeypatch):
+        """Журнальное хранилище не запускается с несколькими воркерами"""
+        monkeypatch.setenv("PROGRESS_BACKEND", "journal")
+        monkeypatch.setenv("GUNICORN_CMD_ARGS", "--bind 0.0.0.0:8000 --workers 4")
+        with pytest.raises(ValueError):
+            create_engine()
+
+    def test_explicit_filepath_dumps_everything(self, tmp_path):
+        """save_progress с путем выгружает всех студентов в файл"""
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+        engine.start_assessment("anna", "data_science")
+
+        export_path = tmp_path / "export.json"
+        engine.save_progress(str(export_path))
+
+        assert "anna" in json.loads(export_path.read_text(encoding="utf-8"))
+
+
+class TestWriteBehind:
+    """Тесты отложенной записи"""
+
+    def test_flusher_persists_in_background(self, tmp_path):
+        """Изменения сохраняются фоновым потоком и при остановке"""
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        engine = AdaptiveLearningEngine(store, write_behind=True, flush_interval=60)
+        engine.start_assessment("anna", "data_science")
+        engine.save_progress()
+
+        assert store.load_student("anna") is None
+        assert engine.get_storage_metrics()["queue_depth"] == 1
+
+        engine.flusher.flush()
+        assert store.load_student("anna")["specialization"] == "data_science"
+
+        engine.start_assessment("ivan", "web_dev")
+        engine.close()
+
+        reopened = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        assert reopened.count_students() == 2
+
+
+class TestConcurrency:
+    """Тесты параллельной работы с движком"""
+
+    def test_parallel_quizzes_do_not_lose_updates(self, tmp_path):
+        """Параллельные отправки одного студента не теряются"""
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        engine = AdaptiveLearningEngine(store, write_behind=True, flush_interval=0.01)
+        engine.start_assessment("anna", "data_science")
+
+        def worker():
+            for _ in range(25):
+                engine.submit_topic_quiz(
+                    "anna", "python_basics", "variables", [3, 2, 1]
+                )
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.close()
+
+        reopened = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        assert reopened.load_student("anna")["total_questions_answered"] == 8 * 25 * 3
+
+
+class TestMultiProcess:
+    """Тесты общего хранилища для нескольких воркеров"""
+
+    def test_json_workers_keep_each_others_students(self, tmp_path):
+        """Воркеры с общим JSON-файлом не затирают чужих студентов"""
+        path = str(tmp_path / "progress.json")
+        first = AdaptiveLearningEngine(JsonProgressStore(path))
+        second = AdaptiveLearningEngine(JsonProgressStore(path))
+
+        first.start_assessment("anna", "data_science")
+        second.start_assessment("ivan", "web_dev")
+        first.save_progress()
+        second.save_progress()
+
+        assert set(
+            json.loads((tmp_path / "progress.json").read_text(encoding="utf-8"))
+        ) == {"anna", "ivan"}
+
+    def test_stale_copy_is_refreshed_on_conflict(self, tmp_path):
+        """Устаревшая копия перечитывается, обновления обоих воркеров сохраняются"""
+        db_path = str(tmp_path / "progress.db")
+        first = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+        first.start_assessment("anna", "data_science")
+        first.save_progress()
+
+        second = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+        second.submit_topic_quiz("anna", "python_basics", "variables", [3, 2, 1])
+
+        # Копия первого воркера устарела, но обновление не теряется
+        first.submit_topic_quiz("anna", "python_basics", "lists", [0, 0, 0])
+
+        store = SQLiteProgressStore(db_path)
+        record = store.load_student("anna")
+        assert record["total_questions_answered"] == 6
+        assert record["_version"] == 3
+
+    def test_write_behind_reapplies_changes_after_conflict(self, tmp_path):
+        """Отложенные изменения, проигравшие конфликт версий, применяются к свежей записи"""
+        db_path = str(tmp_path / "progress.db")
+        first = AdaptiveLearningEngine(
+            SQLiteProgressStore(db_path), write_behind=True, flush_interval=60
+        )
+        first.start_assessment("anna", "data_science")
+        first.flusher.flush()
+
+        # Первый воркер ответил клиенту, но еще не сохранил ответы
+        first.submit_topic_quiz("anna", "python_basics", "lists", [0, 0, 0])
+        first.submit_topic_quiz("anna", "python_basics", "lists", [1, 1, 1])
+        second = AdaptiveLearningEngine(SQLiteProgressStore(db_path))
+        second.submit_topic_quiz("anna", "python_basics", "variables", [3, 2, 1])
+
+        first.flusher.flush()
+        assert first.get_storage_metrics()["version_conflicts"] == 1
+        first.close()
+
+        record = SQLiteProgressStore(db_path).load_student("anna")
+        assert record["total_questions_answered"] == 9
+        assert {topic["subtopic_id"] for topic in record["studied_topics"]} == {
+            "variables",
+            "lists",
+        }
+
+    def test_conflicting_write_is_rejected(self, tmp_path):
+        """Запись с устаревшей версией не проходит"""
+        store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+        store.save_students({"anna": {"student_id": "anna", "streak_days": 1}})
+
+        stale = store.load_student("anna")
+        fresh = store.load_student("anna")
+        assert store.save_students({"anna": fresh}) == set()
+        assert store.save_students({"anna": stale}) == {"anna"}
+        assert store.get_version("anna") == 2
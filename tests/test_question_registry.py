@@ -0,0 +1,83 @@
+"""
+Тесты для реестра вопросов
+"""
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.catalog import invalidate_catalog
+from src.data.knowledge_base import INITIAL_TEST_QUESTIONS, THEORY_DATABASE
+from src.data.question_registry import get_question_pools, get_question_registry
+from src.storage import JsonProgressStore
+
+
+class TestQuestionRegistry:
+    """Тесты для класса QuestionRegistry"""
+
+    def test_subtopic_with_underscore(self):
+        """ID с подчеркиванием в подтеме разбирается однозначно"""
+        record = get_question_registry().get("functions_basic_functions_q1")
+
+        assert record.topic_id == "functions"
+        assert record.subtopic_id == "basic_functions"
+        assert record.index == 1
+        assert (
+            record.correct
+            == THEORY_DATABASE["functions"]["subtopics"]["basic_functions"][
+                "questions"
+            ][1]["correct"]
+        )
+
+    def test_unknown_question(self):
+        """Неизвестный ID не находится"""
+        registry = get_question_registry()
+        assert registry.get("functions_basic_q0") is None
+        assert registry.questions_for("functions", "missing") is None
+
+    def test_submit_assessment_grades_all_subtopics(self, tmp_path):
+        """Правильные ответы засчитываются для всех подтем"""
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+        engine.start_assessment("anna", "data_science")
+
+        answers = {
+            "functions_basic_functions_q0": THEORY_DATABASE["functions"]["subtopics"][
+                "basic_functions"
+            ]["questions"][0]["correct"],
+            "data_structures_stacks_queues_q0": THEORY_DATABASE["data_structures"][
+                "subtopics"
+            ]["stacks_queues"]["questions"][0]["correct"],
+        }
+        result = engine.submit_assessment("anna", answers)
+
+        assert result["test_score"] == 100
+        assert result["assessment"]["topic_scores"] == {
+            "functions_basic_functions": 100.0,
+            "data_structures_stacks_queues": 100.0,
+        }
+
+
+class TestQuestionPools:
+    """Тесты для пулов вопросов начального теста"""
+
+    def test_pools_are_built_once_per_version(self):
+        """Пулы строятся один раз и перестраиваются после изменения базы"""
+        pools = get_question_pools()
+        assert get_question_pools() is pools
+
+        invalidate_catalog()
+        assert get_question_pools() is not pools
+
+    def test_generated_test_is_a_private_copy(self, tmp_path):
+        """Тест - копии вопросов, общие пулы не меняются"""
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+        test = engine._generate_initial_test()
+
+        assert len(test) == sum(INITIAL_TEST_QUESTIONS.values())
+        test[0]["options"].append("лишний вариант")
+        question_ids = {q["id"] for pool in get_question_pools().values() for q in pool}
+        assert test[0]["id"] in question_ids
+        for pool in get_question_pools().values():
+            for question in pool:
+                assert "лишний вариант" not in question["options"]
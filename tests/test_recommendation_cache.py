@@ -0,0 +1,66 @@
+"""
+Тесты для кэша рекомендаций
+"""
+
+from array import array
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.core.recommendation_cache import RecommendationCache
+from src.storage import SQLiteProgressStore
+
+
+class TestRecommendationCache:
+    """Тесты для класса RecommendationCache"""
+
+    def test_lru_eviction_and_copies(self):
+        """Давно не использованные записи вытесняются, наружу идут копии"""
+        cache = RecommendationCache(capacity=2)
+        plan = ([{"content_link": "oop/classes"}], [])
+
+        first = cache.get_or_build(b"a", lambda: plan)
+        first[0][0]["extra"] = True
+        cache.get_or_build(b"b", lambda: plan)
+        assert "extra" not in cache.get_or_build(b"a", lambda: plan)[0][0]
+        cache.get_or_build(b"c", lambda: plan)  # вытесняет b
+
+        cache.get_or_build(b"b", lambda: plan)
+        assert cache.metrics()["hits"] == 1
+        assert cache.metrics()["misses"] == 4
+        assert cache.metrics()["size"] == 2
+
+    def test_fingerprint_depends_on_state(self):
+        """Отпечаток меняется вместе с баллами, уровнем и освоением"""
+        mastery = array("f", [0.5, 0.3])
+        base = RecommendationCache.fingerprint(
+            {"oop_classes": 50.0}, "web", "beginner", mastery
+        )
+        assert base == RecommendationCache.fingerprint(
+            {"oop_classes": 50.0}, "web", "beginner", array("f", [0.5, 0.3])
+        )
+        assert base != RecommendationCache.fingerprint(
+            {"oop_classes": 60.0}, "web", "beginner", mastery
+        )
+        assert base != RecommendationCache.fingerprint(
+            {"oop_classes": 50.0}, "web", "advanced", mastery
+        )
+        assert base != RecommendationCache.fingerprint(
+            {"oop_classes": 50.0}, "web", "beginner", array("f", [0.5, 0.4])
+        )
+
+
+def test_engine_reuses_plan_until_score_changes():
+    """Повторные запросы берут рекомендации из кэша, изученная тема их обновляет"""
+    engine = AdaptiveLearningEngine(SQLiteProgressStore(":memory:"))
+    engine.start_assessment("anna", "data_science")
+    engine.submit_assessment("anna", {})
+    cache = engine.recommendation_cache
+
+    first = engine.get_recommendations("anna")
+    assert engine.get_recommendations("anna") == first
+    assert cache.hits >= 1
+
+    misses = cache.misses
+    engine.mark_topic_completed("anna", "oop", "classes", 1.0)
+    engine.get_recommendations("anna")
+    assert cache.misses == misses + 1
+    assert "recommendation_cache" in engine.get_storage_metrics()
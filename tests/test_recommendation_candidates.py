@@ -0,0 +1,76 @@
+"""
+Тесты для таблиц кандидатов рекомендаций
+"""
+
+import random
+
+from src.data.knowledge_base import THEORY_DATABASE
+from src.data.recommendation_candidates import CandidateTable
+from src.models.knowledge_assessment import SimpleKnowledgeAssessor
+
+
+def _full_scan(theory_database, topic_scores, specialization):
+    """Прежний алгоритм: все слабые темы, полная сортировка, топ-5"""
+    recommendations = []
+    for topic_id, topic_data in theory_database.items():
+        for subtopic_id, subtopic_data in topic_data["subtopics"].items():
+            score = topic_scores.get(f"{topic_id}_{subtopic_id}", 0)
+            if score < 70:
+                recommendations.append(
+                    {
+                        "topic": topic_data["topic"],
+                        "subtopic": subtopic_id,
+                        "subtopic_name": subtopic_data.get("name", subtopic_id),
+                        "priority": 100 - score,
+                        "current_score": score,
+                        "specialization_application": subtopic_data.get(
+                            "specializations", {}
+                        ).get(
+                            specialization,
+                            f"Эта тема важна для вашей специализации ({specialization}).",
+                        ),
+                        "content_link": f"{topic_id}/{subtopic_id}",
+                    }
+                )
+    recommendations.sort(key=lambda x: x["priority"], reverse=True)
+    return recommendations[:5]
+
+
+class TestCandidateTable:
+    """Тесты для класса CandidateTable"""
+
+    def test_matches_full_scan(self):
+        """Результат совпадает с полным перебором, включая порядок при равенстве"""
+        keys = [f"{t}_{s}" for t, d in THEORY_DATABASE.items() for s in d["subtopics"]]
+        assessor = SimpleKnowledgeAssessor()
+        rng = random.Random(7)
+
+        for _ in range(500):
+            topic_scores = {
+                key: rng.choice([0, 25.0, 50, 50.0, 69.9, 70, 100])
+                for key in rng.sample(keys + ["unknown_q0"], rng.randint(0, 9))
+            }
+            specialization = rng.choice(["data_science", "web_dev", "other"])
+
+            assert assessor.recommend_topics(
+                {"topic_scores": topic_scores}, specialization
+            ) == _full_scan(THEORY_DATABASE, topic_scores, specialization)
+
+    def test_large_catalog(self):
+        """Большой каталог: неоцененные темы идут в порядке каталога"""
+        catalog = {
+            f"t{i}": {
+                "topic": f"T{i}",
+                "subtopics": {"s": {"level": "beginner", "name": "S", "questions": []}},
+            }
+            for i in range(10000)
+        }
+        table = CandidateTable(catalog, "web_dev")
+
+        topic_scores = {"t0_s": 90, "t1_s": 10, "t9999_s": 0.0}
+        links = [rec["content_link"] for rec in table.top_k(topic_scores, 5, 70)]
+
+        assert links == ["t2/s", "t3/s", "t4/s", "t5/s", "t6/s"]
+        assert links == [
+            rec["content_link"] for rec in _full_scan(catalog, topic_scores, "web_dev")
+        ]
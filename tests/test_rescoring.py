@@ -0,0 +1,76 @@
+"""
+Тесты для массового пересчета студентов
+"""
+
+import os
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.core.rescoring import PopulationRescorer, _planner
+from src.storage import create_progress_store
+
+
+def populate(backend, path, count=5):
+    """Студенты с оценкой, где все ответы на oop_classes верны"""
+    engine = AdaptiveLearningEngine(create_progress_store(backend, path))
+    for i in range(count):
+        student_id = f"student{i}"
+        engine.start_assessment(student_id, "data_science")
+        engine.submit_assessment(student_id, {"oop_classes_q0": 1})
+    engine.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_rescore_applies_new_thresholds(tmp_path, backend):
+    """После изменения порогов уровень и сильные темы пересчитаны у всех"""
+    path = str(tmp_path / "progress.json")
+    populate(backend, path)
+
+    before = create_progress_store(backend, path).load_student("student0")
+    assert "oop_classes" in before["assessment"]["strong_topics"]
+
+    # Пороги передаются воркерам явно и работают при любом способе
+    # запуска процессов (fork или spawn)
+    progress = []
+    stats = PopulationRescorer(
+        backend,
+        path,
+        workers=2,
+        chunk_size=2,
+        thresholds={"STRONG_THRESHOLD": 101},
+        progress=lambda done, total, _: progress.append((done, total)),
+    ).run()
+
+    assert stats["students"] == 5 and stats["chunks"] == 3 and stats["conflicts"] == 0
+    assert progress[-1] == (5, 5)
+    assert not os.path.exists(os.path.splitext(path)[0] + ".rescore")
+
+    store = create_progress_store(backend, path)
+    for i in range(5):
+        record = store.load_student(f"student{i}")
+        assert record["assessment"]["strong_topics"] == []
+        assert record["current_topic_index"] == 0
+        assert record["learning_path"]
+
+
+def test_rescore_resumes_from_checkpoint(tmp_path):
+    """Готовые части не пересчитываются повторно"""
+    path = str(tmp_path / "progress.json")
+    populate("sqlite", path, count=4)
+
+    rescorer = PopulationRescorer("sqlite", path, workers=1, chunk_size=2)
+    rescorer._prepare_staging(
+        sorted(create_progress_store("sqlite", path).student_ids())
+    )
+    with open(rescorer._chunk_path(0), "w", encoding="utf-8"):
+        pass  # часть 0 "уже пересчитана" (пустая)
+
+    stats = rescorer.run()
+    assert stats["resumed_chunks"] == 1
+
+
+def test_rescore_rejects_unknown_threshold(tmp_path):
+    """Опечатка в имени порога - ошибка, а не молча проигнорированная настройка"""
+    with pytest.raises(ValueError):
+        _planner({"STRONG_TRESHOLD": 85})
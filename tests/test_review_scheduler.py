@@ -0,0 +1,139 @@
+"""
+Тесты для интервальных повторений
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.core.review_scheduler import ReviewScheduler, sm2_update
+from src.storage import SQLiteProgressStore, create_progress_store
+
+NOW = datetime(2024, 3, 1, 12, 0)
+
+
+class TestSM2:
+    """Тесты для пересчета интервалов"""
+
+    def test_intervals_grow_with_good_answers(self):
+        """Интервалы 1, 6, затем умножаются на коэффициент легкости"""
+        entry = {}
+        intervals = []
+        for _ in range(4):
+            sm2_update(entry, 5, NOW)
+            intervals.append(entry["interval_days"])
+
+        assert intervals[:2] == [1, 6]
+        assert intervals[2] > 6 and intervals[3] > intervals[2]
+        assert entry["next_review"] == (NOW + timedelta(days=intervals[3])).isoformat()
+
+    def test_bad_answer_resets_chain(self):
+        """Плохой ответ сбрасывает цепочку, легкость не ниже минимума"""
+        entry = {"repetitions": 3, "interval_days": 20, "easiness": 1.3}
+        due = sm2_update(entry, 1, NOW)
+
+        assert entry["repetitions"] == 0
+        assert due == NOW + timedelta(days=1)
+        assert entry["easiness"] == 1.3
+
+
+class TestReviewScheduler:
+    """Тесты для общей очереди повторений"""
+
+    def test_due_returns_overdue_first_and_keeps_queue(self):
+        """Выбор не удаляет повторения, перенос заменяет старое время"""
+        scheduler = ReviewScheduler()
+        scheduler.schedule("anna", "oop_classes", NOW - timedelta(days=1))
+        scheduler.schedule("boris", "oop_classes", NOW - timedelta(days=3))
+        scheduler.schedule("anna", "python_basics_lists", NOW + timedelta(days=2))
+
+        assert [(s, t) for s, t, _ in scheduler.due(NOW)] == [
+            ("boris", "oop_classes"),
+            ("anna", "oop_classes"),
+        ]
+        assert len(scheduler.due(NOW, limit=1)) == 1
+
+        scheduler.schedule("boris", "oop_classes", NOW + timedelta(days=6))
+        scheduler.remove("anna", "oop_classes")
+        assert scheduler.due(NOW) == []
+        assert len(scheduler) == 2
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_engine_schedules_reviews(tmp_path, backend):
+    """Изученная тема попадает в очередь и переживает перезапуск"""
+    path = str(tmp_path / "progress.json")
+    engine = AdaptiveLearningEngine(create_progress_store(backend, path))
+    engine.start_assessment("anna", "data_science")
+    engine.submit_assessment("anna", {})
+    engine.mark_topic_completed("anna", "oop", "classes", 1.0)
+    engine.close()
+
+    restarted = AdaptiveLearningEngine(create_progress_store(backend, path))
+    tomorrow = datetime.now() + timedelta(days=1, minutes=1)
+
+    assert restarted.get_due_reviews("anna") == []
+    reviews = restarted.get_due_reviews("anna", now=tomorrow)
+    assert [review["content_link"] for review in reviews] == ["oop/classes"]
+    assert restarted.get_population_due_reviews(now=tomorrow) == [
+        {"student_id": "anna", "topic": "oop_classes", "due": reviews[0]["due"]}
+    ]
+    assert "reviews_due" in restarted.get_next_content("anna")
+
+
+def test_sqlite_queue_without_startup_scan(tmp_path):
+    """С SQLite запуск не перебирает студентов, а очередь выбирается по индексу"""
+    path = str(tmp_path / "progress.db")
+    store = SQLiteProgressStore(path)
+    store.save_students(
+        {
+            "anna": {
+                "student_id": "anna",
+                "studied_topics": [
+                    {
+                        "topic": "oop_classes",
+                        "next_review": (NOW - timedelta(days=2)).isoformat(),
+                    },
+                    {
+                        "topic": "python_basics_lists",
+                        "next_review": (NOW + timedelta(days=2)).isoformat(),
+                    },
+                ],
+            },
+            # Изучено до появления повторений: повторить через день после изучения
+            "boris": {
+                "student_id": "boris",
+                "studied_topics": [
+                    {
+                        "topic": "oop_classes",
+                        "completed_date": (NOW - timedelta(days=4)).isoformat(),
+                    }
+                ],
+            },
+        }
+    )
+    store.close()
+
+    class NoScanStore(SQLiteProgressStore):
+        def studied_topic_entries(self):
+            raise AssertionError("полный перебор при запуске")
+
+        def student_summaries(self):
+            raise AssertionError("полный перебор при запуске")
+
+    engine = AdaptiveLearningEngine(NoScanStore(path))
+    assert engine.get_population_due_reviews(now=NOW) == [
+        {
+            "student_id": "boris",
+            "topic": "oop_classes",
+            "due": (NOW - timedelta(days=3)).isoformat(),
+        },
+        {
+            "student_id": "anna",
+            "topic": "oop_classes",
+            "due": (NOW - timedelta(days=2)).isoformat(),
+        },
+    ]
+    assert len(engine.get_population_due_reviews(now=NOW, limit=1)) == 1
+    assert engine.get_population_stats()["total_students"] == 2
@@ -0,0 +1,42 @@
+"""
+Тесты для полнотекстового поиска
+"""
+
+from src.data.catalog import knowledge_base_version
+from src.data.knowledge_base import THEORY_DATABASE
+from src.data.search_index import SearchIndex, load_or_build_index, tokenize
+
+
+class TestSearchIndex:
+    """Тесты для класса SearchIndex"""
+
+    def test_tokenize_stems_russian_forms(self):
+        """Разные формы слова сводятся к одной основе"""
+        assert (
+            tokenize("Переменная") == tokenize("переменные") == tokenize("переменной")
+        )
+        assert tokenize("Ёлка") == tokenize("елка")
+
+    def test_search_ranks_relevant_subtopic_first(self):
+        """Подтема, посвященная запросу, оказывается первой"""
+        index = SearchIndex.build(THEORY_DATABASE, "test")
+
+        results = index.search("словарь ключи")
+        assert results[0]["subtopic_id"] == "dictionaries"
+        assert results == sorted(results, key=lambda r: -r["score"])
+        assert index.search("несуществующееслово") == []
+        assert len(index.search("python", limit=2)) <= 2
+
+    def test_persisted_index_reused(self, tmp_path):
+        """Индекс текущей версии читается с диска, устаревший перестраивается"""
+        path = str(tmp_path / "index.npz")
+        built = load_or_build_index(path)
+        loaded = load_or_build_index(path)
+
+        assert loaded.version == knowledge_base_version()
+        assert loaded.search("стек очередь") == built.search("стек очередь")
+
+        SearchIndex.build({}, "old").save(path)
+        rebuilt = load_or_build_index(path)
+        assert rebuilt.version == knowledge_base_version()
+        assert rebuilt.search("стек")[0]["subtopic_id"] == "stacks_queues"
@@ -0,0 +1,71 @@
+"""
+Тесты для хранилищ сессий Flask
+"""
+
+import time
+
+import pytest
+from flask import Flask, session
+
+from src.api.sessions import MemorySessionStore, create_session_interface
+
+
+def make_app(backend):
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.session_interface = create_session_interface(backend, sweep_interval=0)
+
+    @app.route("/login")
+    def login():
+        session["student_id"] = "anna"
+        return "ok"
+
+    @app.route("/whoami")
+    def whoami():
+        return session.get("student_id", "")
+
+    @app.route("/logout")
+    def logout():
+        session.clear()
+        return "ok"
+
+    return app
+
+
+@pytest.mark.parametrize("backend", ["cookie", "memory"])
+def test_login_and_logout(backend):
+    """Сессия переживает запросы и очищается при выходе"""
+    client = make_app(backend).test_client()
+    assert client.get("/whoami").text == ""
+
+    client.get("/login")
+    assert client.get("/whoami").text == "anna"
+
+    client.get("/logout")
+    assert client.get("/whoami").text == ""
+
+
+def test_memory_cookie_holds_only_id():
+    """В режиме memory данные не попадают в cookie"""
+    app = make_app("memory")
+    response = app.test_client().get("/login")
+    assert "anna" not in response.headers["Set-Cookie"]
+    assert len(app.session_interface.store) == 1
+
+
+def test_memory_store_expiry_and_sweep():
+    """Истекшая сессия не читается, а sweep удаляет ее из памяти"""
+    store = MemorySessionStore(shards=4, sweep_interval=0)
+    store.set("old", {"student_id": "a"}, ttl=0.01)
+    store.set("fresh", {"student_id": "b"}, ttl=60)
+    time.sleep(0.02)
+
+    assert store.get("old") is None
+    assert store.get("fresh") == {"student_id": "b"}
+    assert store.sweep() == 1
+    assert len(store) == 1
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_session_interface("filesystem")
@@ -0,0 +1,93 @@
+"""
+Тесты для графа зависимостей подтем
+"""
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.knowledge_base import THEORY_DATABASE
+from src.data.topic_graph import TopicGraph, get_topic_graph
+from src.storage import JsonProgressStore
+
+
+def _catalog(dependencies):
+    """Каталог из одной темы с заданными требованиями подтем"""
+    return {
+        "t": {
+            "topic": "T",
+            "subtopics": {
+                name: {
+                    "level": "beginner",
+                    "name": name.upper(),
+                    "questions": [],
+                    "prerequisites": [f"t/{p}" for p in prerequisites],
+                }
+                for name, prerequisites in dependencies.items()
+            },
+        }
+    }
+
+
+class TestTopicGraph:
+    """Тесты для класса TopicGraph"""
+
+    def test_transitive_prerequisites(self):
+        """Требования учитываются транзитивно"""
+        graph = get_topic_graph()
+        studied = graph.mask_of(["python_basics/variables"])
+
+        assert graph.prerequisite_names("oop/inheritance") == ["Классы и объекты"]
+        assert not graph.is_unlocked("oop/inheritance", studied)
+        assert graph.missing_prerequisites("oop/inheritance", studied) == [
+            "python_basics/lists",
+            "python_basics/dictionaries",
+            "functions/basic_functions",
+            "oop/classes",
+        ]
+        assert graph.is_unlocked("python_basics/lists", studied)
+
+    def test_order_keys_puts_prerequisites_first(self):
+        """Путь упорядочивается по зависимостям, иначе порядок сохраняется"""
+        graph = TopicGraph(_catalog({"c": ["b"], "b": ["a"], "a": [], "x": []}))
+
+        assert graph.order_keys(["t/c", "t/x", "t/a", "t/b"]) == [
+            "t/x",
+            "t/a",
+            "t/b",
+            "t/c",
+        ]
+        assert graph.order_keys(["t/x", "t/c"]) == ["t/x", "t/c"]
+
+    def test_cycle_and_unknown_reference(self):
+        """Циклы и ссылки на несуществующие темы - ошибка каталога"""
+        with pytest.raises(ValueError):
+            TopicGraph(_catalog({"a": ["b"], "b": ["a"]}))
+        with pytest.raises(ValueError):
+            TopicGraph(_catalog({"a": ["missing"]}))
+
+    def test_catalog_order_is_topological(self):
+        """Встроенный каталог не противоречит своим требованиям"""
+        graph = get_topic_graph()
+        for node, prerequisites in enumerate(graph.prerequisites):
+            assert all(graph.rank[p] < graph.rank[node] for p in prerequisites)
+        assert len(graph.keys) == sum(
+            len(t["subtopics"]) for t in THEORY_DATABASE.values()
+        )
+
+    def test_learning_path_respects_prerequisites(self, tmp_path):
+        """В пути обучения требования идут раньше зависимых тем"""
+        engine = AdaptiveLearningEngine(
+            JsonProgressStore(str(tmp_path / "progress.json"))
+        )
+        engine.start_assessment("anna", "web_dev")
+        engine.submit_assessment("anna", {})
+
+        path = [
+            rec["content_link"]
+            for rec in engine.student_progress["anna"]["learning_path"]
+        ]
+        graph = get_topic_graph()
+        assert path
+        for i, link in enumerate(path):
+            missing = graph.missing_prerequisites(link, graph.mask_of(path[:i]))
+            assert not set(missing) & set(path)
@@ -0,0 +1,97 @@
+"""
+Тесты для таблицы похожих подтем
+"""
+
+import pytest
+
+from src.core.learning_engine import AdaptiveLearningEngine
+from src.data.knowledge_base import THEORY_DATABASE
+from src.data.topic_similarity import (
+    TopicSimilarity,
+    get_topic_similarity,
+    load_or_build_similarity,
+)
+from src.storage import SQLiteProgressStore
+
+
+def make_database():
+    """Две подтемы про списки и одна - про классы"""
+
+    def subtopic(name, content):
+        return {"name": name, "level": "beginner", "content": content, "questions": []}
+
+    return {
+        "python": {
+            "topic": "Python",
+            "subtopics": {
+                "lists": subtopic(
+                    "Списки",
+                    "Список хранит элементы. Списки изменяемые, элементы списка",
+                ),
+                "tuples": subtopic(
+                    "Кортежи", "Кортеж похож на список, но элементы кортежа не меняются"
+                ),
+                "classes": subtopic(
+                    "Классы", "Класс описывает объекты: атрибуты и методы объекта"
+                ),
+            },
+        }
+    }
+
+
+class TestTopicSimilarity:
+    """Тесты для класса TopicSimilarity"""
+
+    def test_tfidf_neighbors(self, monkeypatch):
+        """Ближайший сосед списков - кортежи, сама тема в соседях не встречается"""
+        database = make_database()
+        monkeypatch.setattr(
+            "src.data.topic_similarity.get_lesson_body",
+            lambda topic_id, subtopic_id, cache: database[topic_id]["subtopics"][
+                subtopic_id
+            ]["content"],
+        )
+        table = TopicSimilarity.build(database, "v1", neighbors=2)
+
+        related = table.related("python/lists")
+        assert related[0][0] == "python/tuples"
+        assert all(key != "python/lists" for key, _ in related)
+        assert table.related("missing/topic") == []
+
+    def test_unknown_method(self):
+        """Неизвестный метод и эмбеддинги без модели - ошибка"""
+        with pytest.raises(ValueError):
+            TopicSimilarity.build(THEORY_DATABASE, "v1", method="bag_of_words")
+        with pytest.raises(ValueError):
+            TopicSimilarity.build(THEORY_DATABASE, "v1", method="embeddings")
+
+
+def test_cached_on_disk_by_version(tmp_path):
+    """Сохраненная таблица читается, пока не изменились база или метод"""
+    path = str(tmp_path / "similarity.npz")
+    built = load_or_build_similarity(path)
+    loaded = TopicSimilarity.load(path)
+
+    assert loaded.version == built.version
+    assert loaded.neighbors.tolist() == built.neighbors.tolist()
+    assert load_or_build_similarity(path).version == built.version
+
+
+def test_cached_per_options(tmp_path):
+    """Таблицы с разными путями не подменяют друг друга"""
+    first = get_topic_similarity(str(tmp_path / "first.npz"))
+    second = get_topic_similarity(str(tmp_path / "second.npz"))
+
+    assert first is not second
+    assert get_topic_similarity(str(tmp_path / "first.npz")) is first
+    assert (tmp_path / "second.npz").exists()
+
+
+def test_engine_related_topics():
+    """Связанные темы: сначала заданные вручную, затем похожие по содержанию"""
+    engine = AdaptiveLearningEngine(SQLiteProgressStore(":memory:"))
+    related = engine.get_topic_content("oop", "classes")["related_topics"]
+
+    assert related[0]["subtopic"] == "inheritance"
+    assert len(related) == engine.RELATED_TOPICS
+    assert len({(r["topic"], r["subtopic"]) for r in related}) == len(related)